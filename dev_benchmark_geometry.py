@@ -0,0 +1,70 @@
+# dev_benchmark_geometry.py
+import sys
+import time
+import math
+import random
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.utils.geometry import is_point_in_polygon, Polygon, PolygonSet
+
+TRAJECTORY_POINTS = 100_000
+POI_COUNT = 5_000
+QUERY_POINTS = 200
+
+
+def random_polygon(center_x, center_z, radius, corners):
+    """Sternförmiges Polygon mit zufälligen Radien, damit auch konkave Fälle dabei sind."""
+    points = []
+    for i in range(corners):
+        angle = 2 * math.pi * i / corners
+        r = radius * random.uniform(0.4, 1.0)
+        points.append((center_x + r * math.cos(angle), center_z + r * math.sin(angle)))
+    return points
+
+
+def timed(name, func, count):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<36} {elapsed * 1000:9.1f} ms   {elapsed / count * 1e6:8.2f} µs/Test")
+    return result
+
+
+def main():
+    random.seed(42)
+
+    # --- Viele Punkte (aufgezeichnete Fahrt) gegen ein Polygon ---
+    zone = random_polygon(0, 0, 500, 12)
+    xs = np.random.default_rng(1).uniform(-700, 700, TRAJECTORY_POINTS)
+    zs = np.random.default_rng(2).uniform(-700, 700, TRAJECTORY_POINTS)
+    points = list(zip(xs.tolist(), zs.tolist()))
+    polygon = Polygon(zone)
+    print(f"{TRAJECTORY_POINTS} Punkte gegen ein Polygon mit {len(zone)} Ecken")
+    reference = timed("is_point_in_polygon", lambda: [is_point_in_polygon(p, zone) for p in points], TRAJECTORY_POINTS)
+    compiled = timed("Polygon.contains", lambda: [polygon.contains(p) for p in points], TRAJECTORY_POINTS)
+    batch = timed("Polygon.contains_points (NumPy)", lambda: polygon.contains_points(xs, zs), TRAJECTORY_POINTS)
+    assert reference == compiled == batch.tolist(), "Ergebnisse weichen voneinander ab!"
+
+    # --- Ein Punkt gegen viele Polygone (dichte POI-Sets) ---
+    pois = [random_polygon(random.uniform(-20000, 20000), random.uniform(-20000, 20000), random.uniform(20, 300), 4)
+            for _ in range(POI_COUNT)]
+    polygons = [Polygon(p) for p in pois]
+    poly_set = PolygonSet(polygons)
+    queries = [(random.uniform(-20000, 20000), random.uniform(-20000, 20000)) for _ in range(QUERY_POINTS)]
+    tests = QUERY_POINTS * POI_COUNT
+    print(f"\n{QUERY_POINTS} Punkte gegen je {POI_COUNT} Polygone")
+    reference = timed("is_point_in_polygon", lambda: [[is_point_in_polygon(q, p) for p in pois] for q in queries], tests)
+    compiled = timed("Polygon.contains", lambda: [[p.contains(q) for p in polygons] for q in queries], tests)
+    batch = timed("PolygonSet.contains (NumPy)", lambda: [poly_set.contains(q).tolist() for q in queries], tests)
+    assert reference == compiled == batch, "Ergebnisse weichen voneinander ab!"
+    print("\n✅ Alle Varianten liefern identische Ergebnisse.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# dev_benchmark_navimap.py
+import sys
+import time
+import math
+import tkinter as tk
+from pathlib import Path
+
+import pygame
+from PIL import Image, ImageTk
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.ui.phone_ui_lieferdienst import NaviMap
+from src.ui.frame_presenter import FramePresenter
+
+FRAMES = 300
+MAP_WIDTH, MAP_HEIGHT = 306, 200
+
+
+def run(name, root, navi_map, present):
+    """Zeichnet FRAMES Frames mit fahrendem Truck und misst Wandzeit und CPU-Zeit."""
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    center_x, center_z = navi_map.live_truck_data['x'], navi_map.live_truck_data['z']
+    for i in range(FRAMES):
+        angle = i / FRAMES * 2 * math.pi
+        navi_map.live_truck_data = {'x': center_x + 300 * math.cos(angle), 'z': center_z + 300 * math.sin(angle), 'heading': angle}
+        surface = navi_map.draw()
+        present(surface, navi_map.dirty_rects)
+        root.update_idletasks()
+    wall = time.perf_counter() - start_wall
+    cpu = time.process_time() - start_cpu
+    print(f"{name:<28} {FRAMES / wall:8.1f} FPS   {cpu / FRAMES * 1000:6.2f} ms CPU/Frame")
+
+
+def main():
+    root = tk.Tk()
+    label = tk.Label(root)
+    label.pack()
+
+    navi_map = NaviMap()
+    navi_map.init_pygame(MAP_WIDTH, MAP_HEIGHT)
+    points = navi_map.road_network.points
+    if not len(points):
+        print("Kein Straßennetz in cache/ gefunden.")
+        return
+    center_x, center_z = points.mean(axis=0).tolist()
+    center = {'x': center_x, 'z': center_z}
+    navi_map.set_view_to_order({'x': center['x'] - 2000, 'z': center['z'] - 1500}, {'x': center['x'] + 2000, 'z': center['z'] + 1500})
+    navi_map.live_truck_data = {'x': center['x'], 'z': center['z'], 'heading': 0.0}
+
+    def present_pil(surface, dirty_rects):
+        # Bisheriger Weg: drei Kopien und ein neues PhotoImage pro Frame
+        img = Image.frombytes('RGB', surface.get_size(), pygame.image.tostring(surface, 'RGB'))
+        photo = ImageTk.PhotoImage(image=img)
+        label.config(image=photo)
+        label.image = photo
+
+    presenter = FramePresenter(label)
+    print(f"NaviMap {MAP_WIDTH}x{MAP_HEIGHT}, {len(points)} Straßenpunkte, {FRAMES} Frames")
+    run("PIL + neues PhotoImage", root, navi_map, present_pil)
+    run("FramePresenter (voll)", root, navi_map, lambda surface, dirty: presenter.present(surface))
+    run("FramePresenter (dirty)", root, navi_map, presenter.present)
+    root.destroy()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# dev_convert_road_network.py
+import sys
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.config import ROAD_NETWORK_FILE, ROAD_NETWORK_LEGACY_FILE, ROAD_SIMPLIFY_TOLERANCE
+from src.utils.road_network import RoadNetwork, RoadNetworkLOD, convert_legacy_json
+
+
+def measure(name, func):
+    """Ladezeit und Python-Speicher (tracemalloc, ohne gemappte Seiten) einer Ladefunktion."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} {elapsed * 1000:8.2f} ms   {current / 1024:9.1f} KiB belegt   {peak / 1024:9.1f} KiB Spitze")
+    return result
+
+
+def main():
+    """Konvertiert road_network.json ins Binärformat und vergleicht das Laden beider Formate."""
+    json_path = Path(sys.argv[1]) if len(sys.argv) > 1 else ROAD_NETWORK_LEGACY_FILE
+    out_path = Path(sys.argv[2]) if len(sys.argv) > 2 else ROAD_NETWORK_FILE
+    if not json_path.exists():
+        print(f"✗ {json_path} nicht gefunden.")
+        return
+
+    network = convert_legacy_json(json_path, out_path)
+    print(f"JSON: {json_path.stat().st_size / 1024:.0f} KiB, binär: {out_path.stat().st_size / 1024:.0f} KiB\n")
+
+    def load_json():
+        with open(json_path, 'r') as f:
+            return json.load(f)
+
+    segments = measure("JSON (verschachtelte Listen)", load_json)
+    loaded = measure("Binär, mmap", lambda: RoadNetwork.load(out_path))
+    measure("Binär, komplett gelesen", lambda: RoadNetwork.load(out_path, mmap=False))
+
+    assert len(loaded) == len(segments) == len(network)
+    for original, segment in zip(segments, loaded):
+        assert segment.shape == (len(original), 2)
+        assert abs(segment.astype(float) - original).max(initial=0.0) < 0.05, "Punkte weichen ab!"
+    print("\n✅ Alle Segmente stimmen überein (float32-Genauigkeit).")
+
+    # Punktzahlen nach Douglas-Peucker: Aufzeichnungs-Toleranz und die Detailstufen der Karte
+    lod = RoadNetworkLOD(loaded)
+    print(f"\n{'Toleranz':>10} {'Punkte':>8} {'Faktor':>8} {'Bauzeit':>10}")
+    for tolerance in (ROAD_SIMPLIFY_TOLERANCE, *lod.tolerances):
+        start = time.perf_counter()
+        level = lod.level(tolerance)
+        elapsed = time.perf_counter() - start
+        print(f"{tolerance:>10.1f} {level.point_count:>8} {loaded.point_count / max(level.point_count, 1):>7.0f}x {elapsed * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# dev_road_graph.py
+import sys
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.config import ROAD_NETWORK_LEGACY_FILE
+from src.utils.road_graph import RoadGraph
+from src.utils.road_network import RoadNetwork
+
+DRIVES = 5 # so oft werden dieselben Strecken (mit GPS-Rauschen) erneut "gefahren"
+NOISE = 2.0 # Standardabweichung des Rauschens in Spieleinheiten
+
+
+def main():
+    """Zeigt, dass der Graph mit der Straßenabdeckung wächst und nicht mit der Anzahl der Fahrten."""
+    json_path = Path(sys.argv[1]) if len(sys.argv) > 1 else ROAD_NETWORK_LEGACY_FILE
+    if not json_path.exists():
+        print(f"✗ {json_path} nicht gefunden.")
+        return
+    with open(json_path, 'r') as f:
+        segments = [np.asarray(s, dtype=np.float64) for s in json.load(f) if len(s) > 1]
+
+    rng = np.random.default_rng(0)
+    graph = RoadGraph()
+    raw_points = 0
+    print(f"{'Fahrt':>5} {'Rohpunkte':>10} {'Knoten':>7} {'Kanten':>7} {'Graphpunkte':>12} {'Zeit':>9}")
+    for drive in range(DRIVES):
+        start = time.perf_counter()
+        for segment in segments:
+            trace = segment if drive == 0 else segment + rng.normal(0, NOISE, segment.shape)
+            graph.add_trace(trace if drive % 2 == 0 else trace[::-1])
+            raw_points += len(trace)
+        elapsed = time.perf_counter() - start
+        print(f"{drive + 1:>5} {raw_points:>10} {len(graph.nodes):>7} {len(graph.edges):>7} {graph.point_count:>12} {elapsed * 1000:>6.0f} ms")
+
+    geometry = graph.geometry
+    raw = RoadNetwork.from_segments(segments)
+    print(f"\nEine Fahrt roh: {raw.point_count} Punkte, Graph nach {DRIVES} Fahrten: {geometry.point_count} Punkte")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# dev_trace_report.py
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.config import TRACE_DIR
+from src.utils.trajectory_analytics import load_trace, load_zones, summarize
+
+
+def main():
+    """Wertet eine Aufzeichnung aus navi.py aus (Standard: die neueste in cache/traces)."""
+    if len(sys.argv) > 1:
+        trace_file = Path(sys.argv[1])
+    else:
+        traces = sorted(TRACE_DIR.glob("trace_*.npy"))
+        if not traces:
+            print(f"Keine Aufzeichnung in {TRACE_DIR} gefunden. Erst mit navi.py eine Fahrt aufzeichnen.")
+            return
+        trace_file = traces[-1]
+
+    trace = load_trace(trace_file)
+    zones = load_zones()
+    start = time.perf_counter()
+    report = summarize(trace, zones)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"📈 {trace_file.name}: {report['points']} Punkte, {report['duration_s'] / 3600:.2f} h, "
+          f"{report['distance_km']:.1f} km (ausgewertet in {elapsed_ms:.1f} ms)")
+    print(f"\n🅿️ {len(report['stops'])} Stopps")
+    for stop in report['stops']:
+        engine = "Motor aus" if stop['engine_off'] else "Motor an"
+        print(f"  {datetime.fromtimestamp(stop['start']).strftime('%H:%M:%S')}  {stop['seconds'] / 60:5.1f} min  "
+              f"({stop['x']:.0f}, {stop['z']:.0f})  {engine}")
+    print(f"\n📍 Besuchte Zonen")
+    for name, stats in sorted(report['zones'].items(), key=lambda item: -item[1]['seconds']):
+        print(f"  {name:<32} {stats['visits']:3d}x  {stats['seconds'] / 60:6.1f} min  "
+              f"Anfahrt Ø {stats['approach_speed_kmh']:.0f} km/h")
+
+
+if __name__ == "__main__":
+    main()
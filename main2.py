@@ -12,6 +12,7 @@ import sys
 import keyboard
 from dotenv import load_dotenv
 from collections import Counter
+from datetime import datetime
 import uuid
 
 load_dotenv()
@@ -22,10 +23,13 @@ sys.path.insert(0, str(project_root / 'src'))
 try:
     from ui.phone_ui_lieferdienst import PhoneOverlayLieferdienst
     from ui.order_menu_ui import OrderMenuOverlay
-    from utils.geometry import is_point_in_polygon
+    from src.game_integration.geofence_engine import get_geofence_engine
+    from src.utils.event_bus import event_bus, ENGINE_OFF_IN_ZONE
     from src.startTelemetry import start_telemetry_server
     from actions.communication import send_message, create_sample_files_if_missing
     from config import DELIVERY_DATA_FILE, TELEMETRY_URL
+    from src.storage.message_store import get_message_store
+    from src.storage.delivery_stats import DeliveryStats
 except ImportError as e:
     print(f"FEHLER: Konnte eine benötigte Komponente nicht importieren: {e}")
     sys.exit(1)
@@ -40,6 +44,9 @@ class DeliveryManager:
         self.phone = phone_ui_instance
         self.locations_data = self._load_locations()
         self.all_locations = {loc['name']: loc for loc in self.locations_data['locations']}
+        self.geofence = get_geofence_engine()
+        self.geofence.add_zones("delivery", ((name, loc['corners']) for name, loc in self.all_locations.items()))
+        event_bus.subscribe(ENGINE_OFF_IN_ZONE, self._on_engine_off_in_zone)
         
         self.player_wallet = 100.00
         self.player_inventory = None
@@ -48,13 +55,14 @@ class DeliveryManager:
         self.available_orders = []
         self.game_state = "IDLE"
         
-        self.last_engine_state = False
         self.order_menu_window = None
         self.current_location_name = None
+        self.last_game_time = None
 
         self.delivery_data = self.load_delivery_data()
+        self.stats = self._load_stats()
         if self.phone:
-            self.phone.delivery_data = self.delivery_data
+            self.phone.delivery_stats = self.stats
             self.phone.update_dashboard_stats()
 
         print("✅ DeliveryManager initialisiert.")
@@ -65,6 +73,15 @@ class DeliveryManager:
                 return json.load(f)
         return {"stats": {"total_earnings": 0.0, "completed_deliveries": 0}, "history": []}
 
+    def _load_stats(self):
+        if "aggregates" in self.delivery_data:
+            return DeliveryStats(self.delivery_data["aggregates"])
+        print("INFO: Baue Liefer-Statistik einmalig aus der Historie auf...")
+        stats = DeliveryStats.from_history(self.delivery_data.get("history", []))
+        self.delivery_data["aggregates"] = stats.to_dict()
+        self.save_delivery_data()
+        return stats
+
     def save_delivery_data(self):
         with open(DELIVERY_DATA_FILE, 'w', encoding='utf-8') as f:
             json.dump(self.delivery_data, f, indent=2)
@@ -127,38 +144,30 @@ class DeliveryManager:
         )
 
     def update_from_telemetry(self, telemetry_data):
-        if not telemetry_data or not telemetry_data.get("game", {}).get("connected"):
-            self.current_location_name = None
-            return
-        
-        if self.phone.visible:
-            self.phone.update_navi_map_truck(telemetry_data)
-    
-        truck_data = telemetry_data.get("truck", {})
-        player_pos_dict = truck_data.get("placement", {})
-        engine_on = truck_data.get("engineOn", False)
-    
-        if player_pos_dict:
-            player_coords_tuple = (player_pos_dict.get('x', 0), player_pos_dict.get('z', 0))
-            found_location_name = None
-            for loc_name, loc_data in self.all_locations.items():
-                polygon = [(p['x'], p['z']) for p in loc_data['corners']]
-                if is_point_in_polygon(player_coords_tuple, polygon):
-                    found_location_name = loc_name
-                    break
-            self.current_location_name = found_location_name
-    
-        if not engine_on and self.last_engine_state:
-            self.handle_engine_off()
-    
-        self.last_engine_state = engine_on
+        if telemetry_data and telemetry_data.get("game", {}).get("connected"):
+            if self.phone.visible:
+                self.phone.update_navi_map_truck(telemetry_data)
+
+            if game_time := telemetry_data["game"].get("time"):
+                try:
+                    self.last_game_time = datetime.fromisoformat(game_time.replace("Z", "+00:00"))
+                except ValueError:
+                    pass
+
+        # Ohne Verbindung gelten alle Zonen als verlassen; Motor-aus in einer Zone kommt als Event zurück
+        self.geofence.update(telemetry_data)
+        self.current_location_name = self.geofence.current_zone("delivery")
+
+    def _on_engine_off_in_zone(self, payload):
+        if payload["group"] == "delivery":
+            self.handle_engine_off(payload["zone"])
 
-    def handle_engine_off(self):
+    def handle_engine_off(self, location_name):
         if self.game_state == "WAITING_FOR_PICKUP":
-            if self.current_order and self.current_location_name == self.current_order['restaurant_name']:
+            if self.current_order and location_name == self.current_order['restaurant_name']:
                 self.show_order_menu()
         elif self.game_state == "WAITING_FOR_DELIVERY":
-            if self.current_order and self.current_location_name == self.current_order['customer_name']:
+            if self.current_order and location_name == self.current_order['customer_name']:
                 self.process_delivery()
 
     def show_order_menu(self):
@@ -214,13 +223,25 @@ class DeliveryManager:
         
         self.player_wallet += total_paid
         
-        self.delivery_data['stats']['total_earnings'] += profit
-        self.delivery_data['stats']['completed_deliveries'] += 1
-        self.delivery_data['history'].append({
+        # Stunde und Tag nach Ingame-Zeit, ohne Telemetrie nach Echtzeit
+        game_time = self.last_game_time
+        entry = {
             "customer": self.current_order['customer_display_name'],
+            "restaurant": self.current_order['restaurant_display_name'],
             "profit": round(profit, 2),
+            "payment": round(payment, 2),
+            "tip": round(tip, 2),
+            "hour": game_time.hour if game_time else time.localtime().tm_hour,
+            "game_day": f"Tag {game_time.toordinal()}" if game_time else None,
             "date": time.strftime("%Y-%m-%d %H:%M")
-        })
+        }
+        self.delivery_data['history'].append(entry)
+        self.stats.record(entry)
+        self.delivery_data['stats'] = {
+            "total_earnings": self.stats.total_earnings,
+            "completed_deliveries": self.stats.completed_deliveries
+        }
+        self.delivery_data['aggregates'] = self.stats.to_dict()
         self.save_delivery_data()
         self.phone.update_dashboard_stats()
         
@@ -289,9 +310,6 @@ def main():
     phone_ui = PhoneOverlayLieferdienst(root, None)
     manager = DeliveryManager(phone_ui)
     phone_ui.manager = manager
-    
-    # Wichtig: Nach der Initialisierung die Stats einmalig laden
-    phone_ui.load_delivery_data()
 
     keyboard.on_press_key('up', lambda _: phone_ui.toggle_visibility())
     
@@ -310,6 +328,7 @@ def main():
     finally:
         poller.stop()
         phone_ui.close()
+        get_message_store().compact()
         keyboard.unhook_all()
         print("Anwendung wird beendet.")
 
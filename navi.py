@@ -5,7 +5,13 @@ import math
 import json
 import os
 
-from src.config import TELEMETRY_URL
+import numpy as np
+
+from src.config import TELEMETRY_URL, TRACE_DIR, TRACE_INTERVAL_S, ROAD_NETWORK_FILE, ROAD_SIMPLIFY_TOLERANCE
+from src.utils.geometry import simplify_polyline
+from src.utils.road_graph import RoadGraph, load_road_graph
+from src.utils.road_network import RoadNetworkLOD
+from src.utils.trajectory_analytics import save_trace
 
 # --- KONFIGURATION ---
 SCREEN_WIDTH = 1280
@@ -23,9 +29,7 @@ COLOR_POI_LABEL_BG = (0, 0, 0, 180)
 # --- DATEIPFADE (SAUBER GETRENNT) ---
 # Eingabedaten (wird nur gelesen)
 POI_FILE = "data/locations.json"
-# Ausgabedaten / Cache (wird geschrieben und gelesen)
-CACHE_DIR = "cache"
-ROAD_SAVE_FILE = os.path.join(CACHE_DIR, "road_network.json") # GEÄNDERT
+# Ausgabedaten / Cache (wird geschrieben und gelesen): ROAD_NETWORK_FILE aus src/config.py
 
 # --- ANWENDUNGS-SETUP ---
 pygame.init()
@@ -36,10 +40,17 @@ font = pygame.font.SysFont("Arial", 18)
 font_poi = pygame.font.SysFont("Arial", 16, bold=True)
 
 # --- DATENSPEICHER ---
-road_network = []
+road_graph = RoadGraph() # bekannte Straßen, jede Fahrt wird beim Speichern darauf abgeglichen
+road_network = road_graph.geometry # Kantenverläufe des Graphen zum Zeichnen
+road_lod = RoadNetworkLOD(road_network) # vereinfachte Stufen davon für herausgezoomte Ansichten
+recorded_segments = [] # in dieser Sitzung abgeschlossene, bereits vereinfachte Segmente
 points_of_interest = []
 current_road_segment = []
 live_truck_data = {}
+# Fahrtenaufzeichnung für die Auswertung (src/utils/trajectory_analytics.py)
+trace_rows = []
+last_trace_time = 0.0
+trace_file = TRACE_DIR / f"trace_{time.strftime('%Y%m%d_%H%M%S')}.npy"
 
 # Kamera-Steuerung
 camera_offset = pygame.math.Vector2(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
@@ -48,28 +59,40 @@ is_dragging = False
 drag_start_pos = None
 
 def load_road_network():
-    """Lädt das gespeicherte Straßennetz aus dem Cache-Ordner."""
-    global road_network
-    if os.path.exists(ROAD_SAVE_FILE):
-        try:
-            with open(ROAD_SAVE_FILE, 'r') as f:
-                road_network = json.load(f)
-            print(f"Erfolgreich {len(road_network)} Straßensegmente aus {ROAD_SAVE_FILE} geladen.")
-        except json.JSONDecodeError:
-            print(f"Fehler: {ROAD_SAVE_FILE} ist beschädigt. Starte mit einer leeren Karte.")
-            road_network = []
+    """Lädt den Straßengraphen aus dem Cache-Ordner (beim ersten Mal aus den bisherigen Aufzeichnungen gebaut)."""
+    global road_graph, road_network, road_lod
+    road_graph = load_road_graph()
+    road_network = road_graph.geometry
+    road_lod = RoadNetworkLOD(road_network)
+    print(f"Erfolgreich {len(road_graph.edges)} Straßen ({road_network.point_count} Punkte) aus {ROAD_NETWORK_FILE} geladen.")
 
 def save_road_network():
-    """Speichert das aktuelle Straßennetz im Cache-Ordner."""
-    # NEU: Stellt sicher, dass der Cache-Ordner existiert, bevor gespeichert wird.
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    
+    """Gleicht die neu aufgezeichneten Segmente mit dem Straßengraphen ab und speichert ihn im Cache-Ordner."""
     if len(current_road_segment) > 1:
-        road_network.append(current_road_segment)
-    
-    with open(ROAD_SAVE_FILE, 'w') as f:
-        json.dump(road_network, f)
-    print(f"Straßennetz mit {len(road_network)} Segmenten in {ROAD_SAVE_FILE} gespeichert.")
+        recorded_segments.append(simplify_polyline(current_road_segment, ROAD_SIMPLIFY_TOLERANCE))
+
+    # Schon bekannte Straßen fallen dabei weg, nur neue Abschnitte werden zu Kanten
+    added = sum(road_graph.add_trace(segment) for segment in recorded_segments)
+    recorded_segments.clear()
+    try:
+        road_graph.save()
+        print(f"Straßennetz mit {len(road_graph.edges)} Straßen ({added} neu) in {ROAD_NETWORK_FILE} gespeichert.")
+    except OSError as e:
+        print(f"Fehler beim Speichern des Straßennetzes: {e}")
+
+def record_trace_point(data):
+    """Hängt höchstens alle TRACE_INTERVAL_S einen Punkt (Zeit, Position, km/h, Motor) an die Aufzeichnung."""
+    global last_trace_time
+    now = time.time()
+    if now - last_trace_time < TRACE_INTERVAL_S: return
+    last_trace_time = now
+    truck = data['truck']
+    trace_rows.append((now, truck['placement']['x'], truck['placement']['z'], truck['speed'] * 3.6, truck.get('engineOn', False)))
+
+def save_trace_file():
+    if len(trace_rows) > 1:
+        save_trace(trace_file, trace_rows)
+        print(f"Fahrt mit {len(trace_rows)} Punkten in {trace_file} gespeichert.")
 
 def load_pois():
     """Lädt POIs aus der JSON-Datei und berechnet ihre Mittelpunkte."""
@@ -113,6 +136,19 @@ def world_to_screen(x, z):
     screen_y = (z * camera_zoom) + camera_offset.y
     return int(screen_x), int(screen_y)
 
+def segment_to_screen(points):
+    """world_to_screen für ein ganzes Segment auf einmal."""
+    screen_points = np.asarray(points, dtype=np.float64) * camera_zoom + (camera_offset.x, camera_offset.y)
+    return screen_points.astype(np.int64).tolist()
+
+def visible_world_rect(margin_px=3):
+    """Sichtbarer Weltausschnitt (min_x, min_z, max_x, max_z), um die Linienbreite erweitert."""
+    min_x = (-margin_px - camera_offset.x) / camera_zoom
+    min_z = (-margin_px - camera_offset.y) / camera_zoom
+    max_x = (SCREEN_WIDTH + margin_px - camera_offset.x) / camera_zoom
+    max_z = (SCREEN_HEIGHT + margin_px - camera_offset.y) / camera_zoom
+    return min_x, min_z, max_x, max_z
+
 def draw_hud():
     if live_truck_data:
         speed_text = f"Geschwindigkeit: {live_truck_data.get('speed', 0):.0f} km/h"
@@ -162,6 +198,7 @@ while running:
             'heading': data['truck']['placement']['heading'],
             'speed': data['truck']['speed'] * 3.6,
         }
+        record_trace_point(data)
         is_moving = live_truck_data.get('speed', 0) > 5
         if is_moving:
             new_point = (live_truck_data['x'], live_truck_data['z'])
@@ -169,7 +206,8 @@ while running:
                 current_road_segment.append(new_point)
         else:
             if len(current_road_segment) > 1:
-                road_network.append(current_road_segment)
+                # Pro Frame kommt ein Punkt dazu, auf geraden Strecken fast alle überflüssig
+                recorded_segments.append(simplify_polyline(current_road_segment, ROAD_SIMPLIFY_TOLERANCE))
             current_road_segment = []
     else:
         live_truck_data = {}
@@ -183,11 +221,13 @@ while running:
 
     # Zeichnen
     screen.fill(COLOR_BACKGROUND)
-    for segment in road_network:
+    # Vom gespeicherten Netz nur die Stücke, deren Bounding-Box im Bild liegt
+    road_chunks = road_lod.chunks_for_zoom(camera_zoom)
+    for index in road_chunks.visible(*visible_world_rect()).tolist():
+        pygame.draw.lines(screen, COLOR_ROAD, False, segment_to_screen(road_chunks.chunk(index)), 3)
+    for segment in (*recorded_segments, current_road_segment):
         if len(segment) > 1:
-            pygame.draw.lines(screen, COLOR_ROAD, False, [world_to_screen(p[0], p[1]) for p in segment], 3)
-    if len(current_road_segment) > 1:
-        pygame.draw.lines(screen, COLOR_ROAD, False, [world_to_screen(p[0], p[1]) for p in current_road_segment], 3)
+            pygame.draw.lines(screen, COLOR_ROAD, False, segment_to_screen(segment), 3)
     
     mouse_pos = pygame.mouse.get_pos()
     hovered_poi_label = None
@@ -221,4 +261,5 @@ while running:
 
 # --- Aufräumen ---
 save_road_network()
+save_trace_file()
 pygame.quit()
\ No newline at end of file
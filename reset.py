@@ -1,5 +1,6 @@
 import os
 import json
+import shutil
 
 def reset_files_to_initial_state():
     """
@@ -19,6 +20,24 @@ def reset_files_to_initial_state():
     except Exception as e:
         print(f"❌ Fehler beim Löschen von '{log_file}': {e}")
 
+    # 1b. Journale und Archiv löschen, sonst tauchen alte Nachrichten/Mails nach dem Reset wieder auf
+    for journal_file in ("data/phone_messages.journal", "data/laptop_mail.journal"):
+        try:
+            os.remove(journal_file)
+            print(f"🗑️  Datei '{journal_file}' wurde erfolgreich gelöscht.")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"❌ Fehler beim Löschen von '{journal_file}': {e}")
+
+    archive_dir = "data/archive"
+    if os.path.isdir(archive_dir):
+        try:
+            shutil.rmtree(archive_dir)
+            print(f"🗑️  Ordner '{archive_dir}' wurde erfolgreich gelöscht.")
+        except Exception as e:
+            print(f"❌ Fehler beim Löschen von '{archive_dir}': {e}")
+
     # 2. Inhalte für die JSON-Dateien definieren
     initial_data = {
         "data/delivery_data.json": {
@@ -11,6 +11,9 @@ from src.config import (
     PHONE_MESSAGE_FILE, LAPTOP_MAIL_FILE, TELEMETRY_URL,
     SMS_SOUND_PATH, MAIL_SOUND_PATH
 )
+from src.storage.mail_store import get_mail_store
+from src.storage.message_store import get_message_store
+from src.utils.event_bus import event_bus, MESSAGE_ADDED, MAIL_ADDED
 
 def _play_sound(sound_path):
     """Spielt eine Sound-Datei asynchron ab, wenn sie existiert."""
@@ -44,25 +47,13 @@ def send_message(sender, message_text, sent_by_me=False):
         _play_sound(SMS_SOUND_PATH)
 
     try:
-        data = {"conversations": []}
-        if PHONE_MESSAGE_FILE.exists():
-            with open(PHONE_MESSAGE_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        
-        conversation = next((c for c in data["conversations"] if c["sender"] == sender), None)
-        if not conversation:
-            conversation = {"sender": sender, "messages": []}
-            data["conversations"].append(conversation)
-        
         new_message = {
             "text": message_text, "timestamp": time.time(),
             "ingame_time": get_current_ingame_time_str(),
             "sent_by_me": sent_by_me, "read": sent_by_me
         }
-        conversation["messages"].append(new_message)
-        
-        with open(PHONE_MESSAGE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        get_message_store().append(sender, new_message)
+        event_bus.publish(MESSAGE_ADDED, {"sender": sender, "message": new_message})
         print(f"📱 Nachricht an {sender} gesendet.")
     except Exception as e:
         print(f"Fehler beim Senden der Nachricht: {e}")
@@ -71,20 +62,13 @@ def send_email(sender, subject, body, timestamp):
     """Sendet eine E-Mail an den Laptop."""
     _play_sound(MAIL_SOUND_PATH)
     try:
-        data = {"emails": []}
-        if LAPTOP_MAIL_FILE.exists():
-            with open(LAPTOP_MAIL_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        
         new_email = {
             "sender": sender, "subject": subject,
             "body": body.replace('\\n', '\n'),
             "timestamp": timestamp, "read": False
         }
-        data["emails"].append(new_email)
-        
-        with open(LAPTOP_MAIL_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        get_mail_store().append(new_email)
+        event_bus.publish(MAIL_ADDED, new_email)
         print(f"📧 E-Mail von {sender} an Laptop gesendet.")
     except Exception as e:
         print(f"Fehler beim Senden der E-Mail: {e}")
@@ -1,16 +1,16 @@
 # src/career/career_manager.py
-import threading
 import time
 import json
 from pathlib import Path
-import requests
 
-from src.config import DATA_DIR, TELEMETRY_URL
+from src.config import DATA_DIR
 from src.actions.communication import send_email
 from src.utils.location import get_current_coordinates, load_city_database, get_nearest_city_from_db
-from src.utils.geometry import is_point_in_polygon
+from src.game_integration.geofence_engine import get_geofence_engine
 from src.game_integration.ets2_savegame_parser import SavegameParser
 from src.utils.translation import get_pretty_city_name
+from src.utils.event_bus import event_bus, CAREER_UPDATED, ENGINE_OFF_IN_ZONE
+from src.utils.file_watcher import note_own_write
 
 CAREER_DATA_FILE = DATA_DIR / "career_data.json"
 COMPANY_LOCATIONS_FILE = DATA_DIR / "company_locations.json"
@@ -20,11 +20,13 @@ class CareerManager:
         self.laptop_ui = laptop_ui_instance
         self.career_data = self._load_json(CAREER_DATA_FILE, default={"status": "unemployed", "company": None, "application_pending": None})
         self.company_locations = self._load_json(COMPANY_LOCATIONS_FILE, default={})
+        self.geofence = get_geofence_engine()
+        for company, locations in self.company_locations.items():
+            self.geofence.add_zones(company, ((loc['template_name'], loc['corners']) for loc in locations))
         self.parser = SavegameParser()
         self.city_db = load_city_database()
         
         self._is_running = False
-        self.monitor_thread = None
         print("✨ CareerManager initialisiert.")
 
     def _load_json(self, file_path: Path, default=None):
@@ -42,19 +44,20 @@ class CareerManager:
         if data is None: data = self.career_data
         with open(CAREER_DATA_FILE, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        note_own_write(CAREER_DATA_FILE)
+        event_bus.publish(CAREER_UPDATED, dict(data))
 
     def start(self):
-        if not self.monitor_thread or not self.monitor_thread.is_alive():
+        if not self._is_running:
             self._is_running = True
-            self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-            self.monitor_thread.start()
-            print("✨ CareerManager: Monitoring-Thread gestartet.")
+            event_bus.subscribe(ENGINE_OFF_IN_ZONE, self._on_engine_off_in_zone)
+            print("✨ CareerManager: Wartet auf Geofence-Events.")
 
     def stop(self):
-        self._is_running = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2)
-        print("✨ CareerManager: Monitoring-Thread beendet.")
+        if self._is_running:
+            self._is_running = False
+            event_bus.unsubscribe(ENGINE_OFF_IN_ZONE, self._on_engine_off_in_zone)
+        print("✨ CareerManager: Geofence-Überwachung beendet.")
 
     def apply_for_job(self, company_name):
         if self.career_data.get("status") != "unemployed": return
@@ -80,32 +83,21 @@ class CareerManager:
         
         send_email("NETTO Personalabteilung", subject, body, time.time())
 
-    def _monitor_loop(self):
-        while self._is_running:
-            if self.career_data.get("application_pending"):
-                self._check_for_interview()
-            time.sleep(5)
-
-    def _check_for_interview(self):
-        company_to_check = self.career_data["application_pending"]
-        locations = self.company_locations.get(company_to_check, [])
-        if not locations: return
-        coords = get_current_coordinates()
-        if not coords: return
-        try:
-            response = requests.get(TELEMETRY_URL, timeout=0.5)
-            engine_on = response.json().get("truck", {}).get("engineOn", True)
-            if not engine_on:
-                player_pos = (coords['x'], coords['z'])
-                for location in locations:
-                    polygon = [(c['x'], c['z']) for c in location['corners']]
-                    if is_point_in_polygon(player_pos, polygon):
-                        print(f"INTERVIEW TRIGGERED! Spieler ist bei {location['template_name']} und Motor ist aus.")
-                        self.career_data["application_pending"] = None
-                        self.save_career_data()
-                        self.laptop_ui.window.after(0, self.laptop_ui.play_fullscreen_video, "bewerbung.mp4", lambda: self.complete_hiring(company_to_check))
-                        return
-        except (requests.RequestException, json.JSONDecodeError): pass
+        # Steht der Truck schon mit ausgeschaltetem Motor in einer Filiale, kommt kein neues Event mehr
+        if (zone := self.geofence.engine_off_zone(company_name.lower())):
+            self._start_interview(company_name.lower(), zone)
+
+    def _on_engine_off_in_zone(self, payload):
+        """Motor in einer Filiale der Firma aus, bei der eine Bewerbung läuft -> Vorstellungsgespräch."""
+        company_to_check = self.career_data.get("application_pending")
+        if not company_to_check or payload["group"] != company_to_check: return
+        self._start_interview(company_to_check, payload["zone"])
+
+    def _start_interview(self, company_to_check, zone):
+        print(f"INTERVIEW TRIGGERED! Spieler ist bei {zone} und Motor ist aus.")
+        self.career_data["application_pending"] = None
+        self.save_career_data()
+        self.laptop_ui.window.after(0, self.laptop_ui.play_fullscreen_video, "bewerbung.mp4", lambda: self.complete_hiring(company_to_check))
 
     def complete_hiring(self, company_name):
         self.career_data["status"] = "employed"
@@ -11,17 +11,94 @@ PROFILE_PATH = Path.home() / "Documents" / "Euro Truck Simulator 2" / "profiles"
 DATA_DIR = BASE_DIR / "data"
 TOOLS_DIR = BASE_DIR / "tools"
 SFX_DIR = BASE_DIR / "sfx"
+CACHE_DIR = BASE_DIR / "cache"
 
 # --- Telemetry Server ---
 TELEMETRY_SERVER_EXE = Path(r".")
 
 # --- Dateipfade ---
 PHONE_MESSAGE_FILE = DATA_DIR / "phone_messages.json"
+PHONE_MESSAGE_JOURNAL = DATA_DIR / "phone_messages.journal"
 LAPTOP_MAIL_FILE = DATA_DIR / "laptop_mail.json"
+LAPTOP_MAIL_JOURNAL = DATA_DIR / "laptop_mail.journal"
+ARCHIVE_DIR = DATA_DIR / "archive"
 ETS2_LOG_FILE = DATA_DIR / "ets2_log.json"
 SII_DECRYPT_EXE = TOOLS_DIR / "SII_Decrypt.exe"
 DELIVERY_DATA_FILE = DATA_DIR / "delivery_data.json" 
 
+# --- Historie ---
+# So viele Nachrichten pro Konversation bzw. E-Mails bleiben im Speicher, der Rest wandert
+# in komprimierte Archiv-Segmente und wird beim Hochscrollen seitenweise nachgeladen.
+MESSAGE_HISTORY_WINDOW = 200
+MAIL_HISTORY_WINDOW = 100
+ARCHIVE_SEGMENT_SIZE = 100
+
+# Intervall (Sekunden) für die Dateiüberwachung; nur noch Fallback für Änderungen von außen
+FILE_WATCH_FALLBACK_INTERVAL = 5.0
+
+# --- Bilder im Chat ---
+THUMBNAIL_SIZE = (180, 180)
+THUMBNAIL_CACHE_SIZE = 64 # fertige PhotoImages im Speicher
+THUMBNAIL_CACHE_DIR = CACHE_DIR / "thumbnails" # None = keine Thumbnails auf der Platte
+
+# --- Geofencing ---
+GEOFENCE_CELL_SIZE = 250 # Kantenlänge einer Rasterzelle des Zonen-Index in Spieleinheiten
+CITY_REQUERY_DISTANCE = 250 # erst ab dieser Strecke seit der letzten Abfrage wird die nächste Stadt neu gesucht
+GEOFENCE_DWELL_SECONDS = (10, 30, 60) # Schwellen, zu denen ZONE_DWELL einmal pro Aufenthalt gemeldet wird
+
+# --- Fahrtenaufzeichnung (navi.py) & Auswertung ---
+TRACE_DIR = CACHE_DIR / "traces"
+TRACE_INTERVAL_S = 1.0 # höchstens ein Trace-Punkt pro Sekunde
+TRACE_MAX_GAP_S = 5.0 # längere Lücken (Pause, Verbindung weg) zählen nicht als Aufenthaltszeit
+STOP_SPEED_KMH = 3.0 # darunter gilt der Truck als stehend
+STOP_MIN_SECONDS = 30.0 # kürzere Standphasen (Ampel, Kreuzung) sind kein Stopp
+APPROACH_WINDOW_S = 60.0 # Zeitfenster vor dem Betreten einer Zone für die Anfahrtsgeschwindigkeit
+
+# --- Straßennetz (navi.py & Lieferdienst-Navi) ---
+ROAD_NETWORK_FILE = CACHE_DIR / "road_network.bin" # Punkte + Segment-Offsets, wird per mmap geladen
+ROAD_NETWORK_LEGACY_FILE = CACHE_DIR / "road_network.json" # altes JSON-Format, wird beim ersten Laden konvertiert
+ROAD_SIMPLIFY_TOLERANCE = 0.5 # Douglas-Peucker-Toleranz beim Aufzeichnen in Spieleinheiten (~ Meter)
+# Vorvereinfachte Stufen (Toleranz in Spieleinheiten) für herausgezoomte Ansichten. Gezeichnet wird
+# die gröbste Stufe, deren Abweichung auf dem Bildschirm unter ROAD_LOD_PIXEL_TOLERANCE bleibt.
+ROAD_LOD_TOLERANCES = (2.0, 8.0, 32.0, 128.0)
+ROAD_LOD_PIXEL_TOLERANCE = 0.5
+ROAD_CHUNK_POINTS = 64 # Segmente werden zum Zeichnen in Stücke dieser Länge mit eigener Bounding-Box geteilt
+# Straßengraph: jede Fahrt wird auf bekannte Straßen gelegt, nur neue Abschnitte werden zu Kanten.
+# Die Kantenverläufe stehen in ROAD_NETWORK_FILE, hier nur Knoten und Kantenenden.
+ROAD_GRAPH_FILE = CACHE_DIR / "road_graph.npz"
+ROAD_GRAPH_SNAP_DISTANCE = 15.0 # näher an einer bekannten Straße gilt als dieselbe Straße
+ROAD_GRAPH_CELL_SIZE = 100.0 # Zellengröße des Spatial Hash
+ROAD_GRAPH_MIN_EDGE_LENGTH = 30.0 # kürzeres Ausscheren zwischen zwei bekannten Straßen ist Rauschen
+# Routenführung im Lieferdienst-Navi über den Straßengraphen
+ROUTE_AVERAGE_SPEED_KMH = 40.0 # Durchschnitt für die geschätzte Fahrzeit
+ROUTE_REQUERY_DISTANCE = 25.0 # erst ab dieser Strecke seit der letzten Berechnung wird die Route neu gesucht
+
+# --- Lieferdienst-Navi ---
+NAVI_TILE_SIZE = 256 # Pixel pro Kachel
+NAVI_TILE_CACHE_SIZE = 64 # Kacheln im Speicher
+NAVI_TILE_CACHE_DIR = CACHE_DIR / "map_tiles" # None = Kacheln nicht auf der Platte ablegen
+NAVI_ZOOM_STEPS = 4 # Zoomstufen pro Verdopplung, auf die die Kamera einrastet
+# Neu gezeichnet wird nur, wenn sich etwas ändert, höchstens NAVI_MAX_FPS mal pro Sekunde.
+# Ohne Änderungen prüft die Karte nur noch alle NAVI_IDLE_INTERVAL_MS, ob etwas zu tun ist.
+NAVI_MAX_FPS = 20
+NAVI_IDLE_INTERVAL_MS = 1000
+NAVI_REDRAW_PIXEL_THRESHOLD = 1 # Truck-Bewegung in Pixeln
+NAVI_REDRAW_HEADING_THRESHOLD = 0.01
+
+# --- Videos ---
+VIDEO_FRAME_QUEUE_SIZE = 4 # dekodierte Frames, die höchstens auf die Anzeige warten
+CUTSCENE_CACHE_DIR = CACHE_DIR / "cutscenes" # auf Bildschirmgröße vorgerechnete Videos
+
+# --- Event-Handler ---
+# Worker-Threads für Spiel-Events und maximale Warteschlangenlänge pro Handler
+EVENT_HANDLER_WORKERS = 2
+EVENT_HANDLER_QUEUE_SIZE = 50
+
+# --- Hintergrund-Aufgaben der Overlays ---
+# Savegame-Abfragen aus der UI laufen in diesem Pool, der Tk-Thread fragt sie regelmäßig ab
+UI_TASK_WORKERS = 2
+UI_TASK_POLL_INTERVAL_MS = 50
+
 # --- Sound-Dateien ---
 SMS_SOUND_PATH = SFX_DIR / "sms_sound.wav"
 MAIL_SOUND_PATH = SFX_DIR / "mail_sound.wav"
@@ -38,6 +115,8 @@ PHONE_HEIGHT = 550
 # Laptop
 LAPTOP_WIDTH = 800
 LAPTOP_HEIGHT = 500
+# Screens werden erst beim ersten Öffnen gebaut; die übrigen danach im Leerlauf (None = aus)
+SCREEN_WARMUP_DELAY_MS = 3000
 
 OFFENCE_TYPE_MAP = {
     0: "Unfall mit Fremdbeteiligung",
@@ -7,6 +7,8 @@ from src.ui.phone_ui import PhoneOverlay
 from src.ui.laptop_ui import LaptopOverlay
 from src.event_handler.event_handler import ETS2EventHandler
 from src.career.career_manager import CareerManager 
+from src.storage.mail_store import get_mail_store
+from src.storage.message_store import get_message_store
 
 class DeviceManager:
     def __init__(self):
@@ -66,4 +68,6 @@ class DeviceManager:
         self.career_manager.stop() 
         self.phone.close()
         self.laptop.close()
+        get_message_store().compact()
+        get_mail_store().compact()
         self.root.destroy()
\ No newline at end of file
@@ -6,6 +6,7 @@ import random
 import re
 
 from src.config import PROFILE_PATH
+from src.event_handler.executor import HandlerExecutor
 from src.game_integration.ets2_event_logger import ETS2EventLogger
 from src.game_integration.ets2_savegame_parser import SavegameParser
 from src.actions.communication import send_message, send_email
@@ -15,20 +16,30 @@ class ETS2EventHandler:
     def __init__(self, profile_path: str = PROFILE_PATH):
         self.profile_path = profile_path
         self.logger = ETS2EventLogger(profile_path=self.profile_path, event_callback=self._handle_logged_event)
+        self.executor = HandlerExecutor(name="ets2-events")
         self.logger_thread = None
         self.last_ai_crash_count = None
         self.active_jobs = {}
         print("✨ ETS2EventHandler initialisiert.")
 
     def _handle_logged_event(self, event_type: str, details: dict):
+        """
+        Läuft im Logger-Thread und reiht nur ein, damit die Telemetrie-Schleife nie auf
+        Savegame-Analyse oder Nachrichten wartet. Job-Events teilen sich eine Warteschlange,
+        weil Start und Abschluss in Reihenfolge verarbeitet werden müssen.
+        """
         handler_map = {
-            "OVERALL_STATS_UPDATE": self._check_ai_crashes,
-            "JOB_STARTED": self._store_job_start_details,
-            "JOB_COMPLETED": self._check_job_delivery_status,
-            "JOB_CANCELLED": self._check_job_delivery_status,
+            "OVERALL_STATS_UPDATE": ("ai_crashes", self._check_ai_crashes),
+            "JOB_STARTED": ("jobs", self._store_job_start_details),
+            "JOB_COMPLETED": ("jobs", self._check_job_delivery_status),
+            "JOB_CANCELLED": ("jobs", self._check_job_delivery_status),
         }
-        if handler := handler_map.get(event_type):
-            handler(event_type, details)
+        if entry := handler_map.get(event_type):
+            key, handler = entry
+            self.executor.submit(key, handler, event_type, details)
+
+    def get_metrics(self) -> dict:
+        return self.executor.metrics()
 
     def _check_ai_crashes(self, event_type: str, details: dict):
         current_count = details.get("ai_crash_count")
@@ -95,9 +106,8 @@ class ETS2EventHandler:
             f"Mit freundlichen Grüßen,\nIhre Disposition"
         )
         send_email("Disposition", subject, body, time.time())
-        #  kurz warten
-        time.sleep(3)
-        send_message("Dispo", f"Deine Lieferung von {source} nach {target} war leider zu spät. Schau in deine Mails.", sent_by_me=False)
+        # kurz warten, ohne den Worker zu blockieren
+        threading.Timer(3, send_message, args=("Dispo", f"Deine Lieferung von {source} nach {target} war leider zu spät. Schau in deine Mails."), kwargs={"sent_by_me": False}).start()
 
     def start(self):
         if not self.logger_thread or not self.logger_thread.is_alive():
@@ -110,3 +120,6 @@ class ETS2EventHandler:
             self.logger.stop()
             self.logger_thread.join(timeout=5)
             print("✨ ETS2EventHandler: Logger-Thread beendet.")
+        self.executor.shutdown()
+        for key, m in self.get_metrics().items():
+            print(f"📊 Handler '{key}': {m['processed']} verarbeitet, {m['dropped']} verworfen, Ø {m['avg_latency_ms']} ms (max {m['max_latency_ms']} ms)")
@@ -0,0 +1,106 @@
+# src/event_handler/executor.py
+import queue
+import threading
+import time
+from collections import deque
+
+from src.config import EVENT_HANDLER_WORKERS, EVENT_HANDLER_QUEUE_SIZE
+
+
+class _HandlerQueue:
+    def __init__(self):
+        self.jobs = deque()
+        self.scheduled = False # Liegt in der Ready-Queue oder läuft gerade
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_wait = 0.0
+
+
+class HandlerExecutor:
+    """
+    Begrenzter Worker-Pool für Event-Handler.
+
+    Jeder Schlüssel (i.d.R. ein Handler) hat eine eigene FIFO-Warteschlange. Pro Schlüssel
+    läuft höchstens ein Job gleichzeitig, die Reihenfolge bleibt also erhalten, während
+    verschiedene Schlüssel parallel abgearbeitet werden. Ist eine Warteschlange voll, wird
+    das Event verworfen und gezählt, statt den aufrufenden Thread zu blockieren.
+    """
+    def __init__(self, max_workers: int = EVENT_HANDLER_WORKERS, max_queue: int = EVENT_HANDLER_QUEUE_SIZE, name: str = "handler"):
+        self.max_queue = max_queue
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._ready = queue.Queue()
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"{name}-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, key: str, func, *args) -> bool:
+        """Reiht einen Job ein. Gibt False zurück, wenn die Warteschlange des Schlüssels voll ist."""
+        with self._lock:
+            handler_queue = self._queues.setdefault(key, _HandlerQueue())
+            if len(handler_queue.jobs) >= self.max_queue:
+                handler_queue.dropped += 1
+                print(f"✗ Event-Warteschlange '{key}' voll, Event verworfen.")
+                return False
+            handler_queue.jobs.append((func, args, time.monotonic()))
+            if not handler_queue.scheduled:
+                handler_queue.scheduled = True
+                self._ready.put(key)
+        return True
+
+    def _worker_loop(self):
+        while (key := self._ready.get()) is not None:
+            with self._lock:
+                handler_queue = self._queues[key]
+                func, args, enqueued_at = handler_queue.jobs.popleft()
+
+            started_at = time.monotonic()
+            failed = False
+            try:
+                func(*args)
+            except Exception as e:
+                failed = True
+                print(f"✗ Fehler im Event-Handler '{key}': {e}")
+            latency = time.monotonic() - started_at
+
+            with self._lock:
+                handler_queue.processed += 1
+                handler_queue.failed += failed
+                handler_queue.total_latency += latency
+                handler_queue.max_latency = max(handler_queue.max_latency, latency)
+                handler_queue.total_wait += started_at - enqueued_at
+                # Erst danach den nächsten Job desselben Schlüssels freigeben (Reihenfolge)
+                if handler_queue.jobs:
+                    self._ready.put(key)
+                else:
+                    handler_queue.scheduled = False
+
+    def metrics(self) -> dict:
+        """Warteschlangentiefe und Laufzeiten je Schlüssel (Zeiten in Millisekunden)."""
+        with self._lock:
+            return {
+                key: {
+                    "queued": len(q.jobs),
+                    "processed": q.processed,
+                    "dropped": q.dropped,
+                    "failed": q.failed,
+                    "avg_latency_ms": round(q.total_latency / q.processed * 1000, 1) if q.processed else 0.0,
+                    "max_latency_ms": round(q.max_latency * 1000, 1),
+                    "avg_wait_ms": round(q.total_wait / q.processed * 1000, 1) if q.processed else 0.0,
+                }
+                for key, q in self._queues.items()
+            }
+
+    def shutdown(self, timeout: float = 5.0):
+        """Beendet die Worker nach ihrem aktuellen Job; noch wartende Events verfallen."""
+        for _ in self._workers:
+            self._ready.put(None)
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
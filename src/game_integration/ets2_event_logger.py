@@ -9,6 +9,7 @@ from typing import Optional, Callable
 from src.config import PROFILE_PATH, ETS2_LOG_FILE, TELEMETRY_URL
 from src.utils.translation import get_human_job_details
 from .ets2_savegame_parser import SavegameParser
+from .geofence_engine import get_geofence_engine
 
 class ETS2EventLogger:
     def __init__(self, profile_path: str = PROFILE_PATH, log_file: str = ETS2_LOG_FILE, event_callback: Optional[Callable] = None):
@@ -81,6 +82,7 @@ class ETS2EventLogger:
         return "N/A"
 
     def _process_telemetry_data(self, telemetry_data: dict):
+        get_geofence_engine().update(telemetry_data) # Zonen-Events für Karriere & Co.
         game_connected = telemetry_data.get("game", {}).get("connected", False)
         if game_connected != self._last_game_connected_state:
             event_type = "GAME_CONNECTED" if game_connected else "GAME_DISCONNECTED"
@@ -3,6 +3,7 @@ import subprocess
 import re
 from pathlib import Path
 import os
+import threading
 from typing import List, Dict, Optional, Any
 
 from src.config import PROFILE_PATH, SII_DECRYPT_EXE, OFFENCE_TYPE_MAP
@@ -11,6 +12,9 @@ from src.utils.translation import (
     get_pretty_city_name, get_raw_city_names
 )
 
+# Alle Parser teilen sich die temporäre Datei, Event-Logger und Handler-Worker laufen aber parallel
+_decryption_lock = threading.Lock()
+
 class SavegameParser:
     def __init__(self, profile_path: Path = PROFILE_PATH):
         self.profile_dir = profile_path
@@ -60,6 +64,10 @@ class SavegameParser:
         return f"Tag {day + 1}, {hour:02d}:{minute:02d}"
 
     def _execute_with_decryption(self, parser_func, *args, **kwargs):
+        with _decryption_lock:
+            return self._execute_with_decryption_unlocked(parser_func, *args, **kwargs)
+
+    def _execute_with_decryption_unlocked(self, parser_func, *args, **kwargs):
         latest_save = self._find_latest_save()
         if not latest_save:
             print("✗ Kein Savegame gefunden.")
@@ -0,0 +1,104 @@
+# src/game_integration/geofence_engine.py
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config import GEOFENCE_DWELL_SECONDS
+from src.utils.event_bus import event_bus, ZONE_ENTER, ZONE_EXIT, ZONE_DWELL, ENGINE_OFF_IN_ZONE
+from src.utils.geofence_index import GeofenceIndex
+
+
+class GeofenceEngine:
+    """
+    Verfolgt, in welchen Zonen der Truck steht, und meldet Änderungen über den Event-Bus.
+
+    Zonen werden gruppenweise registriert (z.B. "delivery" aus locations.json oder ein
+    Firmenname aus company_locations.json). Wer Telemetrie pollt, ruft `update` auf; Abonnenten
+    bekommen ZONE_ENTER / ZONE_EXIT / ZONE_DWELL / ENGINE_OFF_IN_ZONE im Thread des Aufrufers.
+    """
+    def __init__(self, dwell_seconds: Iterable[float] = GEOFENCE_DWELL_SECONDS, bus=event_bus):
+        self.dwell_seconds = sorted(dwell_seconds)
+        self.bus = bus
+        self._lock = threading.Lock()
+        self._index = GeofenceIndex()
+        self._groups: Dict[str, int] = {}
+        # Zone (group, name) -> [Eintrittszeit, Anzahl bereits gemeldeter Dwell-Schwellen]
+        self._inside: Dict[Tuple[str, str], list] = {}
+        self._current: List[Tuple[str, str]] = []
+        self._engine_on: Optional[bool] = None
+
+    def add_zones(self, group: str, zones: Iterable[Tuple[str, List[dict]]]):
+        """Registriert (Name, corners)-Paare im Format der Orts-JSONs unter einer Gruppe."""
+        with self._lock:
+            count = 0
+            for name, corners in zones:
+                self._index.add((group, name), [(c['x'], c['z']) for c in corners])
+                count += 1
+            self._groups[group] = self._groups.get(group, 0) + count
+        print(f"📍 Geofence: {count} Zonen für '{group}' registriert.")
+
+    def has_group(self, group: str) -> bool:
+        return group in self._groups
+
+    def current_zone(self, group: str) -> Optional[str]:
+        """Die Zone dieser Gruppe, in der der Truck gerade steht (bei Überlappung die zuerst registrierte)."""
+        with self._lock:
+            return next((name for (g, name) in self._current if g == group), None)
+
+    def engine_off_zone(self, group: str) -> Optional[str]:
+        """Zone dieser Gruppe, in der der Truck gerade mit ausgeschaltetem Motor steht, sonst None."""
+        with self._lock:
+            if self._engine_on is not False: return None
+            return next((name for (g, name) in self._current if g == group), None)
+
+    def update(self, telemetry_data: Optional[dict], now: Optional[float] = None):
+        """Verarbeitet einen Telemetrie-Stand. Ohne Verbindung gelten alle Zonen als verlassen."""
+        now = time.monotonic() if now is None else now
+        events = []
+        with self._lock:
+            placement = (telemetry_data or {}).get("truck", {}).get("placement", {})
+            connected = bool(telemetry_data and telemetry_data.get("game", {}).get("connected"))
+            if not connected or not placement:
+                position = None
+                zones = []
+                engine_on = None
+            else:
+                position = (placement.get('x', 0), placement.get('z', 0))
+                zones = self._index.query_all(*position)
+                engine_on = telemetry_data.get("truck", {}).get("engineOn", False)
+
+            for zone in [z for z in self._inside if z not in zones]:
+                entered_at, _ = self._inside.pop(zone)
+                events.append((ZONE_EXIT, zone, {"seconds": now - entered_at}))
+            # Motor aus in einer Zone: beim Wechsel an -> aus, beim Hineinrollen mit schon
+            # ausgeschaltetem Motor und beim ersten Stand nach dem Verbinden (vorher unbekannt)
+            engine_off_now = engine_on is False and self._engine_on is not False
+            for zone in zones:
+                entered = zone not in self._inside
+                if entered:
+                    self._inside[zone] = [now, 0]
+                    events.append((ZONE_ENTER, zone, {}))
+                if engine_on is False and (entered or engine_off_now):
+                    events.append((ENGINE_OFF_IN_ZONE, zone, {}))
+                state = self._inside[zone]
+                while state[1] < len(self.dwell_seconds) and now - state[0] >= self.dwell_seconds[state[1]]:
+                    events.append((ZONE_DWELL, zone, {"seconds": self.dwell_seconds[state[1]]}))
+                    state[1] += 1
+
+            self._engine_on = engine_on
+            self._current = zones
+
+        for topic, (group, name), extra in events:
+            self.bus.publish(topic, {"group": group, "zone": name, "position": position, **extra})
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_geofence_engine() -> GeofenceEngine:
+    """Gibt die prozessweite GeofenceEngine-Instanz zurück."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = GeofenceEngine()
+        return _engine
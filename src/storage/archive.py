@@ -0,0 +1,44 @@
+# src/storage/archive.py
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+
+
+class SegmentArchive:
+    """
+    Kalte Historie als gzip-komprimierte JSON-Segmente (000001.json.gz, 000002.json.gz, ...).
+    Segment 1 ist das älteste. Ein Segment wird genau einmal geschrieben und danach nur gelesen;
+    erneutes Schreiben desselben Index (z.B. beim Journal-Replay) überschreibt identisch.
+    """
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _segment_path(self, index: int) -> Path:
+        return self.directory / f"{index:06d}.json.gz"
+
+    def write_segment(self, index: int, items: list):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._segment_path(index).with_suffix(".tmp")
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+        tmp_path.replace(self._segment_path(index))
+
+    def read_segment(self, index: int) -> list:
+        path = self._segment_path(index)
+        if not path.exists():
+            print(f"✗ Archiv-Segment fehlt: {path}")
+            return []
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"✗ Archiv-Segment {path.name} nicht lesbar: {e}")
+            return []
+
+
+def archive_dir_name(key: str) -> str:
+    """Dateisystem-sicherer, eindeutiger Verzeichnisname (z.B. für Absender mit Umlauten)."""
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '_', key).strip('_')[:40] or "x"
+    return f"{slug}_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}"
@@ -0,0 +1,102 @@
+# src/storage/delivery_stats.py
+from collections import deque
+from datetime import datetime
+
+ROLLING_WINDOW = 10 # Anzahl Lieferungen für den gleitenden Durchschnitt
+TIP_BUCKET_PERCENT = 2 # Breite der Trinkgeld-Klassen in Prozent der Zahlung
+
+
+class DeliveryStats:
+    """
+    Laufend gepflegte Kennzahlen zum Lieferdienst. Jede Lieferung aktualisiert alle Werte
+    in O(1), das Dashboard muss die Historie nie durchlaufen.
+
+    Gespeichert wird alles als `aggregates` in delivery_data.json. Fehlt der Block (alte
+    Spielstände), wird er einmalig aus der vorhandenen Historie aufgebaut.
+    """
+    def __init__(self, aggregates=None):
+        a = aggregates or {}
+        self.total_earnings = a.get("total_earnings", 0.0)
+        self.total_tips = a.get("total_tips", 0.0)
+        self.completed_deliveries = a.get("completed_deliveries", 0)
+        self.by_customer = a.get("by_customer", {})
+        self.by_restaurant = a.get("by_restaurant", {})
+        self.top_customer = a.get("top_customer")
+        self.top_restaurant = a.get("top_restaurant")
+        self.earnings_by_hour = a.get("earnings_by_hour", [0.0] * 24)
+        self.best_hour = a.get("best_hour")
+        self.deliveries_per_day = a.get("deliveries_per_day", {})
+        self.last_day = a.get("last_day")
+        self.tip_histogram = a.get("tip_histogram", {})
+        self._recent_profits = deque(a.get("recent_profits", []), maxlen=ROLLING_WINDOW)
+        self._recent_sum = sum(self._recent_profits)
+
+    @classmethod
+    def from_history(cls, history):
+        """Einmalige Migration: Kennzahlen aus einer bestehenden Historie aufbauen."""
+        stats = cls()
+        for entry in history:
+            stats.record(entry)
+        return stats
+
+    def record(self, entry: dict):
+        """Verbucht eine Lieferung (ein Historien-Eintrag)."""
+        profit = entry.get("profit", 0.0)
+        self.total_earnings += profit
+        self.completed_deliveries += 1
+
+        self.top_customer = self._add_to_group(self.by_customer, entry.get("customer"), profit, self.top_customer)
+        self.top_restaurant = self._add_to_group(self.by_restaurant, entry.get("restaurant"), profit, self.top_restaurant)
+
+        if len(self._recent_profits) == self._recent_profits.maxlen:
+            self._recent_sum -= self._recent_profits[0]
+        self._recent_profits.append(profit)
+        self._recent_sum += profit
+
+        hour = entry.get("hour")
+        if hour is None and entry.get("date"):
+            hour = datetime.strptime(entry["date"], "%Y-%m-%d %H:%M").hour
+        if hour is not None:
+            self.earnings_by_hour[hour] += profit
+            # Stundenwerte wachsen nur, daher reicht der Vergleich mit dem bisherigen Bestwert
+            if self.best_hour is None or self.earnings_by_hour[hour] > self.earnings_by_hour[self.best_hour]:
+                self.best_hour = hour
+
+        day = entry.get("game_day") or (entry.get("date") or "")[:10]
+        if day:
+            self.deliveries_per_day[day] = self.deliveries_per_day.get(day, 0) + 1
+            self.last_day = day
+
+        if (tip := entry.get("tip")) is not None and entry.get("payment"):
+            self.total_tips += tip
+            bucket = str(int(tip / entry["payment"] * 100) // TIP_BUCKET_PERCENT * TIP_BUCKET_PERCENT)
+            self.tip_histogram[bucket] = self.tip_histogram.get(bucket, 0) + 1
+
+    @staticmethod
+    def _add_to_group(groups, key, profit, current_top):
+        if not key: return current_top
+        group = groups.setdefault(key, {"count": 0, "earnings": 0.0})
+        group["count"] += 1
+        group["earnings"] += profit
+        if current_top is None or group["earnings"] > groups[current_top]["earnings"]:
+            return key
+        return current_top
+
+    @property
+    def rolling_average(self):
+        return self._recent_sum / len(self._recent_profits) if self._recent_profits else 0.0
+
+    @property
+    def deliveries_last_day(self):
+        return self.deliveries_per_day.get(self.last_day, 0) if self.last_day else 0
+
+    def to_dict(self):
+        return {
+            "total_earnings": self.total_earnings, "total_tips": self.total_tips,
+            "completed_deliveries": self.completed_deliveries,
+            "by_customer": self.by_customer, "by_restaurant": self.by_restaurant,
+            "top_customer": self.top_customer, "top_restaurant": self.top_restaurant,
+            "earnings_by_hour": self.earnings_by_hour, "best_hour": self.best_hour,
+            "deliveries_per_day": self.deliveries_per_day, "last_day": self.last_day,
+            "tip_histogram": self.tip_histogram, "recent_profits": list(self._recent_profits),
+        }
@@ -0,0 +1,47 @@
+# src/storage/journal.py
+import json
+import os
+from pathlib import Path
+
+
+class JsonJournal:
+    """
+    Append-only Journal im JSON-Lines-Format (ein Eintrag pro Zeile).
+    Ein Append schreibt nur die neue Zeile, unabhängig davon, wie groß die Historie ist.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self.entry_count = 0
+
+    def replay(self) -> list:
+        """Liest alle Einträge. Unvollständige Zeilen (z.B. nach einem Absturz) werden übersprungen."""
+        entries = []
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line: continue
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        print(f"✗ Beschädigte Journal-Zeile in {self.path.name} übersprungen.")
+        self.entry_count = len(entries)
+        return entries
+
+    def append(self, entry: dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.entry_count += 1
+
+    def truncate(self):
+        if self.path.exists():
+            self.path.unlink()
+        self.entry_count = 0
+
+
+def write_json_atomic(path: Path, data, indent=2):
+    """Schreibt JSON über eine temporäre Datei, damit nie eine halb geschriebene Datei liegen bleibt."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
@@ -0,0 +1,116 @@
+# src/storage/mail_store.py
+import json
+import threading
+from pathlib import Path
+from typing import List
+
+from src.config import (LAPTOP_MAIL_FILE, LAPTOP_MAIL_JOURNAL, ARCHIVE_DIR,
+                        MAIL_HISTORY_WINDOW, ARCHIVE_SEGMENT_SIZE)
+from src.storage.archive import SegmentArchive
+from src.storage.journal import JsonJournal, write_json_atomic
+from src.utils.file_watcher import note_own_write
+
+
+class MailStore:
+    """
+    Postfach des Laptops. Gleiches Schema wie der MessageStore: `laptop_mail.json` ist der
+    Snapshot, neue Mails gehen ins Journal, nur die neuesten `MAIL_HISTORY_WINDOW` Mails
+    bleiben resident, ältere liegen in Archiv-Segmenten.
+    """
+    def __init__(self, snapshot_file: Path = LAPTOP_MAIL_FILE, journal_file: Path = LAPTOP_MAIL_JOURNAL,
+                 archive_dir: Path = ARCHIVE_DIR / "mail", window: int = MAIL_HISTORY_WINDOW,
+                 segment_size: int = ARCHIVE_SEGMENT_SIZE):
+        self.snapshot_file = snapshot_file
+        self.journal = JsonJournal(journal_file)
+        self.archive = SegmentArchive(archive_dir)
+        self.window = window
+        self.segment_size = segment_size
+        self._lock = threading.RLock()
+        self._emails: List[dict] = []
+        self.archived_segments = 0
+        self.load()
+
+    def load(self):
+        """Lädt Snapshot + Journal komplett neu."""
+        with self._lock:
+            data = {"emails": []}
+            if self.snapshot_file.exists():
+                try:
+                    with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except json.JSONDecodeError as e:
+                    print(f"✗ Mail-Datei beschädigt, starte leer: {e}")
+
+            self._emails = sorted(data.get("emails", []), key=lambda e: e['timestamp'])
+            self.archived_segments = data.get("archived_segments", 0)
+            trimmed = self._trim()
+
+            for entry in self.journal.replay():
+                self._apply(entry)
+
+            if self.journal.entry_count or trimmed:
+                self.compact()
+
+    def _trim(self) -> bool:
+        """Älteste Mails blockweise archivieren (siehe MessageStore._trim)."""
+        trimmed = False
+        while len(self._emails) >= self.window + self.segment_size:
+            index = self.archived_segments + 1
+            self.archive.write_segment(index, self._emails[:self.segment_size])
+            del self._emails[:self.segment_size]
+            self.archived_segments = index
+            trimmed = True
+        return trimmed
+
+    def _apply(self, email: dict):
+        self._emails.append(email)
+        self._trim()
+
+    def append(self, email: dict):
+        with self._lock:
+            self.journal.append(email)
+            self._apply(email)
+
+    def compact(self):
+        with self._lock:
+            write_json_atomic(self.snapshot_file, {"emails": self._emails, "archived_segments": self.archived_segments})
+            self.journal.truncate()
+            note_own_write(self.snapshot_file)
+
+    def get_emails(self) -> List[dict]:
+        """Residente Mails, neueste zuerst."""
+        with self._lock:
+            return self._emails[::-1]
+
+    def read_archived(self, index: int) -> List[dict]:
+        """Ein archiviertes Segment, neueste zuerst (1 = älteste Mails)."""
+        return self.archive.read_segment(index)[::-1]
+
+
+class MailPager:
+    """Nachladen älterer Mails am Ende der Inbox; gehört zur Ansicht (vgl. ConversationPager)."""
+    def __init__(self, store: MailStore):
+        self.store = store
+        self._next_segment = store.archived_segments
+
+    def has_older(self) -> bool:
+        return self._next_segment > 0
+
+    def load_older(self) -> List[dict]:
+        if not self.has_older():
+            return []
+        items = self.store.read_archived(self._next_segment)
+        self._next_segment -= 1
+        return items
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_mail_store() -> MailStore:
+    """Gibt die prozessweite MailStore-Instanz zurück."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MailStore()
+        return _store
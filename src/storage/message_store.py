@@ -0,0 +1,174 @@
+# src/storage/message_store.py
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import (PHONE_MESSAGE_FILE, PHONE_MESSAGE_JOURNAL, ARCHIVE_DIR,
+                        MESSAGE_HISTORY_WINDOW, ARCHIVE_SEGMENT_SIZE)
+from src.storage.archive import SegmentArchive, archive_dir_name
+from src.storage.journal import JsonJournal, write_json_atomic
+from src.utils.file_watcher import note_own_write
+
+
+class MessageStore:
+    """
+    Hält alle Handy-Konversationen im Speicher, indiziert nach Absender.
+
+    Persistenz: `phone_messages.json` ist der Snapshot, neue Nachrichten landen als
+    einzelne Zeile im Journal. Beim Laden (und beim Beenden) wird das Journal in den
+    Snapshot gefaltet. Änderungen werden von `send_message` über den Event-Bus verteilt.
+
+    Pro Konversation bleiben nur die neuesten `MESSAGE_HISTORY_WINDOW` Nachrichten resident.
+    Ältere wandern blockweise in Archiv-Segmente (`archived_segments` zählt sie) und werden
+    über einen `ConversationPager` bei Bedarf gelesen.
+    """
+    def __init__(self, snapshot_file: Path = PHONE_MESSAGE_FILE, journal_file: Path = PHONE_MESSAGE_JOURNAL,
+                 archive_dir: Path = ARCHIVE_DIR / "messages", window: int = MESSAGE_HISTORY_WINDOW,
+                 segment_size: int = ARCHIVE_SEGMENT_SIZE):
+        self.snapshot_file = snapshot_file
+        self.journal = JsonJournal(journal_file)
+        self.archive_dir = archive_dir
+        self.window = window
+        self.segment_size = segment_size
+        self._archives: Dict[str, SegmentArchive] = {}
+        self._lock = threading.RLock()
+        self._conversations: Dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        """Lädt Snapshot + Journal komplett neu (z.B. nach externer Bearbeitung der Datei)."""
+        with self._lock:
+            data = {"conversations": []}
+            if self.snapshot_file.exists():
+                try:
+                    with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except json.JSONDecodeError as e:
+                    print(f"✗ Nachrichtendatei beschädigt, starte leer: {e}")
+
+            self._conversations = {}
+            trimmed = False
+            for conversation in data.get("conversations", []):
+                self._conversations[conversation["sender"]] = conversation
+                trimmed |= self._trim(conversation)
+
+            for entry in self.journal.replay():
+                self._apply(entry["sender"], entry["message"])
+
+            if self.journal.entry_count or trimmed:
+                self.compact()
+
+    def _archive(self, sender: str) -> SegmentArchive:
+        archive = self._archives.get(sender)
+        if archive is None:
+            archive = SegmentArchive(self.archive_dir / archive_dir_name(sender))
+            self._archives[sender] = archive
+        return archive
+
+    def _trim(self, conversation: dict) -> bool:
+        """
+        Verschiebt die ältesten Nachrichten blockweise ins Archiv, sobald das Fenster um ein
+        ganzes Segment überläuft. Der Segment-Index folgt aus dem Snapshot, daher schreibt ein
+        Journal-Replay nach einem Absturz dieselben Segmente identisch neu.
+        """
+        messages = conversation["messages"]
+        trimmed = False
+        while len(messages) >= self.window + self.segment_size:
+            index = conversation.get("archived_segments", 0) + 1
+            self._archive(conversation["sender"]).write_segment(index, messages[:self.segment_size])
+            del messages[:self.segment_size]
+            conversation["archived_segments"] = index
+            trimmed = True
+        return trimmed
+
+    def _apply(self, sender: str, message: dict) -> dict:
+        conversation = self._conversations.get(sender)
+        if conversation is None:
+            conversation = {"sender": sender, "messages": []}
+            self._conversations[sender] = conversation
+        conversation["messages"].append(message)
+        self._trim(conversation)
+        return conversation
+
+    def append(self, sender: str, message: dict) -> dict:
+        """Hängt eine Nachricht an (eine Journal-Zeile) und gibt die Konversation zurück."""
+        with self._lock:
+            self.journal.append({"sender": sender, "message": message})
+            return self._apply(sender, message)
+
+    def compact(self):
+        """Schreibt den Snapshot neu und leert das Journal."""
+        with self._lock:
+            write_json_atomic(self.snapshot_file, {"conversations": list(self._conversations.values())})
+            self.journal.truncate()
+            note_own_write(self.snapshot_file)
+
+    def get_conversation(self, sender: str) -> Optional[dict]:
+        return self._conversations.get(sender)
+
+    def read_archived(self, sender: str, index: int) -> List[dict]:
+        """Liest ein archiviertes Segment (1 = älteste Nachrichten)."""
+        return self._archive(sender).read_segment(index)
+
+    def get_conversations(self) -> List[dict]:
+        """Alle Konversationen, neueste zuerst. Kostet O(Anzahl Konversationen), nicht O(Historie)."""
+        with self._lock:
+            conversations = [c for c in self._conversations.values() if c["messages"]]
+        conversations.sort(key=lambda c: c['messages'][-1]['timestamp'], reverse=True)
+        return conversations
+
+
+class ConversationPager:
+    """
+    Sicht eines Overlays auf eine Konversation: das residente Fenster plus ältere Segmente,
+    die erst beim Hochscrollen nachgeladen werden. Gehört zur Ansicht und wird beim
+    Verlassen der Konversation verworfen, damit nachgeladene Historie nicht im Speicher bleibt.
+    """
+    def __init__(self, store: MessageStore, sender: str):
+        self.store = store
+        self.sender = sender
+        self.older: List[dict] = []
+        conversation = store.get_conversation(sender)
+        self._seen_segments = conversation.get("archived_segments", 0) if conversation else 0
+        self._next_segment = self._seen_segments
+
+    def has_older(self) -> bool:
+        return self._next_segment > 0
+
+    def load_older(self) -> List[dict]:
+        """Lädt das nächstältere Segment und gibt dessen Nachrichten zurück."""
+        if not self.has_older():
+            return []
+        items = self.store.read_archived(self.sender, self._next_segment)
+        self._next_segment -= 1
+        self.older[:0] = items
+        return items
+
+    def messages(self) -> List[dict]:
+        """Alle aktuell sichtbaren Nachrichten, älteste zuerst."""
+        conversation = self.store.get_conversation(self.sender)
+        if conversation is None:
+            return list(self.older)
+        archived = conversation.get("archived_segments", 0)
+        if archived > self._seen_segments:
+            if self.older:
+                # Seit dem Öffnen archivierte Nachrichten waren bisher resident -> Lücke schließen
+                for index in range(self._seen_segments + 1, archived + 1):
+                    self.older.extend(self.store.read_archived(self.sender, index))
+            else:
+                self._next_segment = archived
+            self._seen_segments = archived
+        return self.older + conversation["messages"]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_message_store() -> MessageStore:
+    """Gibt die prozessweite MessageStore-Instanz zurück."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MessageStore()
+        return _store
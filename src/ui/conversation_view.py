@@ -0,0 +1,142 @@
+# src/ui/conversation_view.py
+import os
+import re
+import tkinter as tk
+
+from src.ui.thumbnail_cache import get_thumbnail_cache
+
+
+class ConversationView:
+    """
+    Chat-Verlauf im Handy. Merkt sich, welche Nachrichten bereits als Blase gerendert sind,
+    und gleicht neue Listen nur an den Rändern ab: neue Nachrichten werden unten angehängt,
+    nachgeladene Historie oben eingefügt, archivierte oben entfernt. Eine neue Nachricht
+    kostet damit gleich viel, egal wie lang der Verlauf ist.
+    """
+    def __init__(self, canvas, frame, max_width):
+        self.canvas = canvas
+        self.frame = frame
+        self.max_width = max_width
+        self.thumbnails = get_thumbnail_cache()
+        self.sender = None
+        self._rendered = [] # Nachrichten-Dicts in Anzeige-Reihenfolge (Vergleich per Identität)
+        self._containers = []
+        self._time_label = None
+        self._scroll_to = None
+        self._keep_from_bottom = None
+        frame.bind('<Configure>', self._on_frame_configure)
+
+    def render(self, sender, messages):
+        if sender != self.sender or not self._rendered or not messages:
+            self._rebuild(sender, messages)
+            return
+
+        prepended = self._index_of(messages, self._rendered[0])
+        if prepended is None:
+            # Älteste angezeigte Nachrichten wurden archiviert -> oben abschneiden
+            vanished = self._index_of(self._rendered, messages[0])
+            if vanished is None:
+                self._rebuild(sender, messages)
+                return
+            for container in self._containers[:vanished]: container.destroy()
+            del self._containers[:vanished]
+            del self._rendered[:vanished]
+            prepended = 0
+
+        known_end = prepended + len(self._rendered)
+        if known_end > len(messages) or messages[known_end - 1] is not self._rendered[-1]:
+            self._rebuild(sender, messages)
+            return
+
+        if prepended:
+            self._prepend(messages[:prepended])
+        if known_end < len(messages):
+            for msg in messages[known_end:]:
+                self._append(msg)
+            self._update_time_label()
+            self._scroll_to = 1.0
+
+    def scroll_to_end(self):
+        self._scroll_to = 1.0
+        self.canvas.yview_moveto(1.0)
+
+    @staticmethod
+    def _index_of(items, target):
+        for i, item in enumerate(items):
+            if item is target: return i
+        return None
+
+    def _rebuild(self, sender, messages):
+        for container in self._containers: container.destroy()
+        self.sender = sender
+        self._rendered = []
+        self._containers = []
+        self._time_label = None
+        for msg in messages:
+            self._append(msg)
+        self._update_time_label()
+        self.scroll_to_end()
+
+    def _append(self, msg):
+        container = self._create_bubble(msg)
+        container.pack(fill='x', pady=3)
+        self._rendered.append(msg)
+        self._containers.append(container)
+
+    def _prepend(self, messages):
+        """Ältere Nachrichten oben einfügen; die Leseposition bleibt am selben Inhalt."""
+        height = self.frame.winfo_height()
+        top = self.canvas.yview()[0] * height
+        self._keep_from_bottom = height - top
+        first = self._containers[0]
+        containers = [self._create_bubble(msg) for msg in messages]
+        for container in containers:
+            container.pack(fill='x', pady=3, before=first)
+        self._rendered[:0] = messages
+        self._containers[:0] = containers
+
+    def _create_bubble(self, msg):
+        is_sent = msg.get("sent_by_me", False)
+        msg_container = tk.Frame(self.frame, bg='#000000')
+        image_match = re.match(r"\[Bild gesendet: (.*?)\]", msg["text"])
+        if image_match:
+            image_path = image_match.group(1).strip()
+            try:
+                photo = self.thumbnails.get(image_path)
+                img_label = tk.Label(msg_container, image=photo, bg='#000000', bd=0)
+                img_label.image = photo # Referenz halten, solange die Blase existiert
+                if is_sent: img_label.pack(side='right', padx=(50, 15))
+                else: img_label.pack(side='left', padx=(15, 50))
+            except FileNotFoundError:
+                error_text = f"Bild nicht gefunden:\n{os.path.basename(image_path)}"
+                bubble = tk.Label(msg_container, text=error_text, bg="#ff3b30", fg='white', font=('SF Pro Display', 14), wraplength=self.max_width, justify='left', padx=16, pady=12, bd=0)
+                if is_sent: bubble.pack(side='right', padx=(50, 15))
+                else: bubble.pack(side='left', padx=(15, 50))
+        else:
+            bubble_bg = '#007aff' if is_sent else '#3a3a3c'
+            bubble = tk.Label(msg_container, text=msg["text"], bg=bubble_bg, fg='#ffffff', font=('SF Pro Display', 16), wraplength=self.max_width, justify='left', padx=16, pady=12, bd=0)
+            if is_sent: bubble.pack(side='right', padx=(50, 15))
+            else: bubble.pack(side='left', padx=(15, 50))
+        return msg_container
+
+    def _update_time_label(self):
+        """Zeitstempel nur unter der letzten Nachricht."""
+        if self._time_label is not None:
+            self._time_label.destroy()
+            self._time_label = None
+        if not self._rendered: return
+        msg = self._rendered[-1]
+        if time_text := msg.get("ingame_time", ""):
+            self._time_label = tk.Label(self._containers[-1], text=time_text, bg='#000000', fg='#8e8e93', font=('SF Pro Display', 12))
+            if msg.get("sent_by_me", False): self._time_label.pack(side='right', padx=(0, 20), pady=(2, 0))
+            else: self._time_label.pack(side='left', padx=(20, 0), pady=(2, 0))
+
+    def _on_frame_configure(self, event):
+        """Scrollbereich erst nach dem Layout anpassen statt per update_idletasks zu erzwingen."""
+        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        if self._keep_from_bottom is not None:
+            self.canvas.yview_moveto(max(0.0, event.height - self._keep_from_bottom) / event.height)
+            self._keep_from_bottom = None
+        elif self._scroll_to is not None:
+            self.canvas.yview_moveto(self._scroll_to)
+            self._scroll_to = None
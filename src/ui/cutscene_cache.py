@@ -0,0 +1,125 @@
+# src/ui/cutscene_cache.py
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from src.config import CUTSCENE_CACHE_DIR
+
+# Dateikopf der vorgerechneten Fassung, danach folgen die Frames als rohes RGB (frames x height x width x 3)
+_HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('frames', '<u4'), ('width', '<u4'), ('height', '<u4'), ('fps', '<f8')])
+_MAGIC = b"ETSCUT\0\0"
+_VERSION = 1
+CUTSCENE_SUFFIX = ".rgb"
+
+_lock = threading.Lock()
+_in_progress = set()
+
+
+def fit_size(frame_w, frame_h, screen_w, screen_h):
+    """Größe, in der ein Frame seitenverhältnistreu auf den Bildschirm passt."""
+    ratio = min(screen_w / frame_w, screen_h / frame_h)
+    return int(frame_w * ratio), int(frame_h * ratio)
+
+
+def _cache_path(source: Path, target_size) -> Path:
+    stat = source.stat()
+    key = f"{source.resolve()}|{stat.st_mtime_ns}|{target_size[0]}x{target_size[1]}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    return CUTSCENE_CACHE_DIR / f"{source.stem}_{target_size[0]}x{target_size[1]}_{digest}{CUTSCENE_SUFFIX}"
+
+
+def get_cached_cutscene(source, target_size) -> Optional[Path]:
+    """Pfad der vorgerechneten Fassung für (Quelle, mtime, Bildschirmgröße), falls schon vorhanden."""
+    source = Path(source)
+    if not source.exists(): return None
+    path = _cache_path(source, target_size)
+    return path if path.exists() else None
+
+
+def ensure_cutscene_cached(source, target_size) -> Optional[Path]:
+    """
+    Rechnet ein Video einmalig in rohe RGB-Frames in Bildschirmgröße um. Bei der Wiedergabe
+    wird dann weder dekodiert, skaliert noch Farben getauscht, nur per mmap gelesen. Der Preis
+    ist Platz: in Full HD gut 6 MB pro Frame. Blockiert, im Hintergrund aufrufen.
+    """
+    source = Path(source)
+    if not source.exists(): return None
+    target = _cache_path(source, target_size)
+    with _lock:
+        if target.exists(): return target
+        if target in _in_progress: return None
+        _in_progress.add(target)
+
+    try:
+        print(f"🎬 Bereite Zwischensequenz '{source.name}' für {target_size[0]}x{target_size[1]} vor...")
+        if _transcode(source, target, target_size):
+            # Ältere Fassungen derselben Quelle (andere Auflösung, alte mtime, altes Format) aufräumen
+            for old in CUTSCENE_CACHE_DIR.glob(f"{source.stem}_*"):
+                if old != target and not old.name.endswith(".tmp"):
+                    try: old.unlink()
+                    except OSError: pass
+            print(f"✅ Zwischensequenz '{source.name}' vorbereitet.")
+            return target
+        return None
+    finally:
+        with _lock:
+            _in_progress.discard(target)
+
+
+def load_cutscene(path):
+    """Bildet eine vorgerechnete Fassung per mmap ab: (fps, Frames als uint8-Array frames x h x w x 3, RGB)."""
+    path = Path(path)
+    with open(path, 'rb') as f:
+        raw = f.read(_HEADER.itemsize)
+    if len(raw) < _HEADER.itemsize:
+        raise ValueError(f"{path} ist zu kurz für eine Zwischensequenz.")
+    header = np.frombuffer(raw, dtype=_HEADER)[0]
+    if header['magic'] != _MAGIC.rstrip(b"\0") or header['version'] != _VERSION:
+        raise ValueError(f"{path} ist keine Zwischensequenz im Format v{_VERSION}.")
+    shape = (int(header['frames']), int(header['height']), int(header['width']), 3)
+    if not shape[0] or path.stat().st_size != _HEADER.itemsize + int(np.prod(shape)):
+        raise ValueError(f"{path} ist unvollständig.")
+    return float(header['fps']), np.memmap(path, dtype=np.uint8, mode='r', offset=_HEADER.itemsize, shape=shape)
+
+
+def _transcode(source: Path, target: Path, target_size) -> bool:
+    cap = cv2.VideoCapture(str(source))
+    if not cap.isOpened():
+        print(f"✗ Video konnte nicht geöffnet werden: {source}")
+        return False
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    fps = fps if fps > 0 else 30.0
+    CUTSCENE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(target.name + ".tmp")
+    frames, size = 0, None
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(bytes(_HEADER.itemsize)) # Platzhalter, die Frame-Anzahl steht erst am Ende fest
+            while True:
+                ret, frame = cap.read()
+                if not ret: break
+                if size is None: size = fit_size(frame.shape[1], frame.shape[0], *target_size)
+                if size != (frame.shape[1], frame.shape[0]):
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA) # einmalig, also gute Qualität
+                f.write(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB).tobytes())
+                frames += 1
+            if frames:
+                f.seek(0)
+                f.write(np.array([(_MAGIC, _VERSION, frames, size[0], size[1], fps)], dtype=_HEADER).tobytes())
+    except OSError as e:
+        print(f"✗ Zwischensequenz konnte nicht geschrieben werden: {e}")
+        frames = 0
+    finally:
+        cap.release()
+
+    if not frames:
+        print(f"✗ Zwischensequenz konnte nicht umgerechnet werden: {source}")
+        try: tmp_path.unlink()
+        except OSError: pass
+        return False
+    tmp_path.replace(target)
+    return True
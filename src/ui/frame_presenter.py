@@ -0,0 +1,42 @@
+# src/ui/frame_presenter.py
+import tkinter as tk
+
+import pygame
+
+
+def put_rgb(photo: tk.PhotoImage, pixels: bytes, width: int, height: int, x: int = 0, y: int = 0):
+    """Schreibt RGB-Rohdaten als binäres PPM an Position (x, y) in ein bestehendes PhotoImage."""
+    ppm = b"P6\n%d %d\n255\n" % (width, height) + pixels
+    photo.tk.call(photo.name, 'put', ppm, '-format', 'ppm', '-to', x, y)
+
+
+class FramePresenter:
+    """
+    Bringt pygame-Frames in ein Tk-Label. Statt pro Frame tostring -> PIL -> neues PhotoImage
+    gibt es genau ein PhotoImage, das per `put` mit binären PPM-Daten an Ort und Stelle
+    überschrieben wird, und zwar nur in den geänderten Rechtecken.
+    """
+    def __init__(self, label: tk.Label):
+        self.label = label
+        self.photo = None
+        self.size = None
+        self.frames = 0
+        self.bytes_transferred = 0
+
+    def present(self, surface: pygame.Surface, dirty_rects=None):
+        """`dirty_rects=None` überträgt den ganzen Frame, eine leere Liste gar nichts."""
+        size = surface.get_size()
+        if self.photo is None or size != self.size:
+            self.photo = tk.PhotoImage(master=self.label, width=size[0], height=size[1])
+            self.label.config(image=self.photo)
+            self.size = size
+            dirty_rects = None
+
+        bounds = surface.get_rect()
+        rects = [bounds] if dirty_rects is None else [bounds.clip(r) for r in dirty_rects]
+        for rect in rects:
+            if rect.width <= 0 or rect.height <= 0: continue
+            pixels = pygame.image.tostring(surface.subsurface(rect), 'RGB')
+            put_rgb(self.photo, pixels, rect.width, rect.height, rect.x, rect.y)
+            self.bytes_transferred += len(pixels)
+        self.frames += 1
@@ -11,12 +11,20 @@ import requests
 
 try:
     import cv2
+    from src.ui.video_player import VideoPlayer
+    from src.ui.cutscene_cache import get_cached_cutscene, ensure_cutscene_cached
     VIDEO_LIBS_AVAILABLE = True
 except ImportError:
     VIDEO_LIBS_AVAILABLE = False
 
 
-from src.config import LAPTOP_WIDTH, LAPTOP_HEIGHT, LAPTOP_MAIL_FILE, DATA_DIR, TELEMETRY_URL
+from src.config import LAPTOP_WIDTH, LAPTOP_HEIGHT, LAPTOP_MAIL_FILE, DATA_DIR, TELEMETRY_URL, SCREEN_WARMUP_DELAY_MS
+from src.storage.mail_store import get_mail_store, MailPager
+from src.utils.event_bus import event_bus, tk_callback, MAIL_ADDED, CAREER_UPDATED
+from src.utils.file_watcher import FileWatcher
+from src.ui.screen_registry import ScreenRegistry
+
+CAREER_DATA_FILE = DATA_DIR / "career_data.json"
 
 class LaptopOverlay:
     def __init__(self, master):
@@ -29,7 +37,9 @@ class LaptopOverlay:
         self.current_screen = "desktop"
         self.emails = []
         self.selected_email_index = -1
-        self.last_mail_check = 0
+        self.mail_store = get_mail_store()
+        self.mail_pager = None
+        self._older_mails_pending = False
         self.last_ingame_time_str = "00:00"
 
 
@@ -39,14 +49,33 @@ class LaptopOverlay:
 
         self.setup_window()
         self.create_ui()
+        self.load_career_data()
+
+        self._subscriptions = {
+            MAIL_ADDED: tk_callback(self.window, self._on_mail_added),
+            CAREER_UPDATED: tk_callback(self.window, self._on_career_updated),
+        }
+        for topic, callback in self._subscriptions.items():
+            event_bus.subscribe(topic, callback)
 
-        self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self.monitor_files, daemon=True)
-        self.monitor_thread.start()
+        self.file_watcher = FileWatcher()
+        self.file_watcher.watch(LAPTOP_MAIL_FILE, lambda path: self.window.after(0, self._on_mail_file_changed))
+        self.file_watcher.watch(CAREER_DATA_FILE, lambda path: self.load_career_data())
+        self.file_watcher.start()
+
+        self.prepare_cutscenes()
+        self.screens.warm_up(SCREEN_WARMUP_DELAY_MS)
 
         # TEMPORÄRER TEST - Video nach 10 Sekunden abspielen
         # self.window.after(10000, self.test_video_playback)
 
+    def prepare_cutscenes(self):
+        """Rechnet das Bewerbungsvideo vorab auf Bildschirmgröße um, damit es später ohne Skalieren läuft."""
+        video_path = DATA_DIR.parent / "bewerbung.mp4"
+        if not VIDEO_LIBS_AVAILABLE or not video_path.exists(): return
+        screen_size = (self.window.winfo_screenwidth(), self.window.winfo_screenheight())
+        threading.Thread(target=ensure_cutscene_cached, args=(video_path, screen_size), daemon=True).start()
+
     def test_video_playback(self):
         print("Starte Test-Video Wiedergabe...")
         def video_finished():
@@ -80,12 +109,14 @@ class LaptopOverlay:
         
         self.create_taskbar()
         
-        # UI-Elemente für die Screens erstellen
-        self.create_desktop_screen()
-        self.create_mail_screen()
-        self.create_browser_screen()
-        self.create_netto_career_screen()
-        self.create_netto_intranet_screen()
+        # Screens werden erst beim ersten Öffnen gebaut
+        self.screens = ScreenRegistry(self.window, {
+            "desktop": self.create_desktop_screen,
+            "mail": self.create_mail_screen,
+            "browser": self.create_browser_screen,
+            "netto_career": self.create_netto_career_screen,
+            "netto_intranet": self.create_netto_intranet_screen,
+        })
         
         self.show_screen("desktop")
         self.create_laptop_bottom()
@@ -137,28 +168,13 @@ class LaptopOverlay:
 
 
     def show_screen(self, screen_name):
-        all_screen_widgets = [
-            self.desktop_screen,
-            self.mail_screen,
-            self.browser_screen,
-            self.netto_career_screen,
-            self.netto_intranet_screen
-        ]
-        for widget in all_screen_widgets:
-            widget.pack_forget()
+        screen = self.screens.get(screen_name)
+        for widget in self.screens.built():
+            if widget is not screen: widget.pack_forget()
             
-        # Logik zum Anzeigen des richtigen Screens
-        if screen_name == "desktop":
-            self.desktop_screen.pack(fill='both', expand=True, before=self.taskbar)
-        elif screen_name == "mail":
-            self.mail_screen.pack(fill='both', expand=True, before=self.taskbar)
+        screen.pack(fill='both', expand=True, before=self.taskbar)
+        if screen_name == "mail":
             self.load_emails()
-        elif screen_name == "browser":
-            self.browser_screen.pack(fill='both', expand=True, before=self.taskbar)
-        elif screen_name == "netto_career":
-            self.netto_career_screen.pack(fill='both', expand=True, before=self.taskbar)
-        elif screen_name == "netto_intranet":
-            self.netto_intranet_screen.pack(fill='both', expand=True, before=self.taskbar)
             
         self.current_screen = screen_name
 
@@ -176,6 +192,7 @@ class LaptopOverlay:
         self.create_desktop_icon(icons_frame, "🌐", "Browser", lambda: self.show_screen("browser"), row=0, col=1)
         self.create_desktop_icon(icons_frame, "⚙️", "Einstellungen", None, state='disabled', row=0, col=2)
         self.create_desktop_icon(icons_frame, "📊", "Berichte", None, state='disabled', row=0, col=3)
+        return self.desktop_screen
 
     def create_desktop_icon(self, parent, icon_text, label_text, command, row=0, col=0, state='normal'):
         icon_frame = tk.Frame(parent, bg='#0f1419')
@@ -213,6 +230,7 @@ class LaptopOverlay:
         self.inbox_listbox = tk.Listbox(inbox_frame, bg='#ffffff', fg='#212529', font=("Segoe UI", 11), selectbackground='#007bff', selectforeground='white', borderwidth=0, highlightthickness=0, activestyle='none')
         self.inbox_listbox.pack(fill='both', expand=True, padx=5, pady=5)
         self.inbox_listbox.bind('<<ListboxSelect>>', self.on_email_select)
+        self.inbox_listbox.config(yscrollcommand=self._on_inbox_scroll)
         view_frame = tk.Frame(content_frame, bg='#ffffff', relief='solid', bd=1)
         view_frame.pack(side='right', fill='both', expand=True)
         email_header = tk.Frame(view_frame, bg='#f8f9fa', height=80)
@@ -225,6 +243,7 @@ class LaptopOverlay:
         tk.Frame(view_frame, height=1, bg='#dee2e6').pack(fill='x')
         self.email_body_text = tk.Text(view_frame, wrap="word", font=("Segoe UI", 11), bg='#ffffff', fg='#212529', borderwidth=0, highlightthickness=0, state='disabled', padx=15, pady=15)
         self.email_body_text.pack(fill='both', expand=True)
+        return self.mail_screen
 
     def on_email_select(self, event=None):
         if not (selection := self.inbox_listbox.curselection()): return
@@ -238,22 +257,53 @@ class LaptopOverlay:
         self.email_body_text.config(state='disabled')
 
     def load_emails(self):
+        """Zeigt die residenten Mails; ältere werden erst beim Scrollen ans Listenende nachgeladen."""
         try:
-            if LAPTOP_MAIL_FILE.exists():
-                with open(LAPTOP_MAIL_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                self.emails = sorted(data.get('emails', []), key=lambda e: e['timestamp'], reverse=True)
-                self.inbox_listbox.delete(0, tk.END)
-                for email in self.emails:
-                    sender_short = email['sender'][:15] + "..." if len(email['sender']) > 15 else email['sender']
-                    subject_short = email['subject'][:25] + "..." if len(email['subject']) > 25 else email['subject']
-                    self.inbox_listbox.insert(tk.END, f"{sender_short}\n{subject_short}")
-                if self.emails:
-                    self.inbox_listbox.selection_set(self.selected_email_index if self.selected_email_index < len(self.emails) else 0)
-                    self.on_email_select()
+            self.emails = self.mail_store.get_emails()
+            self.mail_pager = MailPager(self.mail_store)
+            self.inbox_listbox.delete(0, tk.END)
+            for email in self.emails:
+                self.inbox_listbox.insert(tk.END, self._format_inbox_entry(email))
+            if self.emails:
+                self.inbox_listbox.selection_set(self.selected_email_index if self.selected_email_index < len(self.emails) else 0)
+                self.on_email_select()
         except Exception as e:
             print(f"Fehler beim Laden der E-Mails: {e}")
 
+    def _on_inbox_scroll(self, first, last):
+        """yscrollcommand der Inbox: am Listenende die nächste Seite aus dem Archiv holen."""
+        if float(last) >= 1.0 and self.emails and self.mail_pager and self.mail_pager.has_older() and not self._older_mails_pending:
+            self._older_mails_pending = True
+            self.window.after_idle(self.load_older_emails)
+
+    def load_older_emails(self):
+        self._older_mails_pending = False
+        if not (self.mail_pager and self.mail_pager.has_older()): return
+        older = self.mail_pager.load_older()
+        self.emails.extend(older)
+        for email in older:
+            self.inbox_listbox.insert(tk.END, self._format_inbox_entry(email))
+
+    def _format_inbox_entry(self, email):
+        sender_short = email['sender'][:15] + "..." if len(email['sender']) > 15 else email['sender']
+        subject_short = email['subject'][:25] + "..." if len(email['subject']) > 25 else email['subject']
+        return f"{sender_short}\n{subject_short}"
+
+    def _on_mail_added(self, email):
+        """Neue E-Mail aus send_email: nur diese eine oben einfügen statt die Datei neu zu lesen."""
+        if self.current_screen != "mail": return # Beim Öffnen des Postfachs wird ohnehin geladen
+        self.emails.insert(0, email)
+        self.inbox_listbox.insert(0, self._format_inbox_entry(email))
+        if self.selected_email_index >= 0:
+            self.selected_email_index += 1
+            self.inbox_listbox.selection_clear(0, tk.END)
+            self.inbox_listbox.selection_set(self.selected_email_index)
+
+    def _on_mail_file_changed(self):
+        self.mail_store.load()
+        if self.visible and self.current_screen == "mail":
+            self.load_emails()
+
     def create_browser_screen(self):
         self.browser_screen = tk.Frame(self.main_frame, bg='#ffffff')
         
@@ -312,6 +362,7 @@ class LaptopOverlay:
                              bg='#d32f2f', fg='white', relief='flat', padx=20, pady=8,
                              activebackground='#b71c1c', command=self.open_netto_page)
         netto_btn.pack(anchor='w')
+        return self.browser_screen
 
     def open_netto_page(self):
         if self.career_data.get("status") == "employed" and self.career_data.get("company") == "netto":
@@ -425,6 +476,7 @@ class LaptopOverlay:
         def _on_mousewheel(event):
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        return self.netto_career_screen
 
 
     def handle_apply_netto(self):
@@ -555,6 +607,7 @@ class LaptopOverlay:
                             font=("Arial", 11), bg='#555', fg='white', relief='flat',
                             padx=15, pady=8, command=lambda: self.show_screen("desktop"))
         back_btn.pack(side='left', padx=20, pady=10)
+        return self.netto_intranet_screen
 
     def request_netto_job(self):
         if self.career_manager:
@@ -564,33 +617,23 @@ class LaptopOverlay:
             
     def update_intranet_status(self, message):
         def _update():
+            if not self.screens.is_built("netto_intranet"): return
             self.intranet_status_label.config(text=message)
             # Re-enable button when search is finished
             if "gefunden" in message or "verfügbar" in message or "Fehler" in message:
                 self.job_request_button.config(state="normal", bg="#4caf50", fg="white")
         self.window.after(0, _update)
 
-    def monitor_files(self):
-       career_data_path = DATA_DIR / "career_data.json"
-       last_career_check = 0
-       while self.monitoring:
-           try:
-               if LAPTOP_MAIL_FILE.exists():
-                   stat = os.path.getmtime(LAPTOP_MAIL_FILE)
-                   if stat != self.last_mail_check:
-                       self.last_mail_check = stat
-                       if self.visible and self.current_screen == "mail":
-                           self.window.after(0, self.load_emails)
-               
-               if career_data_path.exists():
-                   stat = os.path.getmtime(career_data_path)
-                   if stat != last_career_check:
-                       last_career_check = stat
-                       with open(career_data_path, 'r', encoding='utf-8') as f:
-                           self.career_data = json.load(f)
-           except Exception as e:
-               print(f"File monitoring Fehler: {e}")
-           time.sleep(1)
+    def load_career_data(self):
+        try:
+            if CAREER_DATA_FILE.exists():
+                with open(CAREER_DATA_FILE, 'r', encoding='utf-8') as f:
+                    self.career_data = json.load(f)
+        except Exception as e:
+            print(f"Fehler beim Laden der Karriere-Daten: {e}")
+
+    def _on_career_updated(self, career_data):
+        self.career_data = career_data
 
     def setup_keyboard_hooks(self, enable):
         if enable: 
@@ -660,83 +703,38 @@ class LaptopOverlay:
 
         # Video-Steuerung
         self.video_playing = True
+        player = None
 
         def close_video(event=None):
             nonlocal on_complete_callback
             self.video_playing = False
+            if player: player.stop()
             if on_complete_callback:
                 callback = on_complete_callback
                 on_complete_callback = None
                 callback()
-
-            if 'cap' in locals() and cap.isOpened():
-                cap.release()
             video_window.destroy()
 
         video_window.bind("<Escape>", close_video)
 
-        try:
-            cap = cv2.VideoCapture(video_path_full)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            if fps <= 0:
-                fps = 30
-            frame_delay = 1.0 / fps  # Sekunden zwischen Frames
-
-            print(f"Video FPS: {fps}, Frame Delay: {frame_delay:.3f}s")
+        # Vorgerechnete Fassung in Bildschirmgröße nutzen; fehlt sie, diesmal das Original
+        # skalieren und die Fassung für das nächste Mal im Hintergrund erzeugen
+        screen_size = (screen_width, screen_height)
+        if cached := get_cached_cutscene(video_path_full, screen_size):
+            video_path_full = str(cached)
+        else:
+            threading.Thread(target=ensure_cutscene_cached, args=(video_path_full, screen_size), daemon=True).start()
 
-        except Exception as e:
-            print(f"Fehler beim Öffnen des Videos: {e}")
+        # Dekodieren im Hintergrund, Anzeige im Tk-Thread nach der Uhr des Videos
+        player = VideoPlayer(canvas, video_path_full, (screen_width, screen_height), on_finished=close_video)
+        if not player.start():
             close_video()
-            return
-
-        def video_thread():
-            """Separater Thread für präzise Video-Wiedergabe"""
-            import time
-
-            while self.video_playing:
-                start_time = time.time()
-
-                ret, frame = cap.read()
-                if not ret:
-                    # Video zu Ende
-                    video_window.after(0, close_video)
-                    break
-                
-                # Frame verarbeiten
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frame_h, frame_w, _ = frame.shape
-
-                ratio = min(screen_width / frame_w, screen_height / frame_h)
-                new_w, new_h = int(frame_w * ratio), int(frame_h * ratio)
-                resized_frame = cv2.resize(frame, (new_w, new_h))
-
-                from PIL import Image, ImageTk
-                img = Image.fromarray(resized_frame)
-                imgtk = ImageTk.PhotoImage(image=img)
-
-                # Frame im Hauptthread anzeigen
-                def update_canvas():
-                    if video_window.winfo_exists():
-                        canvas.delete("all")
-                        canvas.create_image(screen_width // 2, screen_height // 2, anchor='center', image=imgtk)
-                        canvas.imgtk = imgtk
-
-                try:
-                    video_window.after(0, update_canvas)
-                except:
-                    break
-                
-                # Präzises Timing
-                elapsed = time.time() - start_time
-                sleep_time = frame_delay - elapsed
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-
-        # Video-Thread starten
-        threading.Thread(target=video_thread, daemon=True).start()
 
 
     def close(self):
-        self.monitoring = False
+        self.screens.cancel_warm_up()
+        self.file_watcher.stop()
+        for topic, callback in self._subscriptions.items():
+            event_bus.unsubscribe(topic, callback)
         try: keyboard.unhook_all()
         except: pass
@@ -0,0 +1,114 @@
+# src/ui/map_tiles.py
+import hashlib
+import math
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from src.config import NAVI_TILE_SIZE, NAVI_TILE_CACHE_SIZE, NAVI_TILE_CACHE_DIR, NAVI_ZOOM_STEPS
+from src.utils.road_network import RoadNetworkLOD
+
+_EMPTY = object() # Kachel ohne Straßen -> nichts zu blitten
+
+
+class RoadTileRenderer:
+    """
+    Rastert das statische Straßennetz in Kacheln pro Zoomstufe. Eine Kachel wird beim ersten
+    Sichtbarwerden einmal gezeichnet und danach nur noch geblittet, ein Frame kostet also
+    nur noch die sichtbaren Kacheln und hängt nicht mehr von der Gesamtlänge der Straßen ab.
+
+    Die Zoomstufen sind diskret (NAVI_ZOOM_STEPS pro Verdopplung), die Kamera muss mit
+    `snap_zoom` darauf einrasten, damit die Kacheln pixelgenau passen. Herausgezoomte Stufen
+    zeichnen die passende vereinfachte Detailstufe des Netzes statt aller aufgezeichneten Punkte.
+    """
+    def __init__(self, road_network, color_road, line_width=2, cache_key="", tile_size=NAVI_TILE_SIZE,
+                 max_tiles=NAVI_TILE_CACHE_SIZE, disk_dir: Path = NAVI_TILE_CACHE_DIR):
+        self.tile_size = tile_size
+        self.color_road = color_road
+        self.line_width = line_width
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        # road_network ist ein RoadNetwork (src/utils/road_network.py); jede Detailstufe wird in
+        # kurze Stücke mit eigener Bounding-Box geteilt, eine Kachel zeichnet nur die, die sie berühren
+        self.lod = RoadNetworkLOD(road_network)
+        self.disk_dir = None
+        if disk_dir and cache_key:
+            # Eigener Ordner je Stand des Straßennetzes und Darstellung, alte Kacheln passen sonst nicht
+            lod = f"{self.lod.tolerances}|{self.lod.pixel_tolerance}"
+            digest = hashlib.sha1(f"{cache_key}|{color_road}|{line_width}|{tile_size}|{lod}".encode('utf-8')).hexdigest()[:16]
+            self.disk_dir = disk_dir / digest
+
+    @staticmethod
+    def zoom_level(zoom):
+        """Größte Stufe, deren Zoom nicht über `zoom` liegt (es passt also weiterhin alles ins Bild)."""
+        return math.floor(math.log2(zoom) * NAVI_ZOOM_STEPS + 1e-9)
+
+    @staticmethod
+    def level_zoom(level):
+        return 2 ** (level / NAVI_ZOOM_STEPS)
+
+    def snap_zoom(self, zoom):
+        return self.level_zoom(self.zoom_level(zoom))
+
+    def blit_visible(self, surface, camera_offset, zoom):
+        """Blittet alle Kacheln, die im Bild liegen. `zoom` muss eine eingerastete Stufe sein."""
+        level = self.zoom_level(zoom)
+        size = self.tile_size
+        width, height = surface.get_size()
+        offset_x, offset_y = int(camera_offset.x), int(camera_offset.y)
+        for ty in range(math.floor(-offset_y / size), math.floor((height - offset_y) / size) + 1):
+            for tx in range(math.floor(-offset_x / size), math.floor((width - offset_x) / size) + 1):
+                tile = self._get_tile(level, tx, ty)
+                if tile is not _EMPTY:
+                    surface.blit(tile, (tx * size + offset_x, ty * size + offset_y))
+
+    def _get_tile(self, level, tx, ty):
+        key = (level, tx, ty)
+        if (tile := self._tiles.get(key)) is not None:
+            self._tiles.move_to_end(key)
+            return tile
+        tile = self._load_tile(level, tx, ty)
+        self._tiles[key] = tile
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _tile_path(self, level, tx, ty):
+        return self.disk_dir / str(level) / f"{tx}_{ty}.png"
+
+    def _load_tile(self, level, tx, ty):
+        if self.disk_dir and (path := self._tile_path(level, tx, ty)).exists():
+            try:
+                return pygame.image.load(str(path))
+            except pygame.error:
+                pass # Kaputte Kachel -> neu rastern
+
+        tile = self._render_tile(level, tx, ty)
+        if self.disk_dir and tile is not _EMPTY:
+            try:
+                path = self._tile_path(level, tx, ty)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                pygame.image.save(tile, str(path))
+            except (OSError, pygame.error) as e:
+                print(f"✗ Kartenkachel konnte nicht gespeichert werden: {e}")
+        return tile
+
+    def _render_tile(self, level, tx, ty):
+        zoom = self.level_zoom(level)
+        size = self.tile_size
+        # Weltausschnitt der Kachel, um die Linienbreite erweitert
+        margin = self.line_width / zoom
+        min_x, min_z = tx * size / zoom - margin, ty * size / zoom - margin
+        max_x, max_z = (tx + 1) * size / zoom + margin, (ty + 1) * size / zoom + margin
+
+        tile = None
+        origin_x, origin_y = tx * size, ty * size
+        chunks = self.lod.chunks_for_zoom(zoom)
+        for index in chunks.visible(min_x, min_z, max_x, max_z).tolist():
+            if tile is None:
+                tile = pygame.Surface((size, size), pygame.SRCALPHA)
+            points = ((chunks.chunk(index) * zoom).astype(np.int64) - (origin_x, origin_y)).tolist()
+            pygame.draw.lines(tile, self.color_road, False, points, self.line_width)
+        return tile if tile is not None else _EMPTY
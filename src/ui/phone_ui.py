@@ -2,21 +2,23 @@
 import tkinter as tk
 from datetime import datetime
 import time
-import threading
 import keyboard
-import json
-import os
 import requests
 import difflib
-import re
-from PIL import Image, ImageTk
 
 
 from src.config import (
-    PHONE_WIDTH, PHONE_HEIGHT, PHONE_MESSAGE_FILE, PROFILE_PATH, TELEMETRY_URL
+    PHONE_WIDTH, PHONE_HEIGHT, PHONE_MESSAGE_FILE, PROFILE_PATH, TELEMETRY_URL, SCREEN_WARMUP_DELAY_MS
 )
 from src.actions.communication import send_message
 from src.actions.job_actions import process_job_request_async
+from src.storage.message_store import get_message_store, ConversationPager
+from src.utils.event_bus import event_bus, tk_callback, MESSAGE_ADDED
+from src.utils.file_watcher import FileWatcher
+from src.utils.task_runner import TkTaskRunner
+from src.ui.virtual_list import VirtualList, ConversationRow
+from src.ui.conversation_view import ConversationView
+from src.ui.screen_registry import ScreenRegistry
 from src.game_integration.ets2_savegame_parser import SavegameParser
 from src.utils.location import get_current_coordinates, get_nearest_city_from_db, load_city_database
 from src.utils.translation import get_pretty_city_name
@@ -34,22 +36,29 @@ class PhoneOverlay:
         
         self.messages = []
         self.current_conversation = None
-        self.last_message_check = 0
         self.last_ingame_time_str = "00:00"
         
         self.chat_scroll_position = 0
-        self.image_references = []
+        
+        self.available_cities = []
+        self.police_data = None
         
         self.setup_window()
         self.city_database = load_city_database()
+        self.tasks = TkTaskRunner(self.window)
         self.create_ui()
+        self.message_store = get_message_store()
+        self.conversation_pager = None
         self.load_messages()
-        
-        self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self.monitor_messages, daemon=True)
-        self.monitor_thread.start()
+
+        self._message_subscription = tk_callback(self.window, self._apply_new_message)
+        event_bus.subscribe(MESSAGE_ADDED, self._message_subscription)
+        self.file_watcher = FileWatcher()
+        self.file_watcher.watch(PHONE_MESSAGE_FILE, lambda path: self.window.after(0, self.reload_messages))
+        self.file_watcher.start()
         
         self.update_loop()
+        self.screens.warm_up(SCREEN_WARMUP_DELAY_MS)
 
     def setup_window(self):
         screen_width = self.window.winfo_screenwidth()
@@ -76,15 +85,15 @@ class PhoneOverlay:
         
         self.create_home_indicator()
         
-        self.screens = {
-            "home": self._create_home_screen(),
-            "messages": self._create_messages_screen(),
-            "message_detail": self._create_message_detail_screen(),
-            "city_selection": self._create_city_selection_screen(),
-            "browser_home": self._create_browser_home_screen(),
-            "police_login": self._create_police_login_screen(),
-            "police_database": self._create_police_database_screen(),
-        }
+        self.screens = ScreenRegistry(self.window, {
+            "home": self._create_home_screen,
+            "messages": self._create_messages_screen,
+            "message_detail": self._create_message_detail_screen,
+            "city_selection": self._create_city_selection_screen,
+            "browser_home": self._create_browser_home_screen,
+            "police_login": self._create_police_login_screen,
+            "police_database": self._create_police_database_screen,
+        })
         self.show_screen("home")
 
     def create_notch(self):
@@ -154,6 +163,7 @@ class PhoneOverlay:
         title_label.place(relx=0.5, rely=0.5, anchor='center')
         self.messages_list_frame = tk.Frame(screen, bg='#000000')
         self.messages_list_frame.pack(fill='both', expand=True)
+        self.message_list = VirtualList(self.messages_list_frame, row_height=82, row_factory=ConversationRow)
         return screen
 
     def _create_message_detail_screen(self):
@@ -169,6 +179,7 @@ class PhoneOverlay:
         self.messages_container.pack(fill='both', expand=True, padx=8)
         self.messages_frame = tk.Frame(self.messages_container, bg='#000000')
         self.messages_container.create_window((0, 0), window=self.messages_frame, anchor='nw')
+        self.conversation_view = ConversationView(self.messages_container, self.messages_frame, max_width=int(PHONE_WIDTH * 0.7))
         return screen
 
     def _create_city_selection_screen(self):
@@ -188,6 +199,7 @@ class PhoneOverlay:
         self.city_list_canvas.create_window((0, 0), window=self.city_list_frame, anchor='nw', width=PHONE_WIDTH - 40)
         
         self.city_list_items = []
+        self.city_list_status = None
         return screen
 
     def _create_browser_home_screen(self):
@@ -247,21 +259,26 @@ class PhoneOverlay:
         return screen
 
     def show_screen(self, screen_name):
-        for screen in self.screens.values():
-            screen.pack_forget()
+        self.tasks.cancel_all() # Abfragen des verlassenen Screens werden nicht mehr angezeigt
+        screen = self.screens.get(screen_name)
+        for other in self.screens.built():
+            if other is not screen: other.pack_forget()
         
-        self.screens[screen_name].pack(fill='both', expand=True)
+        screen.pack(fill='both', expand=True)
         self.current_screen = screen_name
         self.selected_index = 0
+        if screen_name not in ("message_detail", "city_selection"):
+            self.conversation_pager = None # Nachgeladene Historie wieder freigeben
         
         if screen_name == "messages": self.update_messages_list()
         elif screen_name == "message_detail":
             self.chat_scroll_position = 1.0
             self.show_conversation()
+            self.conversation_view.scroll_to_end()
         elif screen_name == "city_selection": self.update_city_list()
         elif screen_name == "police_login": 
             self.animate_loading_dots()
-            self.window.after(2500, self.load_and_show_police_data)
+            self.load_police_data()
         
         self.update_selection_highlight()
 
@@ -291,12 +308,8 @@ class PhoneOverlay:
                         if isinstance(child, tk.Frame) and child.cget('bg') != '#0a0a0a':
                             child.config(highlightthickness=0)
                             
-        elif self.current_screen == "messages" and hasattr(self, 'message_items'):
-            for i, item in enumerate(self.message_items):
-                bg_color = '#1c1c1e' if i == self.selected_index else '#000000'
-                item["frame"].config(bg=bg_color, highlightbackground='#007aff', highlightthickness=(1 if i == self.selected_index else 0))
-                for child in item["frame"].winfo_children():
-                    if child.cget('bg') not in ['#3a3a3c', '#007aff']: child.config(bg=bg_color)
+        elif self.current_screen == "messages":
+            self.message_list.select(self.selected_index)
                         
         elif self.current_screen == "city_selection":
             for i, item_frame in enumerate(self.city_list_items):
@@ -345,6 +358,9 @@ class PhoneOverlay:
 
     def _navigate(self, direction, horizontal=False):
         if self.current_screen == "message_detail":
+            if direction < 0 and self.messages_container.yview()[0] <= 0.0 and self.conversation_pager and self.conversation_pager.has_older():
+                self.load_older_messages()
+                return
             self.messages_container.yview_scroll(direction, "units")
             return
 
@@ -356,7 +372,7 @@ class PhoneOverlay:
                 new_index = self.selected_index + direction * 2
                 if 0 <= new_index < len(self.apps): self.selected_index = new_index
         else:
-            items_len = len(getattr(self, 'message_items', [])) if self.current_screen == 'messages' else \
+            items_len = len(self.messages) if self.current_screen == 'messages' else \
                         len(self.city_list_items) if self.current_screen == 'city_selection' else \
                         len(self.bookmark_buttons) if self.current_screen == 'browser_home' else \
                         len(self.police_record_items) if self.current_screen == 'police_database' else 0
@@ -390,29 +406,36 @@ class PhoneOverlay:
         else: self.toggle_visibility()
 
     def load_messages(self):
-        try:
-            if PHONE_MESSAGE_FILE.exists():
-                with open(PHONE_MESSAGE_FILE, 'r', encoding='utf-8') as f:
-                    self.messages = json.load(f).get('conversations', [])
-                    self.messages.sort(key=lambda c: c['messages'][-1]['timestamp'], reverse=True)
-        except Exception as e:
-            print(f"Fehler beim Laden der Nachrichten: {e}")
-
-    def monitor_messages(self):
-        while self.monitoring:
-            try:
-                if PHONE_MESSAGE_FILE.exists() and os.path.getmtime(PHONE_MESSAGE_FILE) != self.last_message_check:
-                    self.last_message_check = os.path.getmtime(PHONE_MESSAGE_FILE)
-                    self.load_messages()
-                    if self.visible: self.window.after(0, self.refresh_current_view)
-            except Exception as e: print(f"Message monitoring Fehler: {e}")
-            time.sleep(1)
+        self.messages = self.message_store.get_conversations()
+
+    def reload_messages(self):
+        """Nur für Änderungen von außen (z.B. reset.py), eigene Nachrichten kommen über den Event-Bus."""
+        self.message_store.load()
+        self.load_messages()
+        if self.visible: self.refresh_current_view()
+
+    def _apply_new_message(self, payload):
+        """Läuft im Tk-Thread, sobald send_message eine Nachricht veröffentlicht hat."""
+        conversation = self.message_store.get_conversation(payload["sender"])
+        if not conversation: return
+        # Konversation nach oben schieben statt alles neu zu laden und zu sortieren
+        self.messages = [conversation] + [c for c in self.messages if c is not conversation]
+        if self.visible: self.refresh_current_view()
+
+    def _ensure_conversation_pager(self):
+        sender = self.current_conversation["sender"] if self.current_conversation else None
+        if sender and (self.conversation_pager is None or self.conversation_pager.sender != sender):
+            self.conversation_pager = ConversationPager(self.message_store, sender)
+
+    def load_older_messages(self):
+        """Oben angekommen: nächstes Archiv-Segment davor hängen, Leseposition beibehalten."""
+        if self.conversation_pager.load_older():
+            self.show_conversation()
 
     def refresh_current_view(self):
         if self.current_screen == "messages": self.update_messages_list()
         elif self.current_screen == "message_detail" and self.current_conversation:
-            sender = self.current_conversation['sender']
-            self.current_conversation = next((c for c in self.messages if c['sender'] == sender), None)
+            self.current_conversation = self.message_store.get_conversation(self.current_conversation['sender'])
             self.show_conversation()
 
     def update_ingame_time(self):
@@ -451,90 +474,15 @@ class PhoneOverlay:
         animate()
 
     def update_messages_list(self):
-        for w in self.messages_list_frame.winfo_children(): w.destroy()
-        self.message_items = []
-        for conv in self.messages:
-            item_frame = tk.Frame(self.messages_list_frame, bg='#000000', height=80)
-            item_frame.pack(fill='x', pady=1, padx=15)
-            item_frame.pack_propagate(False)
-            avatar_frame = tk.Frame(item_frame, bg='#3a3a3c', width=55, height=55)
-            avatar_frame.place(x=0, y=12)
-            avatar_frame.pack_propagate(False)
-            avatar_label = tk.Label(avatar_frame, text=conv["sender"][0].upper(), bg='#3a3a3c', fg='#ffffff', font=('SF Pro Display', 22, 'bold'))
-            avatar_label.place(relx=0.5, rely=0.5, anchor='center')
-            name_label = tk.Label(item_frame, text=conv["sender"], bg='#000000', fg='#ffffff', font=('SF Pro Display', 17, 'bold'), anchor='w')
-            name_label.place(x=70, y=15)
-            last_msg_text = conv["messages"][-1]["text"]
-            preview = (last_msg_text[:30] + '...') if len(last_msg_text) > 30 else last_msg_text
-            preview_label = tk.Label(item_frame, text=preview, bg='#000000', fg='#8e8e93', font=('SF Pro Display', 15), anchor='w')
-            preview_label.place(x=70, y=40)
-            time_label = tk.Label(item_frame, text=conv["messages"][-1].get("ingame_time", ""), bg='#000000', fg='#8e8e93', font=('SF Pro Display', 13), anchor='e')
-            time_label.place(x=200, y=15, width=80)
-            if not conv.get("read", True):
-                unread_dot = tk.Frame(item_frame, bg='#007aff', width=8, height=8)
-                unread_dot.place(x=285, y=40)
-            chevron_label = tk.Label(item_frame, text="›", bg='#000000', fg='#3a3a3c', font=('SF Pro Display', 20))
-            chevron_label.place(x=290, y=25)
-            self.message_items.append({"frame": item_frame, "conversation": conv})
+        """Belegt nur die sichtbaren Zeilen neu, egal wie viele Konversationen es gibt."""
+        self.message_list.set_items(self.messages)
         self.update_selection_highlight()
 
     def show_conversation(self):
         if not self.current_conversation: return
         self.contact_name_label.config(text=self.current_conversation["sender"])
-        
-        # Alte Widgets und Bild-Referenzen löschen
-        for w in self.messages_frame.winfo_children(): w.destroy()
-        self.image_references.clear()
-    
-        for i, msg in enumerate(self.current_conversation["messages"]):
-            is_sent = msg.get("sent_by_me", False)
-            msg_container = tk.Frame(self.messages_frame, bg='#000000')
-            msg_container.pack(fill='x', pady=3)
-            max_width = int(PHONE_WIDTH * 0.7)
-    
-            # NEUE LOGIK: Prüfen, ob die Nachricht ein Bild ist
-            image_match = re.match(r"\[Bild gesendet: (.*?)\]", msg["text"])
-    
-            if image_match:
-                image_path = image_match.group(1).strip()
-                try:
-                    # Bild laden und für die Anzeige vorbereiten
-                    img = Image.open(image_path)
-                    img.thumbnail((180, 180)) # Bild auf eine vernünftige Größe verkleinern
-                    photo = ImageTk.PhotoImage(img)
-                    
-                    # Bild in einem Label anzeigen
-                    img_label = tk.Label(msg_container, image=photo, bg='#000000', bd=0)
-                    img_label.image = photo # WICHTIG: Referenz speichern!
-                    self.image_references.append(photo) # Zusätzliche Referenz in der Liste speichern
-    
-                    if is_sent:
-                        img_label.pack(side='right', padx=(50, 15))
-                    else:
-                        img_label.pack(side='left', padx=(15, 50))
-    
-                except FileNotFoundError:
-                    # Fallback, wenn das Bild nicht gefunden wird
-                    error_text = f"Bild nicht gefunden:\n{os.path.basename(image_path)}"
-                    bubble = tk.Label(msg_container, text=error_text, bg="#ff3b30", fg='white', font=('SF Pro Display', 14), wraplength=max_width, justify='left', padx=16, pady=12, bd=0)
-                    if is_sent: bubble.pack(side='right', padx=(50, 15))
-                    else: bubble.pack(side='left', padx=(15, 50))
-            else:
-                # ALTE LOGIK: Wenn es kein Bild ist, zeige eine normale Textblase an
-                bubble_bg = '#007aff' if is_sent else '#3a3a3c'
-                bubble = tk.Label(msg_container, text=msg["text"], bg=bubble_bg, fg='#ffffff', font=('SF Pro Display', 16), wraplength=max_width, justify='left', padx=16, pady=12, bd=0)
-                if is_sent: bubble.pack(side='right', padx=(50, 15))
-                else: bubble.pack(side='left', padx=(15, 50))
-    
-            # Zeitstempel für die letzte Nachricht (unverändert)
-            if i == len(self.current_conversation["messages"]) - 1 and (time_text := msg.get("ingame_time", "")):
-                time_label = tk.Label(msg_container, text=time_text, bg='#000000', fg='#8e8e93', font=('SF Pro Display', 12))
-                if is_sent: time_label.pack(side='right', padx=(0, 20), pady=(2, 0))
-                else: time_label.pack(side='left', padx=(20, 0), pady=(2, 0))
-                
-        self.messages_frame.update_idletasks()
-        self.messages_container.config(scrollregion=self.messages_container.bbox("all"))
-        self.messages_container.yview_moveto(1.0)
+        self._ensure_conversation_pager()
+        self.conversation_view.render(self.current_conversation["sender"], self.conversation_pager.messages())
 
     def _get_pretty_city_name(self, savegame_city_name):
         """Findet den schönen Namen aus der DB für einen Savegame-Namen."""
@@ -545,19 +493,18 @@ class PhoneOverlay:
         return match[0] if match else savegame_city_name.capitalize()
 
     def update_city_list(self):
-        """Zeigt eine saubere, einzigartige Liste von Städten mit verfügbaren Jobs an."""
-        for item in self.city_list_items: item.destroy()
-        self.city_list_items.clear()
-        
+        """Liest die Städte mit Jobs im Hintergrund; bis dahin steht ein Ladehinweis in der Liste."""
+        self.available_cities = []
+        self._show_city_list_status("⏳ Lese Frachtmarkt aus dem Savegame...")
+        self.tasks.submit("city_selection", self._fetch_city_list,
+                          on_done=self._show_city_list,
+                          on_error=lambda e: self._show_city_list_status(f"✗ Fehler: {e}"))
+
+    def _fetch_city_list(self):
+        """Läuft im Task-Runner: Savegame entschlüsseln, Telemetrie abfragen, Liste sortieren."""
         # 1. Hole alle rohen Städtenamen mit verfügbaren Jobs aus dem Savegame
-        try:
-            parser = SavegameParser(profile_path=PROFILE_PATH)
-            cities_with_jobs_raw = parser.get_available_cities() or []
-        except Exception as e:
-            # Zeige einen Fehler an, wenn das Parsen fehlschlägt
-            self.available_cities = [f"Fehler: {e}"]
-            # (Hier könnte man die UI-Erstellung für den Fehlerfall noch verbessern)
-            return
+        parser = SavegameParser(profile_path=PROFILE_PATH)
+        cities_with_jobs_raw = parser.get_available_cities() or []
 
         # 2. Übersetze die rohen Namen in schöne Namen und mache die Liste einzigartig und sortiert
         pretty_cities_with_jobs = sorted(list(set([get_pretty_city_name(raw_name) for raw_name in cities_with_jobs_raw])))
@@ -581,7 +528,26 @@ class PhoneOverlay:
         
         # Füge die restlichen Städte (alphabetisch sortiert) hinzu
         final_city_list.extend(pretty_cities_with_jobs)
-        self.available_cities = final_city_list
+        return final_city_list, nearest_city_name
+
+    def _clear_city_list(self):
+        for item in self.city_list_items: item.destroy()
+        self.city_list_items.clear()
+        if self.city_list_status:
+            self.city_list_status.destroy()
+            self.city_list_status = None
+
+    def _show_city_list_status(self, text):
+        self._clear_city_list()
+        self.city_list_status = tk.Label(self.city_list_frame, text=text, bg='#000000', fg='#8e8e93', font=('SF Pro Display', 14), wraplength=PHONE_WIDTH - 80)
+        self.city_list_status.pack(pady=30)
+
+    def _show_city_list(self, result):
+        self._clear_city_list()
+        self.available_cities, nearest_city_name = result
+        if not self.available_cities:
+            self._show_city_list_status("Keine Aufträge im Frachtmarkt.")
+            return
 
         # 5. Erstelle die UI-Elemente
         for city_name in self.available_cities:
@@ -610,16 +576,22 @@ class PhoneOverlay:
     def open_police_database(self):
         self.show_screen("police_login")
 
-    def load_and_show_police_data(self):
-        try:
-            parser = SavegameParser(profile_path=PROFILE_PATH)
-            self.police_data = parser.get_police_offence_log()
-        except Exception as e:
-            self.police_data = None
+    def load_police_data(self):
+        """Der Login-Screen mit den Ladepunkten bleibt stehen, bis das Strafregister gelesen ist."""
+        self.tasks.submit("police_login", self._fetch_police_data,
+                          on_done=self._show_police_data,
+                          on_error=lambda e: self._show_police_data(None))
+
+    def _fetch_police_data(self):
+        return SavegameParser(profile_path=PROFILE_PATH).get_police_offence_log()
+
+    def _show_police_data(self, police_data):
+        self.police_data = police_data
         self.populate_police_database_screen()
         self.show_screen("police_database")
 
     def populate_police_database_screen(self):
+        self.screens.get("police_database")
         for w in self.police_summary_frame.winfo_children(): w.destroy()
         for item in self.police_record_items: item['frame'].destroy()
         self.police_record_items.clear()
@@ -654,7 +626,10 @@ class PhoneOverlay:
         self.police_records_canvas.config(scrollregion=self.police_records_canvas.bbox("all"))
 
     def close(self):
-        self.monitoring = False
+        self.screens.cancel_warm_up()
+        self.tasks.shutdown()
+        self.file_watcher.stop()
+        event_bus.unsubscribe(MESSAGE_ADDED, self._message_subscription)
         try:
             self.setup_keyboard_hooks(False)
         except:
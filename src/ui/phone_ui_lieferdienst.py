@@ -10,24 +10,44 @@ import os
 import requests
 import difflib
 import re
-from PIL import Image, ImageTk
 import pygame
 import math
+import numpy as np
 
 # Lokale Imports
 from src.config import (
-    PHONE_WIDTH, PHONE_HEIGHT, PHONE_MESSAGE_FILE, DELIVERY_DATA_FILE,
-    PROFILE_PATH, TELEMETRY_URL, DATA_DIR
+    PHONE_WIDTH, PHONE_HEIGHT, PHONE_MESSAGE_FILE,
+    PROFILE_PATH, TELEMETRY_URL, DATA_DIR, SCREEN_WARMUP_DELAY_MS, ROAD_NETWORK_FILE, ROAD_GRAPH_FILE, ROUTE_REQUERY_DISTANCE,
+    NAVI_MAX_FPS, NAVI_IDLE_INTERVAL_MS, NAVI_REDRAW_PIXEL_THRESHOLD, NAVI_REDRAW_HEADING_THRESHOLD
 )
 from src.actions.communication import send_message
 from src.actions.job_actions import process_job_request_async
+from src.storage.message_store import get_message_store, ConversationPager
+from src.utils.event_bus import event_bus, tk_callback, MESSAGE_ADDED
+from src.utils.file_watcher import FileWatcher
+from src.utils.task_runner import TkTaskRunner
+from src.utils.road_network import RoadNetwork, load_road_network
+from src.utils.road_graph import load_road_graph
+from src.utils.road_router import RoadRouter
+from src.ui.virtual_list import VirtualList, ConversationRow
+from src.ui.conversation_view import ConversationView
+from src.ui.screen_registry import ScreenRegistry
+from src.ui.map_tiles import RoadTileRenderer
+from src.ui.frame_presenter import FramePresenter
 from src.game_integration.ets2_savegame_parser import SavegameParser
 from src.utils.location import get_current_coordinates, get_nearest_city_from_db, load_city_database
 from src.utils.translation import get_pretty_city_name
 
 class NaviMap:
     def __init__(self):
-        self.road_network = []
+        self.road_network = RoadNetwork()
+        self.road_network_key = ""
+        self.road_tiles = None
+        self._road_network_mapped = False
+        self.router = None
+        self.route_legs = [] # [(Route, Farbe)] vom Truck über alle Ziele des Auftrags
+        self._route_request = None # (Startposition, Ziele) der letzten Berechnung
+        self._route_version = 0
         self.points_of_interest = []
         self.live_truck_data = {}
         self.camera_offset = pygame.math.Vector2(0, 0)
@@ -35,6 +55,10 @@ class NaviMap:
         self.map_surface = None
         self.font = None
         self.is_initialized = False
+        self.dirty_rects = None # Geänderte Bereiche des letzten Frames, None = alles
+        self._last_view = None
+        self._last_truck_rect = None
+        self._last_truck_state = None
 
         # Farben
         self.COLOR_BACKGROUND = (28, 28, 30) # #1c1c1e
@@ -43,25 +67,41 @@ class NaviMap:
         self.COLOR_POI = (255, 190, 0)
         self.COLOR_PICKUP = (52, 199, 89) # Grün
         self.COLOR_DELIVERY = (255, 69, 58) # Rot
+        self.ROUTE_WIDTH = 4
 
     def init_pygame(self, width, height):
         if self.is_initialized: return
         pygame.init()
         self.map_surface = pygame.Surface((width, height))
         self.font = pygame.font.SysFont("Arial", 14, bold=True)
-        self.load_road_network()
+        # Fehlt der Graph noch, baut build_router ihn im Hintergrund und schreibt dabei road_network.bin
+        # neu; bis dahin wird die Datei nur gelesen statt gemappt, damit sie ersetzt werden kann
+        self.load_road_network(mmap=ROAD_GRAPH_FILE.exists())
+        self.camera_zoom = self.road_tiles.snap_zoom(self.camera_zoom)
         self.load_pois()
         self.is_initialized = True
         print("✅ NaviMap initialisiert.")
 
-    def load_road_network(self):
-        road_file = DATA_DIR.parent / "cache" / "road_network.json"
-        if road_file.exists():
-            try:
-                with open(road_file, 'r') as f:
-                    self.road_network = json.load(f)
-            except json.JSONDecodeError:
-                self.road_network = []
+    def load_road_network(self, mmap=True):
+        # Per mmap, es wird nichts geparst; ein altes road_network.json wird dabei einmalig konvertiert
+        self.road_network = load_road_network(mmap=mmap)
+        self._road_network_mapped = mmap
+        if len(self.road_network) and ROAD_NETWORK_FILE.exists():
+            stat = ROAD_NETWORK_FILE.stat()
+            self.road_network_key = f"{stat.st_mtime_ns}_{stat.st_size}"
+        self.road_tiles = RoadTileRenderer(self.road_network, self.COLOR_ROAD, cache_key=self.road_network_key)
+
+    def build_router(self):
+        """Lädt den Straßengraphen, beim ersten Start wird er aus allen Aufzeichnungen gebaut. Blockiert, im Hintergrund aufrufen."""
+        return RoadRouter(load_road_graph())
+
+    def set_router(self, router):
+        """Im Tk-Thread: schaltet die Routenführung frei und mappt das (evtl. neu geschriebene) Straßennetz."""
+        self.router = router
+        self._route_request = None
+        if not self._road_network_mapped:
+            self.load_road_network()
+            self.invalidate()
 
     def load_pois(self):
         poi_file = DATA_DIR / "locations.json"
@@ -95,11 +135,44 @@ class NaviMap:
         zoom_x = (map_width * 0.8) / dist_x if dist_x > 0 else 1
         zoom_y = (map_height * 0.8) / dist_z if dist_z > 0 else 1
 
-        self.camera_zoom = min(zoom_x, zoom_y, 0.2)
+        self.camera_zoom = self.road_tiles.snap_zoom(min(zoom_x, zoom_y, 0.2))
 
         self.camera_offset.x = map_width / 2 - (center_x * self.camera_zoom)
         self.camera_offset.y = map_height / 2 - (center_z * self.camera_zoom)
 
+    def update_route(self, targets):
+        """
+        Berechnet die Route vom Truck über alle `targets` ([(coords, Farbe)], in Fahrreihenfolge).
+        Neu gesucht wird nur bei anderen Zielen oder wenn der Truck ROUTE_REQUERY_DISTANCE
+        weitergefahren ist. Gibt True zurück, wenn sich die Route geändert hat.
+        """
+        if not targets:
+            # Auftrag erledigt oder abgebrochen: die alte Route verschwindet von der Karte
+            if not self._route_request: return False
+            self._route_request = None
+            self.route_legs = []
+            self._route_version += 1
+            return True
+        if not self.router or not self.live_truck_data: return False
+        position = (self.live_truck_data['x'], self.live_truck_data['z'])
+        goals = tuple(((c['x'], c['z']), color) for c, color in targets)
+        if self._route_request:
+            last_position, last_goals = self._route_request
+            if goals == last_goals and math.dist(position, last_position) < ROUTE_REQUERY_DISTANCE:
+                return False
+        self._route_request = (position, goals)
+
+        legs = []
+        start = position
+        for goal, color in goals:
+            route = self.router.route(start, goal)
+            if route is None: break # Ab hier kennt das Netz keinen Weg, die weiteren Etappen fehlen auch
+            legs.append((route, color))
+            start = goal
+        self.route_legs = legs
+        self._route_version += 1
+        return True
+
     def update_truck_position(self, truck_data):
         if truck_data and 'placement' in truck_data:
             self.live_truck_data = {
@@ -108,14 +181,46 @@ class NaviMap:
                 'heading': truck_data['placement']['heading'],
             }
 
+    def _view_state(self, pickup_coords, delivery_coords):
+        return (tuple(self.camera_offset), self.camera_zoom, self._route_version,
+                pickup_coords and tuple(pickup_coords.values()), delivery_coords and tuple(delivery_coords.values()))
+
+    def _truck_state(self):
+        if not self.live_truck_data: return None
+        return self.world_to_screen(self.live_truck_data['x'], self.live_truck_data['z']), self.live_truck_data['heading']
+
+    def invalidate(self):
+        """Erzwingt beim nächsten Frame ein komplettes Neuzeichnen."""
+        self._last_view = None
+
+    def needs_redraw(self, pickup_coords=None, delivery_coords=None):
+        """Ändert sich am Bild etwas? Ansicht, Marker, oder der Truck um mehr als die Schwellwerte."""
+        if not self.is_initialized: return False
+        if self._view_state(pickup_coords, delivery_coords) != self._last_view: return True
+        truck, last = self._truck_state(), self._last_truck_state
+        if truck is None or last is None: return truck is not last
+        (x, y), heading = truck
+        (last_x, last_y), last_heading = last
+        return (abs(x - last_x) >= NAVI_REDRAW_PIXEL_THRESHOLD or abs(y - last_y) >= NAVI_REDRAW_PIXEL_THRESHOLD
+                or abs(heading - last_heading) >= NAVI_REDRAW_HEADING_THRESHOLD)
+
     def draw(self, pickup_coords=None, delivery_coords=None):
         if not self.is_initialized: return None
+
+        view = self._view_state(pickup_coords, delivery_coords)
+        full_redraw = view != self._last_view
+        self._last_view = view
+        self._last_truck_state = self._truck_state()
+        truck_rect = None
         
         self.map_surface.fill(self.COLOR_BACKGROUND)
+        # Straßen kommen fertig gerastert aus dem Kachel-Cache, gezeichnet werden nur Marker und Truck
+        self.road_tiles.blit_visible(self.map_surface, self.camera_offset, self.camera_zoom)
 
-        for segment in self.road_network:
-            if len(segment) > 1:
-                pygame.draw.lines(self.map_surface, self.COLOR_ROAD, False, [self.world_to_screen(p[0], p[1]) for p in segment], 2)
+        offset = (self.camera_offset.x, self.camera_offset.y)
+        for route, color in self.route_legs:
+            points = (route.points * self.camera_zoom + offset).astype(np.int64).tolist()
+            pygame.draw.lines(self.map_surface, color, False, points, self.ROUTE_WIDTH)
 
         if pickup_coords:
             pos = self.world_to_screen(pickup_coords['x'], pickup_coords['z'])
@@ -137,17 +242,23 @@ class NaviMap:
                 p1 = (truck_pos[0] + 12 * math.cos(heading_rad), truck_pos[1] + 12 * math.sin(heading_rad))
                 p2 = (truck_pos[0] + 7 * math.cos(heading_rad + 2.5), truck_pos[1] + 7 * math.sin(heading_rad + 2.5))
                 p3 = (truck_pos[0] + 7 * math.cos(heading_rad - 2.5), truck_pos[1] + 7 * math.sin(heading_rad - 2.5))
-                pygame.draw.polygon(self.map_surface, self.COLOR_TRUCK, [p1, p2, p3])
-                pygame.draw.circle(self.map_surface, self.COLOR_TRUCK, truck_pos, 4)
+                truck_rect = pygame.draw.polygon(self.map_surface, self.COLOR_TRUCK, [p1, p2, p3])
+                truck_rect = truck_rect.union(pygame.draw.circle(self.map_surface, self.COLOR_TRUCK, truck_pos, 4))
             else:
                 # Wenn nicht sichtbar: Klemme die Position an den Rand und zeichne einen Punkt
                 clamped_x = max(5, min(truck_pos[0], map_width - 5))
                 clamped_y = max(5, min(truck_pos[1], map_height - 5))
                 
                 # Zeichne einen äußeren Kreis als Umrandung und einen inneren als Punkt
-                pygame.draw.circle(self.map_surface, (255, 255, 255), (clamped_x, clamped_y), 8, 2) # Weiße Umrandung
+                truck_rect = pygame.draw.circle(self.map_surface, (255, 255, 255), (clamped_x, clamped_y), 8, 2) # Weiße Umrandung
                 pygame.draw.circle(self.map_surface, self.COLOR_TRUCK, (clamped_x, clamped_y), 6) # Blauer Punkt
 
+        # Bei gleicher Ansicht ändert sich nur der Bereich um den Truck (alte und neue Position)
+        if full_redraw:
+            self.dirty_rects = None
+        else:
+            self.dirty_rects = [r for r in (self._last_truck_rect, truck_rect) if r is not None]
+        self._last_truck_rect = truck_rect
         return self.map_surface
     
 class PhoneOverlayLieferdienst:
@@ -164,24 +275,36 @@ class PhoneOverlayLieferdienst:
         
         self.messages = []
         self.current_conversation = None
-        self.last_message_check = 0
         self.last_ingame_time_str = "00:00"
         
-        self.image_references = []
-        self.delivery_data = {"stats": {}, "history": []}
+        self.delivery_stats = None # Wird vom DeliveryManager gesetzt
         self.available_orders = []
         self.is_map_drawing = False
+        self._map_redraw_pending = None
+        self._map_idle_job = None
+        self._last_map_draw = 0.0
+        self.route_label = None
+        self._route_update_pending = False
+        
+        self.available_cities = []
+        self.police_data = None
         
         self.setup_window()
         self.city_database = load_city_database()
+        self.tasks = TkTaskRunner(self.window)
         self.create_ui()
+        self.message_store = get_message_store()
+        self.conversation_pager = None
         self.load_messages()
-        
-        self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self.monitor_messages, daemon=True)
-        self.monitor_thread.start()
+
+        self._message_subscription = tk_callback(self.window, self._apply_new_message)
+        event_bus.subscribe(MESSAGE_ADDED, self._message_subscription)
+        self.file_watcher = FileWatcher()
+        self.file_watcher.watch(PHONE_MESSAGE_FILE, lambda path: self.window.after(0, self.reload_messages))
+        self.file_watcher.start()
         
         self.update_loop()
+        self.screens.warm_up(SCREEN_WARMUP_DELAY_MS)
 
     def rgb_to_hex(self, rgb):
         return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
@@ -211,17 +334,17 @@ class PhoneOverlayLieferdienst:
         
         self.navi_map = NaviMap()
 
-        self.screens = {
-            "home": self._create_home_screen(),
-            "messages": self._create_messages_screen(),
-            "message_detail": self._create_message_detail_screen(),
-            "city_selection": self._create_city_selection_screen(),
-            "browser_home": self._create_browser_home_screen(),
-            "police_login": self._create_police_login_screen(),
-            "police_database": self._create_police_database_screen(),
-            "delivery_dashboard": self._create_delivery_dashboard_screen(),
-            "delivery_order_detail": self._create_delivery_order_detail_screen(),
-        }
+        self.screens = ScreenRegistry(self.window, {
+            "home": self._create_home_screen,
+            "messages": self._create_messages_screen,
+            "message_detail": self._create_message_detail_screen,
+            "city_selection": self._create_city_selection_screen,
+            "browser_home": self._create_browser_home_screen,
+            "police_login": self._create_police_login_screen,
+            "police_database": self._create_police_database_screen,
+            "delivery_dashboard": self._create_delivery_dashboard_screen,
+            "delivery_order_detail": self._create_delivery_order_detail_screen,
+        })
         self.show_screen("home")
 
     def create_notch(self):
@@ -288,6 +411,7 @@ class PhoneOverlayLieferdienst:
         title_label.place(relx=0.5, rely=0.5, anchor='center')
         self.messages_list_frame = tk.Frame(screen, bg='#000000')
         self.messages_list_frame.pack(fill='both', expand=True)
+        self.message_list = VirtualList(self.messages_list_frame, row_height=82, row_factory=ConversationRow)
         return screen
 
     def _create_message_detail_screen(self):
@@ -303,6 +427,7 @@ class PhoneOverlayLieferdienst:
         self.messages_container.pack(fill='both', expand=True, padx=8)
         self.messages_frame = tk.Frame(self.messages_container, bg='#000000')
         self.messages_container.create_window((0, 0), window=self.messages_frame, anchor='nw')
+        self.conversation_view = ConversationView(self.messages_container, self.messages_frame, max_width=int(PHONE_WIDTH * 0.7))
         return screen
 
     def _create_city_selection_screen(self):
@@ -319,6 +444,7 @@ class PhoneOverlayLieferdienst:
         self.city_list_frame = tk.Frame(self.city_list_canvas, bg='#000000')
         self.city_list_canvas.create_window((0, 0), window=self.city_list_frame, anchor='nw', width=PHONE_WIDTH - 40)
         self.city_list_items = []
+        self.city_list_status = None
         return screen
 
     def _create_browser_home_screen(self):
@@ -385,6 +511,7 @@ class PhoneOverlayLieferdienst:
         stats_frame = tk.Frame(screen, bg='#2c2c2e'); stats_frame.pack(fill='x', padx=15, pady=10)
         self.earnings_label = tk.Label(stats_frame, text="Gesamtverdienst: 0.00€", bg='#2c2c2e', fg='white', font=('SF Pro Display', 14)); self.earnings_label.pack(anchor='w', padx=10, pady=5)
         self.deliveries_label = tk.Label(stats_frame, text="Erledigte Aufträge: 0", bg='#2c2c2e', fg='white', font=('SF Pro Display', 14)); self.deliveries_label.pack(anchor='w', padx=10, pady=5)
+        self.stats_detail_label = tk.Label(stats_frame, text="", bg='#2c2c2e', fg='#a0a0a0', font=('SF Pro Display', 11), justify='left'); self.stats_detail_label.pack(anchor='w', padx=10, pady=(0, 5))
 
         tk.Label(screen, text="Verfügbare Aufträge", bg='#1c1c1e', fg='#a0a0a0', font=('SF Pro Display', 16, 'bold')).pack(anchor='w', padx=15, pady=(10,5))
         self.order_list_frame = tk.Frame(screen, bg='#1c1c1e')
@@ -403,8 +530,9 @@ class PhoneOverlayLieferdienst:
         self.map_frame.pack(pady=10)
         self.map_label = tk.Label(self.map_frame, bg='black')
         self.map_label.pack()
+        self.map_presenter = FramePresenter(self.map_label)
 
-        self.window.after(100, lambda: self.navi_map.init_pygame(map_frame_width, map_frame_height))
+        self.window.after(100, self._init_navi_map, map_frame_width, map_frame_height)
         os.environ['SDL_WINDOWID'] = str(self.map_frame.winfo_id())
         os.environ['SDL_VIDEODRIVER'] = 'windib'
 
@@ -412,20 +540,45 @@ class PhoneOverlayLieferdienst:
         self.info_frame.pack(fill='both', expand=True, padx=15, pady=10)
         return screen
 
-    def load_delivery_data(self):
-        if DELIVERY_DATA_FILE.exists():
-            try:
-                with open(DELIVERY_DATA_FILE, 'r', encoding='utf-8') as f:
-                    self.delivery_data = json.load(f)
-            except json.JSONDecodeError:
-                pass
-        self.update_dashboard_stats()
+    def _init_navi_map(self, width, height):
+        if self.navi_map.is_initialized: return
+        self.navi_map.init_pygame(width, height)
+        threading.Thread(target=self._build_router, daemon=True).start()
+        # Beim ersten Öffnen wurde die Detailansicht schon vor der Karte gefüllt, die Kamera
+        # konnte da noch nicht auf den Auftrag ausgerichtet werden
+        self.update_order_detail_view()
+
+    def _build_router(self):
+        try:
+            router = self.navi_map.build_router()
+        except Exception as e:
+            print(f"✗ Routenführung nicht verfügbar: {e}")
+            return
+        self.window.after(0, self._on_router_ready, router)
+
+    def _on_router_ready(self, router):
+        self.navi_map.set_router(router)
+        if self._update_route():
+            self._refresh_route_label()
+        self.request_map_redraw()
 
     def update_dashboard_stats(self):
-        stats = self.delivery_data.get("stats", {})
-        if hasattr(self, 'earnings_label'):
-            self.earnings_label.config(text=f"Gesamtverdienst: {stats.get('total_earnings', 0.0):.2f}€")
-            self.deliveries_label.config(text=f"Erledigte Aufträge: {stats.get('completed_deliveries', 0)}")
+        """Liest nur die laufend gepflegten Kennzahlen, keine Datei und keine Historie."""
+        stats = self.delivery_stats
+        if not stats or not self.screens.is_built("delivery_dashboard"): return
+        self.earnings_label.config(text=f"Gesamtverdienst: {stats.total_earnings:.2f}€")
+        self.deliveries_label.config(text=f"Erledigte Aufträge: {stats.completed_deliveries}")
+        if not stats.completed_deliveries:
+            self.stats_detail_label.config(text="")
+            return
+        lines = [f"Ø letzte Touren: {stats.rolling_average:.2f}€ • Trinkgeld: {stats.total_tips:.2f}€"]
+        if stats.best_hour is not None:
+            lines.append(f"Beste Stunde: {stats.best_hour:02d}–{(stats.best_hour + 1) % 24:02d} Uhr • {stats.last_day}: {stats.deliveries_last_day} Touren")
+        if stats.top_customer:
+            lines.append(f"Top-Kunde: {stats.top_customer}")
+        if stats.top_restaurant:
+            lines.append(f"Top-Restaurant: {stats.top_restaurant}")
+        self.stats_detail_label.config(text="\n".join(lines))
 
     def update_available_orders_list(self, orders):
         self.available_orders = orders
@@ -453,22 +606,28 @@ class PhoneOverlayLieferdienst:
         self.update_selection_highlight()
 
     def show_screen(self, screen_name):
-        for screen in self.screens.values():
-            screen.pack_forget()
+        self.tasks.cancel_all() # Abfragen des verlassenen Screens werden nicht mehr angezeigt
+        screen = self.screens.get(screen_name)
+        for other in self.screens.built():
+            if other is not screen: other.pack_forget()
         
-        self.screens[screen_name].pack(fill='both', expand=True)
+        screen.pack(fill='both', expand=True)
         self.current_screen = screen_name
         self.selected_index = 0
+        if screen_name not in ("message_detail", "city_selection"):
+            self.conversation_pager = None # Nachgeladene Historie wieder freigeben
         
         if screen_name == "messages": self.update_messages_list()
-        elif screen_name == "message_detail": self.show_conversation()
+        elif screen_name == "message_detail":
+            self.show_conversation()
+            self.conversation_view.scroll_to_end()
         elif screen_name == "city_selection": self.update_city_list()
         elif screen_name == "police_login": 
             self.animate_loading_dots()
-            self.window.after(2500, self.load_and_show_police_data)
+            self.load_police_data()
         elif screen_name == "delivery_dashboard":
             self.stop_map_drawing()
-            self.load_delivery_data()
+            self.update_dashboard_stats()
             self.update_available_orders_list(self.manager.available_orders)
         elif screen_name == "delivery_order_detail":
             self.update_order_detail_view()
@@ -479,41 +638,111 @@ class PhoneOverlayLieferdienst:
         self.update_selection_highlight()
 
     def start_map_drawing(self):
+        self.stop_map_drawing()
         self.is_map_drawing = True
-        self.draw_map_loop()
+        self.navi_map.invalidate()
+        self._map_idle_tick()
 
     def stop_map_drawing(self):
         self.is_map_drawing = False
+        for job in (self._map_redraw_pending, self._map_idle_job):
+            if job: self.window.after_cancel(job)
+        self._map_redraw_pending = self._map_idle_job = None
+
+    def request_map_redraw(self):
+        """Plant einen Frame, frühestens 1/NAVI_MAX_FPS nach dem letzten; mehrfache Anfragen werden zusammengefasst."""
+        if not self.is_map_drawing or self._map_redraw_pending: return
+        delay_ms = max(0, int((self._last_map_draw + 1 / NAVI_MAX_FPS - time.monotonic()) * 1000))
+        self._map_redraw_pending = self.window.after(delay_ms, self._draw_map_frame)
+
+    def _map_idle_tick(self):
+        """Leerlauf: nur ein billiger Vergleich der Eingaben pro NAVI_IDLE_INTERVAL_MS."""
+        if not self.is_map_drawing: return
+        self.request_map_redraw()
+        self._map_idle_job = self.window.after(NAVI_IDLE_INTERVAL_MS, self._map_idle_tick)
+
+    def _order_marker_coords(self):
+        order = self.manager.current_order
+        if not order: return None, None
+        pickup_loc = self.manager.all_locations.get(order['restaurant_name'])
+        delivery_loc = self.manager.all_locations.get(order['customer_name'])
+        if not (pickup_loc and delivery_loc): return None, None
+        pickup_coords = {'x': sum(c['x'] for c in pickup_loc['corners'])/len(pickup_loc['corners']), 'z': sum(c['z'] for c in pickup_loc['corners'])/len(pickup_loc['corners'])}
+        delivery_coords = {'x': sum(c['x'] for c in delivery_loc['corners'])/len(delivery_loc['corners']), 'z': sum(c['z'] for c in delivery_loc['corners'])/len(delivery_loc['corners'])}
+        return pickup_coords, delivery_coords
+
+    def _route_targets(self):
+        """Ziele der Routenführung je nach Auftragsstatus: [(Beschriftung, coords, Farbe)]."""
+        pickup_coords, delivery_coords = self._order_marker_coords()
+        if not (pickup_coords and delivery_coords): return []
+        state = self.manager.game_state
+        if state == "WAITING_FOR_PICKUP":
+            return [("Zum Restaurant", pickup_coords, self.navi_map.COLOR_PICKUP),
+                    ("Zum Kunden", delivery_coords, self.navi_map.COLOR_DELIVERY)]
+        if state == "WAITING_FOR_DELIVERY":
+            return [("Zum Kunden", delivery_coords, self.navi_map.COLOR_DELIVERY)]
+        return []
+
+    def _update_route(self):
+        """Gibt True zurück, wenn die Route neu berechnet wurde."""
+        targets = self._route_targets()
+        return self.navi_map.update_route([(coords, color) for _, coords, color in targets])
+
+    def _update_route_on_tk(self):
+        self._route_update_pending = False
+        if self._update_route():
+            self._refresh_route_label()
+
+    def _route_summary(self):
+        targets = self._route_targets()
+        if not targets: return ""
+        if not self.navi_map.router: return "Route: Straßengraph wird geladen..."
+        if not self.navi_map.live_truck_data: return "Route: warte auf die Position des Trucks..."
+        legs = self.navi_map.route_legs
+        lines = []
+        for i, (label, _, _) in enumerate(targets):
+            if i < len(legs):
+                route = legs[i][0]
+                lines.append(f"{label}: {route.length_km:.1f} km • ca. {max(1, round(route.eta_minutes))} min")
+            else:
+                lines.append(f"{label}: Strecke noch nicht aufgezeichnet")
+        return "\n".join(lines)
+
+    def _refresh_route_label(self):
+        if self.route_label and self.route_label.winfo_exists():
+            self.route_label.config(text=self._route_summary())
 
-    def draw_map_loop(self):
+    def _draw_map_frame(self):
+        self._map_redraw_pending = None
         if not self.is_map_drawing or not self.visible or not self.navi_map.is_initialized:
             return
 
-        order = self.manager.current_order
-        pickup_coords, delivery_coords = None, None
-        if order:
-            pickup_loc = self.manager.all_locations.get(order['restaurant_name'])
-            delivery_loc = self.manager.all_locations.get(order['customer_name'])
-            if pickup_loc and delivery_loc:
-                pickup_coords = {'x': sum(c['x'] for c in pickup_loc['corners'])/len(pickup_loc['corners']), 'z': sum(c['z'] for c in pickup_loc['corners'])/len(pickup_loc['corners'])}
-                delivery_coords = {'x': sum(c['x'] for c in delivery_loc['corners'])/len(delivery_loc['corners']), 'z': sum(c['z'] for c in delivery_loc['corners'])/len(delivery_loc['corners'])}
+        pickup_coords, delivery_coords = self._order_marker_coords()
+        if not self.navi_map.needs_redraw(pickup_coords, delivery_coords):
+            return
 
+        self._last_map_draw = time.monotonic()
         pygame_surface = self.navi_map.draw(pickup_coords, delivery_coords)
         if pygame_surface:
-            img_data = pygame.image.tostring(pygame_surface, 'RGB')
-            img = Image.frombytes('RGB', pygame_surface.get_size(), img_data)
-            photo = ImageTk.PhotoImage(image=img)
-            self.map_label.config(image=photo)
-            self.map_label.image = photo
-
-        self.window.after(50, self.draw_map_loop)
+            self.map_presenter.present(pygame_surface, self.navi_map.dirty_rects)
 
     def update_navi_map_truck(self, telemetry_data):
+        """Läuft im Telemetrie-Thread; das Zeichnen selbst wird in den Tk-Thread eingeplant."""
         if self.navi_map.is_initialized and telemetry_data and telemetry_data.get("truck"):
             self.navi_map.update_truck_position(telemetry_data["truck"])
+            # A* und Routenzustand nur im Tk-Thread; ausstehende Anfragen werden zusammengefasst
+            # (auch ohne Auftrag, solange noch eine alte Route zu entfernen ist)
+            active = self.manager.current_order and self.manager.game_state != "IDLE"
+            if not self._route_update_pending and (active or self.navi_map.route_legs):
+                self._route_update_pending = True
+                self.window.after(0, self._update_route_on_tk)
+            if self.is_map_drawing:
+                self.window.after(0, self.request_map_redraw)
 
     def update_order_detail_view(self):
+        if not self.screens.is_built("delivery_order_detail"): return # Wird beim ersten Öffnen gefüllt
         for w in self.info_frame.winfo_children(): w.destroy()
+        self._update_route() # Ziele haben sich mit dem Status geändert, ohne Auftrag fällt die Route weg
         order = self.manager.current_order
         if not order: return
 
@@ -530,13 +759,13 @@ class PhoneOverlayLieferdienst:
         tk.Label(self.info_frame, text=title, font=('SF Pro Display', 16, 'bold'), fg=color, bg='#2c2c2e').pack(pady=5)
         item_list_str = "\n".join([f"• {qty}x {name}" for name, qty in order['items'].items()])
         tk.Label(self.info_frame, text=item_list_str, justify='left', fg='white', bg='#2c2c2e').pack(pady=5)
+        self.route_label = tk.Label(self.info_frame, text=self._route_summary(), justify='left', fg='#8e8e93', bg='#2c2c2e')
+        self.route_label.pack(pady=5)
 
-        pickup_loc = self.manager.all_locations.get(order['restaurant_name'])
-        delivery_loc = self.manager.all_locations.get(order['customer_name'])
-        if pickup_loc and delivery_loc:
-            pickup_coords = {'x': sum(c['x'] for c in pickup_loc['corners'])/len(pickup_loc['corners']), 'z': sum(c['z'] for c in pickup_loc['corners'])/len(pickup_loc['corners'])}
-            delivery_coords = {'x': sum(c['x'] for c in delivery_loc['corners'])/len(delivery_loc['corners']), 'z': sum(c['z'] for c in delivery_loc['corners'])/len(delivery_loc['corners'])}
+        pickup_coords, delivery_coords = self._order_marker_coords()
+        if pickup_coords and delivery_coords:
             self.navi_map.set_view_to_order(pickup_coords, delivery_coords)
+            self.request_map_redraw()
 
     def setup_keyboard_hooks(self, enable):
         hooks = {'up': self.on_key_up, 'down': self.on_key_down, 'left': self.on_key_left,
@@ -554,6 +783,9 @@ class PhoneOverlayLieferdienst:
 
     def _navigate(self, direction, horizontal=False):
         if self.current_screen == "message_detail":
+            if direction < 0 and self.messages_container.yview()[0] <= 0.0 and self.conversation_pager and self.conversation_pager.has_older():
+                self.load_older_messages()
+                return
             self.messages_container.yview_scroll(direction, "units")
             return
 
@@ -566,7 +798,7 @@ class PhoneOverlayLieferdienst:
                 if 0 <= new_index < len(self.apps): self.selected_index = new_index
         else:
             items_len = 0
-            if self.current_screen == 'messages': items_len = len(getattr(self, 'message_items', []))
+            if self.current_screen == 'messages': items_len = len(self.messages)
             elif self.current_screen == 'city_selection': items_len = len(self.city_list_items)
             elif self.current_screen == 'browser_home': items_len = len(self.bookmark_buttons)
             elif self.current_screen == 'police_database': items_len = len(self.police_record_items)
@@ -630,12 +862,8 @@ class PhoneOverlayLieferdienst:
                 for child in btn["frame"].winfo_children():
                     if isinstance(child, tk.Frame):
                         child.config(highlightbackground='#007aff' if is_selected else '#1a1a2e', highlightthickness=2 if is_selected else 0)
-        elif self.current_screen == "messages" and hasattr(self, 'message_items'):
-            for i, item in enumerate(self.message_items):
-                bg_color = '#1c1c1e' if i == self.selected_index else '#000000'
-                item["frame"].config(bg=bg_color, highlightbackground='#007aff', highlightthickness=(1 if i == self.selected_index else 0))
-                for child in item["frame"].winfo_children():
-                    if child.cget('bg') not in ['#3a3a3c', '#007aff']: child.config(bg=bg_color)
+        elif self.current_screen == "messages":
+            self.message_list.select(self.selected_index)
         elif self.current_screen == "delivery_dashboard":
             for i, item_frame in enumerate(self.order_list_items):
                 is_selected = (i == self.selected_index)
@@ -645,30 +873,36 @@ class PhoneOverlayLieferdienst:
                     child.config(bg=bg_color)
 
     def load_messages(self):
-        try:
-            if PHONE_MESSAGE_FILE.exists():
-                with open(PHONE_MESSAGE_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.messages = data.get('conversations', [])
-                    self.messages.sort(key=lambda c: c['messages'][-1]['timestamp'], reverse=True)
-        except Exception as e:
-            print(f"Fehler beim Laden der Nachrichten: {e}")
+        self.messages = self.message_store.get_conversations()
 
-    def monitor_messages(self):
-        while self.monitoring:
-            try:
-                if PHONE_MESSAGE_FILE.exists() and os.path.getmtime(PHONE_MESSAGE_FILE) != self.last_message_check:
-                    self.last_message_check = os.path.getmtime(PHONE_MESSAGE_FILE)
-                    self.load_messages()
-                    if self.visible: self.window.after(0, self.refresh_current_view)
-            except Exception as e: print(f"Message monitoring Fehler: {e}")
-            time.sleep(1)
+    def reload_messages(self):
+        """Nur für Änderungen von außen (z.B. reset.py), eigene Nachrichten kommen über den Event-Bus."""
+        self.message_store.load()
+        self.load_messages()
+        if self.visible: self.refresh_current_view()
+
+    def _apply_new_message(self, payload):
+        """Läuft im Tk-Thread, sobald send_message eine Nachricht veröffentlicht hat."""
+        conversation = self.message_store.get_conversation(payload["sender"])
+        if not conversation: return
+        # Konversation nach oben schieben statt alles neu zu laden und zu sortieren
+        self.messages = [conversation] + [c for c in self.messages if c is not conversation]
+        if self.visible: self.refresh_current_view()
+
+    def _ensure_conversation_pager(self):
+        sender = self.current_conversation["sender"] if self.current_conversation else None
+        if sender and (self.conversation_pager is None or self.conversation_pager.sender != sender):
+            self.conversation_pager = ConversationPager(self.message_store, sender)
+
+    def load_older_messages(self):
+        """Oben angekommen: nächstes Archiv-Segment davor hängen, Leseposition beibehalten."""
+        if self.conversation_pager.load_older():
+            self.show_conversation()
 
     def refresh_current_view(self):
         if self.current_screen == "messages": self.update_messages_list()
         elif self.current_screen == "message_detail" and self.current_conversation:
-            sender = self.current_conversation['sender']
-            self.current_conversation = next((c for c in self.messages if c['sender'] == sender), None)
+            self.current_conversation = self.message_store.get_conversation(self.current_conversation['sender'])
             self.show_conversation()
 
     def update_ingame_time(self):
@@ -711,7 +945,10 @@ class PhoneOverlayLieferdienst:
         animate()
 
     def close(self):
-        self.monitoring = False
+        self.screens.cancel_warm_up()
+        self.tasks.shutdown()
+        self.file_watcher.stop()
+        event_bus.unsubscribe(MESSAGE_ADDED, self._message_subscription)
         self.stop_map_drawing()
         if self.navi_map.is_initialized:
             pygame.quit()
@@ -721,82 +958,28 @@ class PhoneOverlayLieferdienst:
             pass
             
     def update_messages_list(self):
-        for w in self.messages_list_frame.winfo_children(): w.destroy()
-        self.message_items = []
-        for conv in self.messages:
-            item_frame = tk.Frame(self.messages_list_frame, bg='#000000', height=80)
-            item_frame.pack(fill='x', pady=1, padx=15)
-            item_frame.pack_propagate(False)
-            avatar_frame = tk.Frame(item_frame, bg='#3a3a3c', width=55, height=55)
-            avatar_frame.place(x=0, y=12)
-            avatar_frame.pack_propagate(False)
-            avatar_label = tk.Label(avatar_frame, text=conv["sender"][0].upper(), bg='#3a3a3c', fg='#ffffff', font=('SF Pro Display', 22, 'bold'))
-            avatar_label.place(relx=0.5, rely=0.5, anchor='center')
-            name_label = tk.Label(item_frame, text=conv["sender"], bg='#000000', fg='#ffffff', font=('SF Pro Display', 17, 'bold'), anchor='w')
-            name_label.place(x=70, y=15)
-            last_msg_text = conv["messages"][-1]["text"]
-            preview = (last_msg_text[:30] + '...') if len(last_msg_text) > 30 else last_msg_text
-            preview_label = tk.Label(item_frame, text=preview, bg='#000000', fg='#8e8e93', font=('SF Pro Display', 15), anchor='w')
-            preview_label.place(x=70, y=40)
-            time_label = tk.Label(item_frame, text=conv["messages"][-1].get("ingame_time", ""), bg='#000000', fg='#8e8e93', font=('SF Pro Display', 13), anchor='e')
-            time_label.place(x=200, y=15, width=80)
-            if not conv.get("read", True):
-                unread_dot = tk.Frame(item_frame, bg='#007aff', width=8, height=8)
-                unread_dot.place(x=285, y=40)
-            chevron_label = tk.Label(item_frame, text="›", bg='#000000', fg='#3a3a3c', font=('SF Pro Display', 20))
-            chevron_label.place(x=290, y=25)
-            self.message_items.append({"frame": item_frame, "conversation": conv})
+        """Belegt nur die sichtbaren Zeilen neu, egal wie viele Konversationen es gibt."""
+        self.message_list.set_items(self.messages)
         self.update_selection_highlight()
 
     def show_conversation(self):
         if not self.current_conversation: return
         self.contact_name_label.config(text=self.current_conversation["sender"])
-        for w in self.messages_frame.winfo_children(): w.destroy()
-        self.image_references.clear()
-        for i, msg in enumerate(self.current_conversation["messages"]):
-            is_sent = msg.get("sent_by_me", False)
-            msg_container = tk.Frame(self.messages_frame, bg='#000000')
-            msg_container.pack(fill='x', pady=3)
-            max_width = int(PHONE_WIDTH * 0.7)
-            image_match = re.match(r"\[Bild gesendet: (.*?)\]", msg["text"])
-            if image_match:
-                image_path = image_match.group(1).strip()
-                try:
-                    img = Image.open(image_path)
-                    img.thumbnail((180, 180))
-                    photo = ImageTk.PhotoImage(img)
-                    img_label = tk.Label(msg_container, image=photo, bg='#000000', bd=0)
-                    img_label.image = photo
-                    self.image_references.append(photo)
-                    if is_sent: img_label.pack(side='right', padx=(50, 15))
-                    else: img_label.pack(side='left', padx=(15, 50))
-                except FileNotFoundError:
-                    error_text = f"Bild nicht gefunden:\n{os.path.basename(image_path)}"
-                    bubble = tk.Label(msg_container, text=error_text, bg="#ff3b30", fg='white', font=('SF Pro Display', 14), wraplength=max_width, justify='left', padx=16, pady=12, bd=0)
-                    if is_sent: bubble.pack(side='right', padx=(50, 15))
-                    else: bubble.pack(side='left', padx=(15, 50))
-            else:
-                bubble_bg = '#007aff' if is_sent else '#3a3a3c'
-                bubble = tk.Label(msg_container, text=msg["text"], bg=bubble_bg, fg='#ffffff', font=('SF Pro Display', 16), wraplength=max_width, justify='left', padx=16, pady=12, bd=0)
-                if is_sent: bubble.pack(side='right', padx=(50, 15))
-                else: bubble.pack(side='left', padx=(15, 50))
-            if i == len(self.current_conversation["messages"]) - 1 and (time_text := msg.get("ingame_time", "")):
-                time_label = tk.Label(msg_container, text=time_text, bg='#000000', fg='#8e8e93', font=('SF Pro Display', 12))
-                if is_sent: time_label.pack(side='right', padx=(0, 20), pady=(2, 0))
-                else: time_label.pack(side='left', padx=(20, 0), pady=(2, 0))
-        self.messages_frame.update_idletasks()
-        self.messages_container.config(scrollregion=self.messages_container.bbox("all"))
-        self.messages_container.yview_moveto(1.0)
+        self._ensure_conversation_pager()
+        self.conversation_view.render(self.current_conversation["sender"], self.conversation_pager.messages())
 
     def update_city_list(self):
-        for item in self.city_list_items: item.destroy()
-        self.city_list_items.clear()
-        try:
-            parser = SavegameParser(profile_path=PROFILE_PATH)
-            cities_with_jobs_raw = parser.get_available_cities() or []
-        except Exception as e:
-            self.available_cities = [f"Fehler: {e}"]
-            return
+        """Liest die Städte mit Jobs im Hintergrund; bis dahin steht ein Ladehinweis in der Liste."""
+        self.available_cities = []
+        self._show_city_list_status("⏳ Lese Frachtmarkt aus dem Savegame...")
+        self.tasks.submit("city_selection", self._fetch_city_list,
+                          on_done=self._show_city_list,
+                          on_error=lambda e: self._show_city_list_status(f"✗ Fehler: {e}"))
+
+    def _fetch_city_list(self):
+        """Läuft im Task-Runner: Savegame entschlüsseln, Telemetrie abfragen, Liste sortieren."""
+        parser = SavegameParser(profile_path=PROFILE_PATH)
+        cities_with_jobs_raw = parser.get_available_cities() or []
         pretty_cities_with_jobs = sorted(list(set([get_pretty_city_name(raw_name) for raw_name in cities_with_jobs_raw])))
         player_coords = get_current_coordinates()
         nearest_city_name = get_nearest_city_from_db(player_coords, self.city_database)
@@ -807,7 +990,26 @@ class PhoneOverlayLieferdienst:
                 final_city_list.append(matching_city_in_list)
                 pretty_cities_with_jobs.remove(matching_city_in_list)
         final_city_list.extend(pretty_cities_with_jobs)
-        self.available_cities = final_city_list
+        return final_city_list, nearest_city_name
+
+    def _clear_city_list(self):
+        for item in self.city_list_items: item.destroy()
+        self.city_list_items.clear()
+        if self.city_list_status:
+            self.city_list_status.destroy()
+            self.city_list_status = None
+
+    def _show_city_list_status(self, text):
+        self._clear_city_list()
+        self.city_list_status = tk.Label(self.city_list_frame, text=text, bg='#000000', fg='#8e8e93', font=('SF Pro Display', 14), wraplength=PHONE_WIDTH - 80)
+        self.city_list_status.pack(pady=30)
+
+    def _show_city_list(self, result):
+        self._clear_city_list()
+        self.available_cities, nearest_city_name = result
+        if not self.available_cities:
+            self._show_city_list_status("Keine Aufträge im Frachtmarkt.")
+            return
         for city_name in self.available_cities:
             city_frame = tk.Frame(self.city_list_frame, bg='#000000', height=50)
             city_frame.pack(fill='x', pady=1)
@@ -841,16 +1043,22 @@ class PhoneOverlayLieferdienst:
                 self.window.after(300, update_dots)
         update_dots()
 
-    def load_and_show_police_data(self):
-        try:
-            parser = SavegameParser(profile_path=PROFILE_PATH)
-            self.police_data = parser.get_police_offence_log()
-        except Exception as e:
-            self.police_data = None
+    def load_police_data(self):
+        """Der Login-Screen mit den Ladepunkten bleibt stehen, bis das Strafregister gelesen ist."""
+        self.tasks.submit("police_login", self._fetch_police_data,
+                          on_done=self._show_police_data,
+                          on_error=lambda e: self._show_police_data(None))
+
+    def _fetch_police_data(self):
+        return SavegameParser(profile_path=PROFILE_PATH).get_police_offence_log()
+
+    def _show_police_data(self, police_data):
+        self.police_data = police_data
         self.populate_police_database_screen()
         self.show_screen("police_database")
 
     def populate_police_database_screen(self):
+        self.screens.get("police_database")
         for w in self.police_summary_frame.winfo_children(): w.destroy()
         for item in self.police_record_items: item['frame'].destroy()
         self.police_record_items.clear()
@@ -0,0 +1,54 @@
+# src/ui/screen_registry.py
+from typing import Callable, Dict, Iterator, Optional
+
+import tkinter as tk
+
+
+class ScreenRegistry:
+    """
+    Screens eines Overlays als Fabriken: gebaut wird erst beim ersten Zugriff (`get`).
+    `warm_up` baut die restlichen Screens nach dem Start einzeln in Tk-Leerlauf-Callbacks,
+    damit das Overlay sofort bereit ist und trotzdem kein Screen beim ersten Öffnen ruckelt.
+    """
+    def __init__(self, window: tk.Misc, factories: Dict[str, Callable[[], tk.Widget]]):
+        self.window = window
+        self.factories = factories
+        self._screens: Dict[str, tk.Widget] = {}
+        self._warm_up_job = None
+        self._warm_up_failed = set()
+
+    def get(self, name: str) -> tk.Widget:
+        screen = self._screens.get(name)
+        if screen is None:
+            screen = self.factories[name]()
+            self._screens[name] = screen
+        return screen
+
+    def is_built(self, name: str) -> bool:
+        return name in self._screens
+
+    def built(self) -> Iterator[tk.Widget]:
+        return iter(list(self._screens.values()))
+
+    def warm_up(self, delay_ms: Optional[int]):
+        """Plant den Vorab-Bau der übrigen Screens; `None` oder 0 schaltet ihn ab."""
+        if delay_ms:
+            self._warm_up_job = self.window.after(delay_ms, self._warm_up_next)
+
+    def _warm_up_next(self):
+        self._warm_up_job = None
+        pending = [name for name in self.factories if name not in self._screens and name not in self._warm_up_failed]
+        if not pending: return
+        try:
+            self.get(pending[0])
+        except Exception as e:
+            # Kein Abbruch des Overlays: der Screen wird beim ersten Öffnen erneut versucht
+            print(f"✗ Screen '{pending[0]}' konnte nicht vorab gebaut werden: {e}")
+            self._warm_up_failed.add(pending[0])
+        if len(pending) > 1:
+            self._warm_up_job = self.window.after_idle(self._warm_up_next)
+
+    def cancel_warm_up(self):
+        if self._warm_up_job:
+            self.window.after_cancel(self._warm_up_job)
+            self._warm_up_job = None
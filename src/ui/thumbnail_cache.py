@@ -0,0 +1,81 @@
+# src/ui/thumbnail_cache.py
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from PIL import Image, ImageTk
+
+from src.config import THUMBNAIL_SIZE, THUMBNAIL_CACHE_SIZE, THUMBNAIL_CACHE_DIR
+
+
+class ThumbnailCache:
+    """
+    LRU-Cache für Chat-Vorschaubilder. Schlüssel ist (Pfad, mtime, Dateigröße, Zielgröße),
+    ein geändertes Bild bekommt also automatisch ein neues Thumbnail. Im Speicher liegen
+    fertige PhotoImages, optional zusätzlich kleine PNGs im Cache-Ordner, damit auch nach
+    einem Neustart kein großes JPEG mehr dekodiert werden muss.
+
+    PhotoImages gehören zum Tk-Interpreter, der Cache darf nur im Tk-Thread benutzt werden.
+    """
+    def __init__(self, max_entries: int = THUMBNAIL_CACHE_SIZE, disk_dir: Path = THUMBNAIL_CACHE_DIR, size=THUMBNAIL_SIZE):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.size = tuple(size)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_path) -> ImageTk.PhotoImage:
+        """Gibt das Thumbnail zurück. Wirft FileNotFoundError, wenn das Bild fehlt."""
+        stat = os.stat(image_path)
+        key = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, self.size)
+        if (photo := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return photo
+
+        self.misses += 1
+        photo = ImageTk.PhotoImage(self._load_thumbnail(image_path, key))
+        self._entries[key] = photo
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return photo
+
+    def _load_thumbnail(self, image_path, key) -> Image.Image:
+        disk_file = None
+        if self.disk_dir:
+            digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+            disk_file = self.disk_dir / f"{digest}.png"
+            if disk_file.exists():
+                try:
+                    with Image.open(disk_file) as cached:
+                        cached.load()
+                        return cached
+                except OSError:
+                    pass # Kaputte Cache-Datei -> neu erzeugen
+
+        with Image.open(image_path) as img:
+            img.draft('RGB', self.size) # JPEG direkt verkleinert dekodieren
+            img.thumbnail(self.size)
+            thumb = img.convert('RGBA') if img.mode in ('P', 'LA') else img.copy()
+
+        if disk_file:
+            try:
+                self.disk_dir.mkdir(parents=True, exist_ok=True)
+                tmp_file = disk_file.with_suffix(".tmp")
+                thumb.save(tmp_file, format='PNG')
+                tmp_file.replace(disk_file)
+            except OSError as e:
+                print(f"✗ Thumbnail konnte nicht gespeichert werden: {e}")
+        return thumb
+
+
+_cache = None
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Prozessweiter Cache, damit beide Handy-Overlays dieselben Thumbnails nutzen."""
+    global _cache
+    if _cache is None:
+        _cache = ThumbnailCache()
+    return _cache
@@ -0,0 +1,166 @@
+# src/ui/video_player.py
+import queue
+import threading
+import time
+import tkinter as tk
+from pathlib import Path
+
+import cv2
+
+from src.config import VIDEO_FRAME_QUEUE_SIZE
+from src.ui.cutscene_cache import CUTSCENE_SUFFIX, fit_size, load_cutscene
+from src.ui.frame_presenter import put_rgb
+
+_END = object() # Markiert das Ende des Videos in der Queue
+
+
+class VideoPlayer:
+    """
+    Spielt ein Video auf einem Canvas ab.
+
+    Ein Decoder-Thread liest und skaliert die Frames, tauscht BGR nach RGB und legt die fertigen
+    Pixeldaten in eine kleine, begrenzte Queue; ist sie voll, wartet der Decoder. Im Tk-Thread zeigt ein Presenter die
+    Frames nach der Uhr an (Frame n zum Zeitpunkt n / fps). Ist die UI zu langsam, werden
+    verspätete Frames übersprungen statt einen Rückstau aufzubauen. Angezeigt wird immer in
+    dasselbe PhotoImage.
+
+    Vorgerechnete Zwischensequenzen (siehe cutscene_cache) liegen schon als RGB in
+    Bildschirmgröße vor und werden nur noch per mmap gelesen.
+    """
+    def __init__(self, canvas: tk.Canvas, video_path: str, target_size, on_finished=None):
+        self.canvas = canvas
+        self.video_path = video_path
+        self.target_size = target_size
+        self.on_finished = on_finished
+        self.frames = queue.Queue(maxsize=VIDEO_FRAME_QUEUE_SIZE)
+        self.fps = 30.0
+        self.playing = False
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self._cap = None
+        self._cached_frames = None
+        self._photo = None
+        self._next = None # Nächster Frame, der noch nicht fällig ist
+        self._clock_start = None
+        self._tick_job = None
+
+    def start(self) -> bool:
+        if Path(self.video_path).suffix == CUTSCENE_SUFFIX:
+            try:
+                self.fps, self._cached_frames = load_cutscene(self.video_path)
+            except (OSError, ValueError) as e:
+                print(f"Fehler beim Öffnen des Videos: {e}")
+                return False
+            reader = self._read_cached_loop
+        else:
+            self._cap = cv2.VideoCapture(self.video_path)
+            if not self._cap.isOpened():
+                print(f"Fehler beim Öffnen des Videos: {self.video_path}")
+                return False
+            fps = self._cap.get(cv2.CAP_PROP_FPS)
+            self.fps = fps if fps > 0 else 30.0
+            reader = self._decode_loop
+        print(f"Video FPS: {self.fps}, Frame Delay: {1 / self.fps:.3f}s")
+        self.playing = True
+        threading.Thread(target=reader, daemon=True).start()
+        self._tick()
+        return True
+
+    def stop(self):
+        self.playing = False
+        if self._tick_job:
+            self.canvas.after_cancel(self._tick_job)
+            self._tick_job = None
+        # Decoder aus einem eventuellen put() befreien
+        try:
+            while True: self.frames.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _decode_loop(self):
+        screen_w, screen_h = self.target_size
+        index = 0
+        try:
+            while self.playing:
+                ret, frame = self._cap.read()
+                if not ret: break
+                frame_h, frame_w = frame.shape[:2]
+                new_size = fit_size(frame_w, frame_h, screen_w, screen_h)
+                if new_size != (frame_w, frame_h):
+                    frame = cv2.resize(frame, new_size)
+                self._put((index / self.fps, new_size, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB).tobytes()))
+                index += 1
+        finally:
+            self._cap.release()
+            self._put(_END)
+
+    def _read_cached_loop(self):
+        frames = self._cached_frames
+        size = (frames.shape[2], frames.shape[1])
+        try:
+            for index in range(len(frames)):
+                if not self.playing: break
+                self._put((index / self.fps, size, frames[index].tobytes()))
+        finally:
+            self._cached_frames = None # mmap freigeben, sonst bleibt die Datei unter Windows gesperrt
+            del frames
+            self._put(_END)
+
+    def _put(self, item):
+        while self.playing:
+            try:
+                self.frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _tick(self):
+        """Presenter im Tk-Thread: zeigt den jüngsten fälligen Frame, verwirft ältere."""
+        self._tick_job = None
+        if not self.playing: return
+
+        due = None
+        while True:
+            if self._next is None:
+                try:
+                    self._next = self.frames.get_nowait()
+                except queue.Empty:
+                    break
+            if self._next is _END:
+                if due is None:
+                    self._finish()
+                    return
+                break
+            if self._clock_start is None:
+                self._clock_start = time.monotonic() - self._next[0] # Uhr startet mit dem ersten Frame
+            if self._next[0] > time.monotonic() - self._clock_start:
+                break
+            if due is not None:
+                self.frames_dropped += 1
+            due, self._next = self._next, None
+
+        if due is not None:
+            self._show(*due[1:])
+
+        if self._next is not None and self._next is not _END:
+            delay = self._next[0] - (time.monotonic() - self._clock_start)
+        else:
+            delay = 1 / self.fps # Decoder ist noch nicht so weit
+        self._tick_job = self.canvas.after(max(1, int(delay * 1000)), self._tick)
+
+    def _show(self, size, pixels):
+        width, height = size
+        if self._photo is None or (self._photo.width(), self._photo.height()) != (width, height):
+            self._photo = tk.PhotoImage(master=self.canvas, width=width, height=height)
+            self.canvas.delete("all")
+            screen_w, screen_h = self.target_size
+            self.canvas.create_image(screen_w // 2, screen_h // 2, anchor='center', image=self._photo)
+        put_rgb(self._photo, pixels, width, height)
+        self.frames_shown += 1
+
+    def _finish(self):
+        self.playing = False
+        if self.frames_dropped:
+            print(f"Video: {self.frames_shown} Frames angezeigt, {self.frames_dropped} verspätete übersprungen.")
+        if self.on_finished:
+            self.on_finished()
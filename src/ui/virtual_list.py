@@ -0,0 +1,119 @@
+# src/ui/virtual_list.py
+import math
+import tkinter as tk
+
+
+class ConversationRow:
+    """Eine wiederverwendbare Zeile der Nachrichtenliste. Setzt nur Werte, die sich geändert haben."""
+    BG = '#000000'
+    BG_SELECTED = '#1c1c1e'
+
+    def __init__(self, parent):
+        self.frame = tk.Frame(parent, bg=self.BG, height=80, highlightbackground='#007aff', highlightthickness=0)
+        avatar_frame = tk.Frame(self.frame, bg='#3a3a3c', width=55, height=55)
+        avatar_frame.place(x=0, y=12)
+        avatar_frame.pack_propagate(False)
+        self.avatar_label = tk.Label(avatar_frame, text="", bg='#3a3a3c', fg='#ffffff', font=('SF Pro Display', 22, 'bold'))
+        self.avatar_label.place(relx=0.5, rely=0.5, anchor='center')
+        self.name_label = tk.Label(self.frame, text="", bg=self.BG, fg='#ffffff', font=('SF Pro Display', 17, 'bold'), anchor='w')
+        self.name_label.place(x=70, y=15)
+        self.preview_label = tk.Label(self.frame, text="", bg=self.BG, fg='#8e8e93', font=('SF Pro Display', 15), anchor='w')
+        self.preview_label.place(x=70, y=40)
+        self.time_label = tk.Label(self.frame, text="", bg=self.BG, fg='#8e8e93', font=('SF Pro Display', 13), anchor='e')
+        self.time_label.place(x=200, y=15, width=80)
+        self.unread_dot = tk.Frame(self.frame, bg='#007aff', width=8, height=8)
+        self.chevron_label = tk.Label(self.frame, text="›", bg=self.BG, fg='#3a3a3c', font=('SF Pro Display', 20))
+        self.chevron_label.place(x=290, y=25)
+        self._values = {}
+        self._selected = False
+        self._y = None
+
+    def _set(self, key, widget, text):
+        if self._values.get(key) != text:
+            widget.config(text=text)
+            self._values[key] = text
+
+    def show(self, conv, y):
+        last_message = conv["messages"][-1] if conv["messages"] else {"text": ""}
+        last_msg_text = last_message["text"]
+        self._set("avatar", self.avatar_label, conv["sender"][0].upper())
+        self._set("name", self.name_label, conv["sender"])
+        self._set("preview", self.preview_label, (last_msg_text[:30] + '...') if len(last_msg_text) > 30 else last_msg_text)
+        self._set("time", self.time_label, last_message.get("ingame_time", ""))
+        unread = not conv.get("read", True)
+        if self._values.get("unread") != unread:
+            if unread: self.unread_dot.place(x=285, y=40)
+            else: self.unread_dot.place_forget()
+            self._values["unread"] = unread
+        if self._y != y:
+            self.frame.place(x=15, y=y, relwidth=1.0, width=-30, height=80)
+            self._y = y
+
+    def hide(self):
+        if self._y is not None:
+            self.frame.place_forget()
+            self._y = None
+
+    def set_selected(self, selected):
+        if selected == self._selected: return
+        bg_color = self.BG_SELECTED if selected else self.BG
+        self.frame.config(bg=bg_color, highlightthickness=(1 if selected else 0))
+        for label in (self.name_label, self.preview_label, self.time_label, self.chevron_label):
+            label.config(bg=bg_color)
+        self._selected = selected
+
+
+class VirtualList:
+    """
+    Liste mit einem festen Pool von Zeilen-Widgets (so viele wie sichtbar sind). Beim Scrollen
+    und Aktualisieren werden die Zeilen neu belegt statt zerstört und neu erzeugt, die Kosten
+    hängen also nur von der Fensterhöhe ab, nicht von der Anzahl der Einträge.
+
+    `row_factory(parent)` muss Zeilen mit `show(item, y)`, `hide()` und `set_selected(bool)` liefern.
+    """
+    def __init__(self, parent, row_height, row_factory):
+        self.parent = parent
+        self.row_height = row_height
+        self.row_factory = row_factory
+        self.items = []
+        self.rows = []
+        self.top = 0
+        self.selected_index = -1
+        parent.bind('<Configure>', self._on_resize)
+        parent.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1))
+
+    def _visible_count(self):
+        return max(1, math.ceil(self.parent.winfo_height() / self.row_height))
+
+    def _on_resize(self, event=None):
+        while len(self.rows) < self._visible_count():
+            self.rows.append(self.row_factory(self.parent))
+        self.render()
+
+    def set_items(self, items):
+        self.items = items
+        self.top = max(0, min(self.top, len(items) - self._visible_count()))
+        self.render()
+
+    def scroll(self, delta):
+        new_top = max(0, min(self.top + delta, len(self.items) - self._visible_count()))
+        if new_top != self.top:
+            self.top = new_top
+            self.render()
+
+    def select(self, index):
+        """Markiert einen Eintrag und scrollt ihn bei Bedarf ins Bild."""
+        self.selected_index = index
+        visible = self._visible_count()
+        if index < self.top: self.top = index
+        elif index >= self.top + visible: self.top = index - visible + 1
+        self.render()
+
+    def render(self):
+        for slot, row in enumerate(self.rows):
+            index = self.top + slot
+            if index < len(self.items):
+                row.show(self.items[index], slot * self.row_height + 1)
+                row.set_selected(index == self.selected_index)
+            else:
+                row.hide()
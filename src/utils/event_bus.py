@@ -0,0 +1,57 @@
+# src/utils/event_bus.py
+import threading
+import tkinter as tk
+from collections import defaultdict
+from typing import Any, Callable
+
+# --- Themen ---
+MESSAGE_ADDED = "message_added"    # payload: {"sender": str, "message": dict}
+MAIL_ADDED = "mail_added"          # payload: dict (die neue E-Mail)
+CAREER_UPDATED = "career_updated"  # payload: dict (kompletter Karriere-Stand)
+# Geofencing, payload jeweils: {"group": str, "zone": str, "position": (x, z)}
+ZONE_ENTER = "zone_enter"
+ZONE_EXIT = "zone_exit"              # zusätzlich "seconds": Aufenthaltsdauer
+ZONE_DWELL = "zone_dwell"            # zusätzlich "seconds": erreichte Schwelle aus GEOFENCE_DWELL_SECONDS
+ENGINE_OFF_IN_ZONE = "engine_off_in_zone"
+
+
+class EventBus:
+    """
+    Einfacher In-Process Publish/Subscribe-Bus.
+    Abonnenten werden synchron im Thread des Publishers aufgerufen; UI-Abonnenten
+    sollten sich deshalb über `tk_callback` anmelden.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(list)
+
+    def subscribe(self, topic: str, callback: Callable[[Any], None]):
+        with self._lock:
+            self._subscribers[topic].append(callback)
+
+    def unsubscribe(self, topic: str, callback: Callable[[Any], None]):
+        with self._lock:
+            if callback in self._subscribers[topic]:
+                self._subscribers[topic].remove(callback)
+
+    def publish(self, topic: str, payload: Any = None):
+        with self._lock:
+            subscribers = list(self._subscribers[topic])
+        for callback in subscribers:
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"Fehler in Event-Abonnent für '{topic}': {e}")
+
+
+def tk_callback(widget, callback: Callable[[Any], None]) -> Callable[[Any], None]:
+    """Verpackt einen Callback so, dass er per `after(0, ...)` im Tk-Thread ausgeführt wird."""
+    def _marshal(payload):
+        try:
+            widget.after(0, callback, payload)
+        except (RuntimeError, tk.TclError):
+            pass # Fenster bereits zerstört
+    return _marshal
+
+
+event_bus = EventBus()
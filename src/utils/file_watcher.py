@@ -0,0 +1,52 @@
+# src/utils/file_watcher.py
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from src.config import FILE_WATCH_FALLBACK_INTERVAL
+
+# mtimes, die dieser Prozess selbst geschrieben hat -> keine "externe" Änderung
+_own_mtimes: Dict[str, float] = {}
+
+def _get_mtime(path: Path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def note_own_write(path: Path):
+    """Nach jedem eigenen Schreibzugriff aufrufen, damit der Watcher ihn ignoriert."""
+    _own_mtimes[str(path)] = _get_mtime(path)
+
+
+class FileWatcher(threading.Thread):
+    """
+    Fallback für Änderungen von außen (Editor, reset.py, ...). Änderungen aus dem
+    eigenen Prozess laufen über den Event-Bus und werden hier ignoriert.
+    """
+    def __init__(self, interval: float = FILE_WATCH_FALLBACK_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self._watches = {}
+        self._running = True
+
+    def watch(self, path: Path, callback: Callable[[Path], None]):
+        self._watches[str(path)] = {"path": path, "callback": callback, "mtime": _get_mtime(path)}
+
+    def run(self):
+        while self._running:
+            time.sleep(self.interval)
+            for key, watch in list(self._watches.items()):
+                mtime = _get_mtime(watch["path"])
+                if mtime == watch["mtime"]: continue
+                watch["mtime"] = mtime
+                if mtime is not None and mtime == _own_mtimes.get(key): continue
+                try:
+                    watch["callback"](watch["path"])
+                except Exception as e:
+                    print(f"File monitoring Fehler ({watch['path'].name}): {e}")
+
+    def stop(self):
+        self._running = False
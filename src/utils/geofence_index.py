@@ -0,0 +1,67 @@
+# src/utils/geofence_index.py
+import math
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from src.config import GEOFENCE_CELL_SIZE
+from src.utils.geometry import Polygon
+
+
+class GeofenceIndex:
+    """
+    Gleichmäßiges Raster über den Bounding-Boxen von Zonen-Polygonen (x/z-Ebene).
+
+    Wird einmal beim Laden gebaut. Eine Positionsabfrage schaut nur in die eine Zelle des
+    Punkts und prüft dort die vorberechneten Polygone (Box zuerst, dann Ray-Cast) -
+    unabhängig davon, wie viele Orte insgesamt geladen sind.
+    """
+    def __init__(self, cell_size: float = GEOFENCE_CELL_SIZE):
+        self.cell_size = cell_size
+        self._zones: List[Tuple[Hashable, Polygon]] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    @classmethod
+    def from_corners(cls, items: Iterable[Tuple[Hashable, List[dict]]], cell_size: float = GEOFENCE_CELL_SIZE) -> "GeofenceIndex":
+        """Baut den Index aus (Schlüssel, corners)-Paaren im Format der Orts-JSONs."""
+        index = cls(cell_size)
+        for key, corners in items:
+            index.add(key, [(c['x'], c['z']) for c in corners])
+        return index
+
+    def _cell(self, x: float, z: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(z / self.cell_size)
+
+    def add(self, key: Hashable, polygon: List[Tuple[float, float]]):
+        try:
+            polygon = Polygon(polygon)
+        except ValueError as e:
+            print(f"✗ Zone '{key}' wird ignoriert: {e}")
+            return
+        zone_id = len(self._zones)
+        self._zones.append((key, polygon))
+        min_x, min_z, max_x, max_z = polygon.bbox
+        min_cx, min_cz = self._cell(min_x, min_z)
+        max_cx, max_cz = self._cell(max_x, max_z)
+        for cx in range(min_cx, max_cx + 1):
+            for cz in range(min_cz, max_cz + 1):
+                self._cells[(cx, cz)].append(zone_id)
+
+    def __len__(self) -> int:
+        return len(self._zones)
+
+    def query_all(self, x: float, z: float) -> List[Hashable]:
+        """Alle Zonen, die den Punkt enthalten, in Einfügereihenfolge."""
+        hits = []
+        for zone_id in self._cells.get(self._cell(x, z), ()):
+            key, polygon = self._zones[zone_id]
+            if polygon.contains((x, z)):
+                hits.append(key)
+        return hits
+
+    def query(self, x: float, z: float) -> Optional[Hashable]:
+        """Erste Zone (in Einfügereihenfolge), die den Punkt enthält, sonst None."""
+        for zone_id in self._cells.get(self._cell(x, z), ()):
+            key, polygon = self._zones[zone_id]
+            if polygon.contains((x, z)):
+                return key
+        return None
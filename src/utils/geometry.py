@@ -1,4 +1,5 @@
 # src/utils/geometry.py
+import numpy as np
 
 def is_point_in_polygon(point, polygon):
     """
@@ -24,4 +25,146 @@ def is_point_in_polygon(point, polygon):
                         inside = not inside
         p1x, p1z = p2x, p2z
 
-    return inside
\ No newline at end of file
+    return inside
+
+class Polygon:
+    """
+    Vorberechnetes Polygon in der x/z-Ebene für wiederholte Punkt-Tests.
+
+    Kanten und Bounding-Box werden einmal beim Erzeugen berechnet; waagerechte Kanten fallen
+    weg, weil sie den Strahl nie schneiden. `contains` liefert dieselben Ergebnisse wie
+    `is_point_in_polygon`, `contains_points` prüft ganze Punktreihen (z.B. Trajektorien) mit NumPy.
+    """
+    __slots__ = ("points", "bbox", "_edges", "_edge_arrays")
+
+    def __init__(self, points):
+        self.points = [(float(x), float(z)) for x, z in points]
+        if len(self.points) < 3:
+            raise ValueError("Ein Polygon braucht mindestens 3 Ecken.")
+        xs = [p[0] for p in self.points]
+        zs = [p[1] for p in self.points]
+        self.bbox = (min(xs), min(zs), max(xs), max(zs))
+
+        # Gleiche Kantenrichtung und Rechenreihenfolge wie is_point_in_polygon -> identische Rundung
+        edges = []
+        n = len(self.points)
+        for i in range(n):
+            x1, z1 = self.points[i]
+            x2, z2 = self.points[(i + 1) % n]
+            if z1 == z2: continue
+            edges.append((x1, z1, x2 - x1, z2 - z1, min(z1, z2), max(z1, z2), max(x1, x2)))
+        self._edges = tuple(edges)
+        self._edge_arrays = None
+
+    @classmethod
+    def from_corners(cls, corners):
+        """Aus dem `corners`-Format der Orts-JSONs ([{"x": .., "z": ..}, ...])."""
+        return cls((c['x'], c['z']) for c in corners)
+
+    def edge_arrays(self):
+        """Kanten als Spalten (x1, z1, dx, dz, zmin, zmax, xmax), jeweils ein float64-Array."""
+        if self._edge_arrays is None:
+            self._edge_arrays = tuple(np.array(column, dtype=np.float64) for column in zip(*self._edges)) \
+                if self._edges else tuple(np.empty(0) for _ in range(7))
+        return self._edge_arrays
+
+    def contains(self, point):
+        x, z = point
+        min_x, min_z, max_x, max_z = self.bbox
+        if not (min_x <= x <= max_x and min_z <= z <= max_z):
+            return False
+        inside = False
+        for x1, z1, dx, dz, zmin, zmax, xmax in self._edges:
+            if zmin < z <= zmax and x <= xmax and (dx == 0 or x <= (z - z1) * dx / dz + x1):
+                inside = not inside
+        return inside
+
+    def contains_points(self, xs, zs):
+        """Prüft viele Punkte gegen dieses Polygon. Gibt ein bool-Array gleicher Länge zurück."""
+        xs = np.asarray(xs, dtype=np.float64)
+        zs = np.asarray(zs, dtype=np.float64)
+        min_x, min_z, max_x, max_z = self.bbox
+        result = np.zeros(xs.shape, dtype=bool)
+        candidates = np.flatnonzero((xs >= min_x) & (xs <= max_x) & (zs >= min_z) & (zs <= max_z))
+        if not candidates.size:
+            return result
+        x = xs[candidates]
+        z = zs[candidates]
+        inside = np.zeros(candidates.size, dtype=bool)
+        # Schleife über die (wenigen) Kanten, vektorisiert über die (vielen) Punkte
+        for x1, z1, dx, dz, zmin, zmax, xmax in self._edges:
+            crossing = (zmin < z) & (z <= zmax) & (x <= xmax)
+            if dx != 0:
+                crossing &= x <= (z - z1) * dx / dz + x1
+            inside ^= crossing
+        result[candidates] = inside
+        return result
+
+
+class PolygonSet:
+    """
+    Viele Polygone mit gemeinsam gepackten Kanten-Arrays: ein Punkt gegen alle Polygone
+    in einem Schwung NumPy-Arithmetik statt einer Python-Schleife pro Polygon.
+    """
+    def __init__(self, polygons):
+        self.polygons = [p if isinstance(p, Polygon) else Polygon(p) for p in polygons]
+        self.bboxes = np.array([p.bbox for p in self.polygons], dtype=np.float64).reshape(-1, 4)
+        columns = [p.edge_arrays() for p in self.polygons]
+        self._edges = tuple(np.concatenate([c[i] for c in columns]) if columns else np.empty(0) for i in range(7))
+        self._owner = np.repeat(np.arange(len(self.polygons)), [len(c[0]) for c in columns]) \
+            if columns else np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.polygons)
+
+    def contains(self, point):
+        """bool-Array: welches Polygon enthält den Punkt?"""
+        x, z = float(point[0]), float(point[1])
+        x1, z1, dx, dz, zmin, zmax, xmax = self._edges
+        crossing = (zmin < z) & (z <= zmax) & (x <= xmax)
+        crossing &= (dx == 0) | (x <= (z - z1) * dx / dz + x1)
+        counts = np.bincount(self._owner[crossing], minlength=len(self.polygons))
+        return (counts % 2).astype(bool)
+
+    def first_containing(self, point):
+        """Index des ersten Polygons, das den Punkt enthält, sonst None."""
+        hits = np.flatnonzero(self.contains(point))
+        return int(hits[0]) if hits.size else None
+
+
+def simplify_polyline(points, tolerance):
+    """
+    Douglas-Peucker: lässt alle Punkte weg, die höchstens `tolerance` von der vereinfachten
+    Linie abweichen. Start- und Endpunkt bleiben immer erhalten.
+
+    :param points: Folge von (x, z)-Punkten.
+    :param tolerance: Erlaubte Abweichung in Spieleinheiten; 0 gibt die Punkte unverändert zurück.
+    :return: N x 2-Array (float64) der verbleibenden Punkte.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 3 or tolerance <= 0:
+        return points
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2: continue
+        # Abstand zur Strecke (nicht zur Geraden), damit auch geschlossene Runden richtig werden
+        origin = points[start]
+        direction = points[end] - origin
+        inner = points[start + 1:end] - origin
+        length_sq = direction @ direction
+        if length_sq > 0:
+            t = np.clip(inner @ direction / length_sq, 0.0, 1.0)
+            inner = inner - np.outer(t, direction)
+        distances_sq = np.einsum('ij,ij->i', inner, inner)
+        farthest = int(distances_sq.argmax())
+        if distances_sq[farthest] > tolerance_sq:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
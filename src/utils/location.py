@@ -1,10 +1,10 @@
 # src/utils/location.py
 import json
-import math
+import threading
 import requests
 from pathlib import Path
 
-from src.config import TELEMETRY_URL
+from src.config import TELEMETRY_URL, CITY_REQUERY_DISTANCE
 
 CITY_DB_FILE = Path(__file__).resolve().parent.parent.parent / "data" / "city_database.json"
 # TELEMETRY_URL = "http://172.24.176.1:25555/api/ets2/telemetry"
@@ -34,27 +34,87 @@ def get_current_coordinates():
         pass
     return None
 
-def _calculate_distance_2d(pos1, pos2):
-    """Berechnet die 2D-Distanz (X/Z-Ebene)."""
-    dx = pos1["x"] - pos2["x"]
-    dz = pos1["z"] - pos2["z"]
-    return math.sqrt(dx*dx + dz*dz)
+class CityIndex:
+    """
+    2D-KD-Baum (X/Z-Ebene) über der Städte-Datenbank, einmal gebaut.
+    Die Suche nach der nächsten Stadt kostet O(log n) statt eines Durchlaufs über alle Städte.
+    Bei exakt gleichem Abstand gewinnt wie bisher die Stadt, die in der Datenbank zuerst steht.
+    """
+    def __init__(self, city_db):
+        cities = [(order, name, coords["x"], coords["z"]) for order, (name, coords) in enumerate(city_db.items())]
+        self._root = self._build(cities, 0)
+
+    def _build(self, cities, axis):
+        if not cities:
+            return None
+        cities.sort(key=lambda c: c[2 + axis])
+        mid = len(cities) // 2
+        # Knoten: (Stadt, Achse, linker Teilbaum, rechter Teilbaum)
+        return (cities[mid], axis, self._build(cities[:mid], 1 - axis), self._build(cities[mid + 1:], 1 - axis))
+
+    def nearest(self, x, z):
+        """Gibt den Namen der nächstgelegenen Stadt zurück, oder None bei leerer Datenbank."""
+        best = [float('inf'), -1, None] # quadrierter Abstand, Reihenfolge in der DB, Name
+        stack = [(self._root, 0.0)] # (Teilbaum, quadrierter Abstand zu seiner Trennebene)
+        while stack:
+            node, plane_dist_sq = stack.pop()
+            # Teilbäume jenseits einer Trennebene, die weiter weg ist als der beste Treffer, überspringen
+            if node is None or plane_dist_sq > best[0]: continue
+            (order, name, cx, cz), axis, left, right = node
+            dist_sq = (x - cx) ** 2 + (z - cz) ** 2
+            if dist_sq < best[0] or (dist_sq == best[0] and order < best[1]):
+                best[:] = [dist_sq, order, name]
+            delta = (x - cx) if axis == 0 else (z - cz)
+            near, far = (left, right) if delta < 0 else (right, left)
+            stack.append((far, delta * delta))
+            stack.append((near, 0.0))
+        return best[2]
+
+
+class NearestCityTracker:
+    """
+    Merkt sich die zuletzt ermittelte Stadt. Neu gesucht wird erst, wenn der Truck sich
+    mehr als `requery_distance` von der Position der letzten Suche entfernt hat.
+    """
+    def __init__(self, city_db, requery_distance=CITY_REQUERY_DISTANCE):
+        self.index = CityIndex(city_db)
+        self.requery_distance = requery_distance
+        self._lock = threading.Lock()
+        self._last_position = None
+        self._last_city = None
+
+    def nearest(self, player_coords):
+        x, z = player_coords["x"], player_coords["z"]
+        with self._lock:
+            if self._last_position is not None:
+                dx = x - self._last_position[0]
+                dz = z - self._last_position[1]
+                if dx * dx + dz * dz <= self.requery_distance ** 2:
+                    return self._last_city
+            self._last_city = self.index.nearest(x, z)
+            self._last_position = (x, z)
+            return self._last_city
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+def _get_tracker(city_db):
+    """Ein Tracker pro geladener Datenbank; das Objekt wird mitgehalten, damit die id eindeutig bleibt."""
+    with _trackers_lock:
+        entry = _trackers.get(id(city_db))
+        if entry is None or entry[0] is not city_db:
+            entry = (city_db, NearestCityTracker(city_db))
+            _trackers[id(city_db)] = entry
+        return entry[1]
 
 def get_nearest_city_from_db(player_coords, city_db):
     """
     Findet die nächstgelegene Stadt aus der kompletten Koordinaten-Datenbank.
     Gibt den "schönen" Namen (Schlüssel) zurück.
+    Der KD-Baum wird pro Datenbank einmal gebaut, kleine Positionsänderungen liefern das
+    zwischengespeicherte Ergebnis (siehe `NearestCityTracker`).
     """
     if not all([player_coords, city_db]):
         return None
-
-    nearest_city_name = None
-    min_distance = float('inf')
-
-    for city_name, city_coords in city_db.items():
-        distance = _calculate_distance_2d(player_coords, city_coords)
-        if distance < min_distance:
-            min_distance = distance
-            nearest_city_name = city_name
-            
-    return nearest_city_name
\ No newline at end of file
+    return _get_tracker(city_db).nearest(player_coords)
@@ -0,0 +1,264 @@
+# src/utils/road_graph.py
+import math
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.config import (ROAD_GRAPH_FILE, ROAD_GRAPH_SNAP_DISTANCE, ROAD_GRAPH_CELL_SIZE,
+                        ROAD_GRAPH_MIN_EDGE_LENGTH, ROAD_SIMPLIFY_TOLERANCE, ROAD_NETWORK_FILE)
+from src.utils.geometry import simplify_polyline
+from src.utils.road_network import RoadNetwork, load_road_network
+
+
+def _resample(points: np.ndarray, step: float) -> np.ndarray:
+    """Verteilt Punkte gleichmäßig entlang der Linie, höchstens `step` auseinander (Start und Ende bleiben)."""
+    deltas = np.diff(points, axis=0)
+    distance = np.concatenate(([0.0], np.cumsum(np.hypot(deltas[:, 0], deltas[:, 1]))))
+    if distance[-1] == 0:
+        return points[:1]
+    samples = np.linspace(0.0, distance[-1], int(np.ceil(distance[-1] / step)) + 1)
+    return np.column_stack((np.interp(samples, distance, points[:, 0]), np.interp(samples, distance, points[:, 1])))
+
+
+def _polyline_length(points: np.ndarray) -> float:
+    deltas = np.diff(points, axis=0)
+    return float(np.hypot(deltas[:, 0], deltas[:, 1]).sum())
+
+
+class RoadGraph:
+    """
+    Straßennetz als Graph: Knoten sind Kreuzungen und Enden, Kanten die Straßenverläufe dazwischen.
+
+    `add_trace` legt eine gefahrene Strecke auf die bekannten Kanten (Spatial Hash über alle
+    Kantenstücke, Fangradius ROAD_GRAPH_SNAP_DISTANCE). Nur Abschnitte abseits bekannter
+    Straßen werden zu neuen Kanten; wo sie ab- oder einbiegen, wird die bestehende Kante
+    geteilt und ein Kreuzungsknoten eingefügt. Wer dieselbe Straße zweimal fährt, vergrößert
+    den Graphen also nicht.
+    """
+    def __init__(self, snap_distance: float = ROAD_GRAPH_SNAP_DISTANCE, cell_size: float = ROAD_GRAPH_CELL_SIZE,
+                 min_edge_length: float = ROAD_GRAPH_MIN_EDGE_LENGTH):
+        self.snap_distance = snap_distance
+        self.cell_size = cell_size
+        self.min_edge_length = min_edge_length
+        self.nodes: List[Tuple[float, float]] = []
+        # Kante: [Startknoten, Endknoten, Punkte (K x 2, float64) inklusive beider Knotenpositionen]
+        self.edges: List[list] = []
+        self._geometry: Optional[RoadNetwork] = None
+        self._indexed = False
+        self._piece_cells: Dict[Tuple[int, int], List[Tuple[int, int]]] = defaultdict(list)
+        self._edge_cells: Dict[int, Set[Tuple[int, int]]] = {}
+        self._node_cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    # --- Geometrie ---
+    @property
+    def geometry(self) -> RoadNetwork:
+        """Alle Kantenverläufe als RoadNetwork (Segment i = Kante i), z.B. für die Kartendarstellung."""
+        if self._geometry is None:
+            self._geometry = RoadNetwork.from_segments(points for _, _, points in self.edges)
+        return self._geometry
+
+    @property
+    def point_count(self) -> int:
+        return sum(len(points) for _, _, points in self.edges)
+
+    def edge_length(self, edge_id: int) -> float:
+        return _polyline_length(self.edges[edge_id][2])
+
+    # --- Spatial Hash ---
+    def _cell(self, x: float, z: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(z / self.cell_size)
+
+    def _cells_around(self, min_x, min_z, max_x, max_z):
+        min_cx, min_cz = self._cell(min_x, min_z)
+        max_cx, max_cz = self._cell(max_x, max_z)
+        for cx in range(min_cx, max_cx + 1):
+            for cz in range(min_cz, max_cz + 1):
+                yield cx, cz
+
+    def _ensure_index(self):
+        # Geladene Graphen brauchen den Index erst, wenn wirklich etwas hinzukommt
+        if self._indexed: return
+        self._indexed = True
+        for node_id in range(len(self.nodes)):
+            self._index_node(node_id)
+        for edge_id in range(len(self.edges)):
+            self._index_edge(edge_id)
+
+    def _index_node(self, node_id: int):
+        self._node_cells[self._cell(*self.nodes[node_id])].append(node_id)
+
+    def _index_edge(self, edge_id: int):
+        # Jedes Kantenstück landet in allen Zellen seiner um den Fangradius erweiterten Box,
+        # eine Abfrage muss dann nur in die Zelle des Punkts schauen
+        points = self.edges[edge_id][2]
+        radius = self.snap_distance
+        cells = set()
+        for piece in range(len(points) - 1):
+            (x1, z1), (x2, z2) = points[piece], points[piece + 1]
+            for cell in self._cells_around(min(x1, x2) - radius, min(z1, z2) - radius,
+                                           max(x1, x2) + radius, max(z1, z2) + radius):
+                self._piece_cells[cell].append((edge_id, piece))
+                cells.add(cell)
+        self._edge_cells[edge_id] = cells
+
+    def _unindex_edge(self, edge_id: int):
+        for cell in self._edge_cells.pop(edge_id, ()):
+            self._piece_cells[cell] = [entry for entry in self._piece_cells[cell] if entry[0] != edge_id]
+
+    def _nearest_piece(self, x: float, z: float):
+        """Nächstes Kantenstück im Fangradius: (Abstand, Kante, Stück, Projektionspunkt) oder None."""
+        best = None
+        for edge_id, piece in self._piece_cells.get(self._cell(x, z), ()):
+            points = self.edges[edge_id][2]
+            (x1, z1), (x2, z2) = points[piece], points[piece + 1]
+            dx, dz = x2 - x1, z2 - z1
+            length_sq = dx * dx + dz * dz
+            t = 0.0 if length_sq == 0 else min(1.0, max(0.0, ((x - x1) * dx + (z - z1) * dz) / length_sq))
+            px, pz = x1 + t * dx, z1 + t * dz
+            distance = math.hypot(x - px, z - pz)
+            if distance <= self.snap_distance and (best is None or distance < best[0]):
+                best = (distance, edge_id, piece, (px, pz))
+        return best
+
+    def _nearest_node(self, x: float, z: float) -> Optional[int]:
+        best, best_distance = None, self.snap_distance
+        cx, cz = self._cell(x, z)
+        reach = math.ceil(self.snap_distance / self.cell_size)
+        for dx in range(-reach, reach + 1):
+            for dz in range(-reach, reach + 1):
+                for node_id in self._node_cells.get((cx + dx, cz + dz), ()):
+                    nx, nz = self.nodes[node_id]
+                    distance = math.hypot(x - nx, z - nz)
+                    if distance <= best_distance:
+                        best, best_distance = node_id, distance
+        return best
+
+    # --- Aufbau ---
+    def _add_node(self, x: float, z: float) -> int:
+        self.nodes.append((float(x), float(z)))
+        node_id = len(self.nodes) - 1
+        self._index_node(node_id)
+        return node_id
+
+    def _add_edge(self, start: int, end: int, points: np.ndarray) -> int:
+        self.edges.append([start, end, points])
+        edge_id = len(self.edges) - 1
+        self._index_edge(edge_id)
+        self._geometry = None
+        return edge_id
+
+    def _split_edge(self, edge_id: int, piece: int, position: Tuple[float, float]) -> int:
+        """Teilt eine Kante am Projektionspunkt auf Stück `piece` und gibt den neuen Knoten zurück."""
+        start, end, points = self.edges[edge_id]
+        node_id = self._add_node(*position)
+        split = np.array([position])
+        self._unindex_edge(edge_id)
+        self.edges[edge_id] = [start, node_id, np.vstack((points[:piece + 1], split))]
+        self._index_edge(edge_id)
+        self._add_edge(node_id, end, np.vstack((split, points[piece + 1:])))
+        return node_id
+
+    def _node_at(self, x: float, z: float) -> int:
+        """Knoten für eine Position: vorhandener Knoten in der Nähe, sonst Teilung einer Kante, sonst neu."""
+        if (node_id := self._nearest_node(x, z)) is not None:
+            return node_id
+        if (hit := self._nearest_piece(x, z)) is not None:
+            _, edge_id, piece, position = hit
+            return self._split_edge(edge_id, piece, position)
+        return self._add_node(x, z)
+
+    def add_trace(self, points: Sequence[Sequence[float]]) -> int:
+        """
+        Legt eine gefahrene Strecke auf den Graphen und fügt nur die unbekannten Abschnitte
+        als neue Kanten hinzu. Gibt die Anzahl neuer Kanten zurück.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 2:
+            return 0
+        self._ensure_index()
+        # Rohe Aufzeichnungen haben einen Punkt pro Frame, abgeglichen wird nur ein Punkt pro halbem Fangradius
+        dense = _resample(points, self.snap_distance / 2)
+        known = np.fromiter((self._nearest_piece(x, z) is not None for x, z in dense.tolist()),
+                            dtype=bool, count=len(dense))
+
+        added = 0
+        changes = np.diff(np.concatenate(([0], (~known).astype(np.int8), [0])))
+        # Unbekannte Abschnitte, jeweils inklusive des letzten bzw. ersten bekannten Punkts davor und danach
+        for start, end in zip(np.flatnonzero(changes == 1), np.flatnonzero(changes == -1)):
+            start, end = max(start - 1, 0), min(end + 1, len(dense))
+            run = dense[start:end]
+            bounded = start > 0 and end < len(dense)
+            if len(run) < 2 or (bounded and _polyline_length(run) < self.min_edge_length):
+                continue # kurzes Ausscheren zwischen zwei bekannten Punkten ist nur Rauschen
+            first, last = self._node_at(*run[0]), self._node_at(*run[-1])
+            geometry = simplify_polyline(run, ROAD_SIMPLIFY_TOLERANCE)
+            geometry[0], geometry[-1] = self.nodes[first], self.nodes[last]
+            if first == last and _polyline_length(geometry) < self.min_edge_length:
+                continue
+            self._add_edge(first, last, geometry)
+            added += 1
+        return added
+
+    # --- Speichern / Laden ---
+    def save(self, path: Path = ROAD_GRAPH_FILE, geometry_path: Path = ROAD_NETWORK_FILE) -> Path:
+        """
+        Die Kantenverläufe gehen als Straßennetz nach `geometry_path` (Segment i = Kante i,
+        die Karten mappen die Datei direkt), Knoten und Kantenenden in die kleine .npz-Datei.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.geometry.save(geometry_path)
+        pending = path.with_name(path.name + ".new")
+        with open(pending, 'wb') as f:
+            np.savez(f,
+                     node_points=np.asarray(self.nodes, dtype=np.float64).reshape(-1, 2),
+                     edge_nodes=np.asarray([(a, b) for a, b, _ in self.edges], dtype=np.int32).reshape(-1, 2))
+        os.replace(pending, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = ROAD_GRAPH_FILE, geometry_path: Path = ROAD_NETWORK_FILE, **kwargs) -> "RoadGraph":
+        graph = cls(**kwargs)
+        # Ohne mmap: die Kanten werden ohnehin kopiert, und die Datei bleibt zum Überschreiben frei
+        network = RoadNetwork.load(geometry_path, mmap=False)
+        with np.load(path) as data:
+            graph.nodes = [tuple(p) for p in data['node_points'].tolist()]
+            edge_nodes = data['edge_nodes'].tolist()
+        if len(edge_nodes) != len(network):
+            raise ValueError(f"{geometry_path} passt nicht zu {path} ({len(network)} Segmente, {len(edge_nodes)} Kanten).")
+        for (a, b), segment in zip(edge_nodes, network):
+            geometry = segment.astype(np.float64)
+            # Knoten exakt (float64), damit geteilte Kanten wieder genau aneinanderstoßen
+            geometry[0], geometry[-1] = graph.nodes[a], graph.nodes[b]
+            graph.edges.append([a, b, geometry])
+        return graph
+
+
+def load_road_graph(path: Path = ROAD_GRAPH_FILE, geometry_path: Path = ROAD_NETWORK_FILE) -> RoadGraph:
+    """
+    Lädt den Straßengraphen. Gibt es noch keinen, wird er einmalig aus dem aufgezeichneten
+    Straßennetz (road_network.bin bzw. dem alten JSON) gebaut; die doppelten Fahrten fallen
+    dabei weg, road_network.bin enthält danach nur noch die Kantenverläufe.
+    """
+    path = Path(path)
+    if path.exists():
+        try:
+            return RoadGraph.load(path, geometry_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"✗ Straßengraph konnte nicht geladen werden, baue ihn neu: {e}")
+
+    network = load_road_network(geometry_path, mmap=False)
+    graph = RoadGraph()
+    for segment in network:
+        graph.add_trace(segment)
+    print(f"🛣️ Straßengraph gebaut: {len(network)} Segmente ({network.point_count} Punkte) -> "
+          f"{len(graph.nodes)} Knoten, {len(graph.edges)} Kanten ({graph.point_count} Punkte)")
+    if len(graph.edges):
+        try:
+            graph.save(path, geometry_path)
+        except OSError as e:
+            print(f"✗ Straßengraph konnte nicht gespeichert werden: {e}")
+    return graph
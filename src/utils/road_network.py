@@ -0,0 +1,216 @@
+# src/utils/road_network.py
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from src.config import (ROAD_NETWORK_FILE, ROAD_NETWORK_LEGACY_FILE, ROAD_SIMPLIFY_TOLERANCE,
+                        ROAD_LOD_TOLERANCES, ROAD_LOD_PIXEL_TOLERANCE, ROAD_CHUNK_POINTS)
+from src.utils.geometry import simplify_polyline
+
+# Dateikopf des Binärformats, danach folgen direkt offsets (int64) und points (float32, x/z)
+_HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('segments', '<u4'), ('points', '<u8')])
+_MAGIC = b"ETSROAD\0"
+_VERSION = 1
+
+
+class RoadNetwork:
+    """
+    Aufgezeichnetes Straßennetz als zwei flache Arrays statt verschachtelter Listen:
+    `points` enthält alle Punkte hintereinander (N x 2, float32, x/z), `offsets` pro Segment
+    den Startindex plus einen Abschlusseintrag. Segment i ist points[offsets[i]:offsets[i + 1]].
+
+    `load` bildet die Datei per mmap ab, es wird nichts geparst und nur gelesen, was
+    tatsächlich gezeichnet wird. Die Arrays sind dann schreibgeschützt; neue Segmente
+    kommen über `extended` hinzu, das ein neues Netz im Speicher liefert.
+    """
+    def __init__(self, points: np.ndarray = None, offsets: np.ndarray = None):
+        self.points = np.zeros((0, 2), dtype=np.float32) if points is None else points
+        self.offsets = np.zeros(1, dtype=np.int64) if offsets is None else offsets
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Sequence[Sequence[float]]]) -> "RoadNetwork":
+        """Baut das Netz aus Segmenten im alten Format (Listen von [x, z]-Punkten)."""
+        arrays = [np.asarray(segment, dtype=np.float32).reshape(-1, 2) for segment in segments]
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum([len(a) for a in arrays], out=offsets[1:])
+        points = np.concatenate(arrays) if arrays else np.zeros((0, 2), dtype=np.float32)
+        return cls(points, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.points[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for start, end in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist()):
+            yield self.points[start:end]
+
+    @property
+    def point_count(self) -> int:
+        return len(self.points)
+
+    def segment_lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def simplified(self, tolerance: float = ROAD_SIMPLIFY_TOLERANCE) -> "RoadNetwork":
+        """Neues Netz mit jedem Segment per Douglas-Peucker vereinfacht, Segmentindizes bleiben gleich."""
+        return RoadNetwork.from_segments(simplify_polyline(segment, tolerance) for segment in self)
+
+    def extended(self, segments: Iterable[Sequence[Sequence[float]]]) -> "RoadNetwork":
+        """Neues Netz aus diesem plus den übergebenen Segmenten (die Arrays werden kopiert)."""
+        added = RoadNetwork.from_segments(segments)
+        if not len(added): return self
+        points = np.concatenate((self.points, added.points))
+        offsets = np.concatenate((self.offsets, added.offsets[1:] + self.offsets[-1]))
+        return RoadNetwork(points, offsets)
+
+    def save(self, path: Path = ROAD_NETWORK_FILE) -> Path:
+        """
+        Schreibt erst nach `<datei>.new` und ersetzt dann atomar. Ist die Datei gerade von
+        einem anderen Prozess gemappt (Windows), bleibt die .new-Datei liegen und wird beim
+        nächsten `load_road_network` übernommen.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = np.array([(_MAGIC, _VERSION, len(self), self.point_count)], dtype=_HEADER)
+        pending = path.with_name(path.name + ".new")
+        with open(pending, 'wb') as f:
+            f.write(header.tobytes())
+            f.write(np.ascontiguousarray(self.offsets, dtype='<i8').tobytes())
+            f.write(np.ascontiguousarray(self.points, dtype='<f4').tobytes())
+        os.replace(pending, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = ROAD_NETWORK_FILE, mmap: bool = True) -> "RoadNetwork":
+        path = Path(path)
+        with open(path, 'rb') as f:
+            raw = f.read(_HEADER.itemsize)
+        if len(raw) < _HEADER.itemsize:
+            raise ValueError(f"{path} ist zu kurz für ein Straßennetz.")
+        header = np.frombuffer(raw, dtype=_HEADER)[0]
+        if header['magic'] != _MAGIC.rstrip(b"\0") or header['version'] != _VERSION:
+            raise ValueError(f"{path} ist kein Straßennetz im Format v{_VERSION}.")
+        segments, point_count = int(header['segments']), int(header['points'])
+        offsets_at = _HEADER.itemsize
+        points_at = offsets_at + (segments + 1) * 8
+        if path.stat().st_size != points_at + point_count * 8:
+            raise ValueError(f"{path} ist unvollständig.")
+
+        if mmap and point_count:
+            offsets = np.memmap(path, dtype='<i8', mode='r', offset=offsets_at, shape=(segments + 1,))
+            points = np.memmap(path, dtype='<f4', mode='r', offset=points_at, shape=(point_count, 2))
+        else:
+            data = path.read_bytes()
+            offsets = np.frombuffer(data, dtype='<i8', count=segments + 1, offset=offsets_at)
+            points = np.frombuffer(data, dtype='<f4', count=point_count * 2, offset=points_at).reshape(-1, 2)
+        return cls(points, offsets)
+
+
+class RoadChunks:
+    """
+    Teilt alle Segmente eines Netzes in Stücke von höchstens `chunk_points` Punkten (aufeinander-
+    folgende Stücke teilen sich einen Punkt, die Linie bleibt geschlossen) und hält deren
+    Bounding-Boxen als Array. `visible` liefert mit einem Vektorvergleich die Stücke, die einen
+    Ausschnitt berühren; gezeichnet und transformiert wird dann nur noch, was im Bild liegt.
+    """
+    def __init__(self, network: RoadNetwork, chunk_points: int = ROAD_CHUNK_POINTS):
+        self.network = network
+        step = max(chunk_points - 1, 1)
+        seg_starts, seg_ends = network.offsets[:-1], network.offsets[1:]
+        drawable = (seg_ends - seg_starts) > 1
+        seg_starts, seg_ends = seg_starts[drawable], seg_ends[drawable]
+        counts = -(-(seg_ends - seg_starts - 1) // step) # Stücke pro Segment, aufgerundet
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        self.starts = np.repeat(seg_starts, counts) + (np.arange(counts.sum()) - first) * step
+        self.ends = np.minimum(self.starts + step + 1, np.repeat(seg_ends, counts))
+        self.bboxes = np.empty((len(self.starts), 4))
+        if len(self.starts):
+            # reduceat deckt [start_i, start_i+1) ab, der geteilte letzte Punkt kommt einzeln dazu
+            last = network.points[self.ends - 1]
+            self.bboxes[:, :2] = np.minimum(np.minimum.reduceat(network.points, self.starts, axis=0), last)
+            self.bboxes[:, 2:] = np.maximum(np.maximum.reduceat(network.points, self.starts, axis=0), last)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def visible(self, min_x: float, min_z: float, max_x: float, max_z: float) -> np.ndarray:
+        """Indizes aller Stücke, deren Box den Ausschnitt (Weltkoordinaten) schneidet."""
+        b = self.bboxes
+        return np.flatnonzero((b[:, 0] <= max_x) & (b[:, 2] >= min_x) & (b[:, 1] <= max_z) & (b[:, 3] >= min_z))
+
+    def chunk(self, index: int) -> np.ndarray:
+        return self.network.points[self.starts[index]:self.ends[index]]
+
+
+class RoadNetworkLOD:
+    """
+    Detailstufen eines Straßennetzes: Stufe 0 ist das Netz selbst, jede weitere ist mit der
+    nächstgrößeren Toleranz aus ROAD_LOD_TOLERANCES vereinfacht. Die Stufen werden erst bei
+    Bedarf gebaut; alle haben dieselben Segmentindizes, Bounding-Boxen des vollen Netzes gelten also weiter.
+    """
+    def __init__(self, network: RoadNetwork, tolerances: Iterable[float] = ROAD_LOD_TOLERANCES,
+                 pixel_tolerance: float = ROAD_LOD_PIXEL_TOLERANCE):
+        self.network = network
+        self.tolerances = sorted(tolerances)
+        self.pixel_tolerance = pixel_tolerance
+        self._levels: Dict[float, RoadNetwork] = {}
+        self._chunks: Dict[float, RoadChunks] = {}
+
+    def tolerance_for_zoom(self, zoom: float) -> float:
+        """Größte Toleranz, die bei diesem Zoom höchstens `pixel_tolerance` Pixel ausmacht (0 = volles Netz)."""
+        allowed = self.pixel_tolerance / zoom
+        return max((t for t in self.tolerances if t <= allowed), default=0.0)
+
+    def level(self, tolerance: float) -> RoadNetwork:
+        if tolerance <= 0: return self.network
+        if (network := self._levels.get(tolerance)) is None:
+            network = self._levels[tolerance] = self.network.simplified(tolerance)
+        return network
+
+    def for_zoom(self, zoom: float) -> RoadNetwork:
+        return self.level(self.tolerance_for_zoom(zoom))
+
+    def chunks_for_zoom(self, zoom: float) -> RoadChunks:
+        """Die in Stücke mit Bounding-Boxen geteilte Detailstufe für diesen Zoom."""
+        tolerance = self.tolerance_for_zoom(zoom)
+        if (chunks := self._chunks.get(tolerance)) is None:
+            chunks = self._chunks[tolerance] = RoadChunks(self.level(tolerance))
+        return chunks
+
+
+def convert_legacy_json(json_path: Path = ROAD_NETWORK_LEGACY_FILE, path: Path = ROAD_NETWORK_FILE) -> RoadNetwork:
+    """Liest das alte road_network.json (Liste von Segmenten aus [x, z]-Punkten) und speichert es binär."""
+    with open(json_path, 'r') as f:
+        network = RoadNetwork.from_segments(json.load(f))
+    network.save(path)
+    print(f"🛣️ {json_path} konvertiert: {len(network)} Segmente, {network.point_count} Punkte -> {path}")
+    return network
+
+
+def load_road_network(path: Path = ROAD_NETWORK_FILE, legacy_path: Path = ROAD_NETWORK_LEGACY_FILE,
+                      mmap: bool = True) -> RoadNetwork:
+    """
+    Lädt das Straßennetz aus der Binärdatei. Gibt es nur das alte JSON, wird es einmalig
+    konvertiert. Fehlt beides oder ist die Datei kaputt, kommt ein leeres Netz zurück.
+    """
+    path = Path(path)
+    pending = path.with_name(path.name + ".new")
+    if pending.exists():
+        try:
+            os.replace(pending, path)
+        except OSError as e:
+            print(f"✗ Gespeichertes Straßennetz {pending} konnte nicht übernommen werden: {e}")
+
+    try:
+        if not path.exists() and legacy_path and Path(legacy_path).exists():
+            convert_legacy_json(legacy_path, path)
+        if path.exists():
+            return RoadNetwork.load(path, mmap=mmap)
+    except (OSError, ValueError) as e:
+        print(f"✗ Straßennetz konnte nicht geladen werden: {e}")
+    return RoadNetwork()
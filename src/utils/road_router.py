@@ -0,0 +1,155 @@
+# src/utils/road_router.py
+import heapq
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.config import ROUTE_AVERAGE_SPEED_KMH
+from src.utils.road_graph import RoadGraph
+
+_START, _GOAL = -1, -2 # virtuelle Knoten für die auf Kanten projizierten Start- und Zielpunkte
+
+
+class Route:
+    """Berechnete Route: Linienzug (N x 2), Länge in Spieleinheiten (~ Meter) und geschätzte Fahrzeit."""
+    def __init__(self, points: np.ndarray, eta_seconds_per_unit: float):
+        self.points = points
+        deltas = np.diff(points, axis=0)
+        self.length = float(np.hypot(deltas[:, 0], deltas[:, 1]).sum())
+        self.eta_seconds = self.length * eta_seconds_per_unit
+
+    @property
+    def length_km(self) -> float:
+        return self.length / 1000
+
+    @property
+    def eta_minutes(self) -> float:
+        return self.eta_seconds / 60
+
+
+class RoadRouter:
+    """
+    A* über den gelernten Straßengraphen (src/utils/road_graph.py). Start und Ziel dürfen
+    irgendwo liegen: sie werden auf das nächste Kantenstück projiziert, der Weg von und zur
+    Straße zählt als Luftlinie mit. Die Heuristik ist die Luftlinie zum Ziel; da jede Kante
+    mindestens so lang ist, bleibt die gefundene Route die kürzeste im Graphen.
+    """
+    def __init__(self, graph: RoadGraph, average_speed_kmh: float = ROUTE_AVERAGE_SPEED_KMH):
+        self.graph = graph
+        self.eta_seconds_per_unit = 3.6 / average_speed_kmh
+        self.nodes = graph.nodes
+        self.adjacency: List[List[Tuple[int, int, float]]] = [[] for _ in graph.nodes]
+        self.edge_offsets: List[np.ndarray] = [] # Strecke vom Startknoten bis zu jedem Kantenpunkt
+        piece_starts, piece_ends, piece_edges, piece_indices = [], [], [], []
+        for edge_id, (a, b, points) in enumerate(graph.edges):
+            deltas = np.diff(points, axis=0)
+            offsets = np.concatenate(([0.0], np.cumsum(np.hypot(deltas[:, 0], deltas[:, 1]))))
+            self.edge_offsets.append(offsets)
+            if a != b: # Schleifen machen keinen Weg kürzer
+                self.adjacency[a].append((b, edge_id, offsets[-1]))
+                self.adjacency[b].append((a, edge_id, offsets[-1]))
+            piece_starts.append(points[:-1])
+            piece_ends.append(points[1:])
+            piece_edges.append(np.full(len(points) - 1, edge_id))
+            piece_indices.append(np.arange(len(points) - 1))
+        if piece_starts:
+            self._piece_starts = np.concatenate(piece_starts)
+            self._piece_vectors = np.concatenate(piece_ends) - self._piece_starts
+            self._piece_edges = np.concatenate(piece_edges)
+            self._piece_indices = np.concatenate(piece_indices)
+            self._piece_length_sq = np.maximum((self._piece_vectors ** 2).sum(axis=1), 1e-12)
+
+    def snap(self, x: float, z: float):
+        """Nächster Punkt auf einer Kante: (Kante, Stück, Position, Strecke ab Startknoten) oder None."""
+        if not self.graph.edges:
+            return None
+        relative = np.array((x, z)) - self._piece_starts
+        t = np.clip((relative * self._piece_vectors).sum(axis=1) / self._piece_length_sq, 0.0, 1.0)
+        nearest = self._piece_starts + self._piece_vectors * t[:, None]
+        best = int(((nearest - (x, z)) ** 2).sum(axis=1).argmin())
+        edge_id, piece = int(self._piece_edges[best]), int(self._piece_indices[best])
+        offsets = self.edge_offsets[edge_id]
+        offset = offsets[piece] + t[best] * (offsets[piece + 1] - offsets[piece])
+        return edge_id, piece, tuple(nearest[best].tolist()), float(offset)
+
+    def route(self, start: Tuple[float, float], goal: Tuple[float, float]) -> Optional[Route]:
+        """Kürzeste Route von `start` nach `goal` (x, z) oder None, wenn das Netz sie nicht verbindet."""
+        start_hit, goal_hit = self.snap(*start), self.snap(*goal)
+        if start_hit is None or goal_hit is None:
+            return None
+        start_edge, _, _, start_offset = start_hit
+        goal_edge, _, goal_position, goal_offset = goal_hit
+        goal_a, goal_b, _ = self.graph.edges[goal_edge]
+        goal_length = self.edge_offsets[goal_edge][-1]
+        start_a, start_b, _ = self.graph.edges[start_edge]
+        start_length = self.edge_offsets[start_edge][-1]
+        gx, gz = goal_position
+
+        def heuristic(node):
+            if node == _GOAL: return 0.0
+            x, z = self.nodes[node]
+            return math.hypot(x - gx, z - gz)
+
+        costs = {}
+        came_from = {}
+        queue = []
+        def push(node, cost, previous, edge_id):
+            if cost < costs.get(node, math.inf):
+                costs[node] = cost
+                came_from[node] = (previous, edge_id)
+                heapq.heappush(queue, (cost + heuristic(node), cost, node))
+
+        push(start_a, start_offset, _START, start_edge)
+        push(start_b, start_length - start_offset, _START, start_edge)
+        if start_edge == goal_edge:
+            push(_GOAL, abs(goal_offset - start_offset), _START, goal_edge)
+
+        closed = set()
+        while queue:
+            _, cost, node = heapq.heappop(queue)
+            if node == _GOAL:
+                return Route(self._path_points(came_from, start, start_hit, goal, goal_hit), self.eta_seconds_per_unit)
+            if node in closed: continue
+            closed.add(node)
+            if node == goal_a: push(_GOAL, cost + goal_offset, node, goal_edge)
+            if node == goal_b: push(_GOAL, cost + goal_length - goal_offset, node, goal_edge)
+            for neighbor, edge_id, length in self.adjacency[node]:
+                if neighbor not in closed:
+                    push(neighbor, cost + length, node, edge_id)
+        return None
+
+    def _edge_points(self, edge_id: int, from_node: int) -> np.ndarray:
+        a, _, points = self.graph.edges[edge_id]
+        return points if a == from_node else points[::-1]
+
+    def _path_points(self, came_from, start, start_hit, goal, goal_hit) -> np.ndarray:
+        # Knotenfolge rückwärts vom Ziel zum Start einsammeln
+        chain = []
+        node = _GOAL
+        while node != _START:
+            previous, edge_id = came_from[node]
+            chain.append((previous, node, edge_id))
+            node = previous
+        chain.reverse()
+
+        start_edge, start_piece, start_position, start_offset = start_hit
+        goal_edge, goal_piece, goal_position, goal_offset = goal_hit
+        parts = [np.array([start, start_position], dtype=np.float64)]
+        for previous, node, edge_id in chain:
+            points = self.graph.edges[edge_id][2]
+            if previous == _START and node == _GOAL: # Start und Ziel auf derselben Kante
+                if start_offset <= goal_offset:
+                    parts.append(points[start_piece + 1:goal_piece + 1])
+                else:
+                    parts.append(points[goal_piece + 1:start_piece + 1][::-1])
+            elif previous == _START: # vom Startpunkt bis zum ersten Knoten
+                a = self.graph.edges[edge_id][0]
+                parts.append(points[:start_piece + 1][::-1] if node == a else points[start_piece + 1:])
+            elif node == _GOAL: # vom letzten Knoten bis zum Zielpunkt
+                a = self.graph.edges[edge_id][0]
+                parts.append(points[:goal_piece + 1] if previous == a else points[goal_piece + 1:][::-1])
+            else:
+                parts.append(self._edge_points(edge_id, previous))
+        parts.append(np.array([goal_position, goal], dtype=np.float64))
+        return np.vstack(parts)
@@ -0,0 +1,101 @@
+# src/utils/task_runner.py
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import tkinter as tk
+
+from src.config import UI_TASK_WORKERS, UI_TASK_POLL_INTERVAL_MS
+
+
+class UiTask:
+    """Eine laufende Hintergrund-Abfrage eines Overlays. `cancel()` verwirft ihr Ergebnis."""
+    def __init__(self, key: str, future: Future, on_done: Optional[Callable[[Any], None]],
+                 on_error: Optional[Callable[[Exception], None]]):
+        self.key = key
+        self.future = future
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        # Ein bereits laufender Savegame-Parser lässt sich nicht unterbrechen; noch nicht
+        # gestartete Aufgaben fallen weg, das Ergebnis laufender erreicht die UI nicht mehr.
+        self.cancelled = True
+        self.future.cancel()
+
+
+class TkTaskRunner:
+    """
+    Führt blockierende Arbeit (Savegame entschlüsseln, Telemetrie abfragen) in einem kleinen
+    Thread-Pool aus. Der Tk-Thread fragt die Futures per `after` ab und ruft `on_done` /
+    `on_error` dort auf, Widgets dürfen in den Callbacks also direkt angefasst werden.
+
+    Aufgaben haben einen Schlüssel: ein neues `submit` mit demselben Schlüssel ersetzt die
+    alte Aufgabe, `cancel_all()` beim Screenwechsel verwirft alles, was noch aussteht.
+    """
+    def __init__(self, window: tk.Misc, max_workers: int = UI_TASK_WORKERS,
+                 poll_interval_ms: int = UI_TASK_POLL_INTERVAL_MS):
+        self.window = window
+        self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, UiTask] = {}
+        self._poll_job = None
+
+    def submit(self, key: str, func: Callable, *args, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None) -> UiTask:
+        with self._lock:
+            if (previous := self._tasks.pop(key, None)):
+                previous.cancel()
+            task = UiTask(key, self._executor.submit(func, *args), on_done, on_error)
+            self._tasks[key] = task
+            self._schedule_poll()
+        return task
+
+    def is_running(self, key: str) -> bool:
+        with self._lock:
+            return key in self._tasks
+
+    def cancel(self, key: str):
+        with self._lock:
+            if (task := self._tasks.pop(key, None)):
+                task.cancel()
+
+    def cancel_all(self):
+        with self._lock:
+            for task in self._tasks.values():
+                task.cancel()
+            self._tasks.clear()
+
+    def _schedule_poll(self):
+        if self._poll_job is None and self._tasks:
+            self._poll_job = self.window.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        with self._lock:
+            self._poll_job = None
+            finished = [task for task in self._tasks.values() if task.future.done()]
+            for task in finished:
+                del self._tasks[task.key]
+            self._schedule_poll()
+
+        for task in finished:
+            if task.cancelled or task.future.cancelled(): continue
+            error = task.future.exception()
+            try:
+                if error is not None:
+                    if task.on_error: task.on_error(error)
+                    else: print(f"✗ Hintergrund-Aufgabe '{task.key}' fehlgeschlagen: {error}")
+                elif task.on_done:
+                    task.on_done(task.future.result())
+            except Exception as e:
+                print(f"✗ Fehler beim Anzeigen von '{task.key}': {e}")
+
+    def shutdown(self):
+        self.cancel_all()
+        with self._lock:
+            if self._poll_job:
+                self.window.after_cancel(self._poll_job)
+                self._poll_job = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
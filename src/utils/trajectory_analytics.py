@@ -0,0 +1,153 @@
+# src/utils/trajectory_analytics.py
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.config import (DATA_DIR, TRACE_MAX_GAP_S, STOP_SPEED_KMH, STOP_MIN_SECONDS,
+                        APPROACH_WINDOW_S)
+from src.utils.geometry import Polygon
+
+# Ein Trace-Punkt pro Telemetrie-Abfrage: Unix-Zeit, Position (x/z), Geschwindigkeit in km/h, Motor an
+TRACE_DTYPE = np.dtype([('t', 'f8'), ('x', 'f8'), ('z', 'f8'), ('speed', 'f4'), ('engine_on', '?')])
+
+
+def save_trace(path: Path, rows) -> Path:
+    """Speichert eine Liste von (t, x, z, speed, engine_on)-Tupeln als .npy."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, np.array(rows, dtype=TRACE_DTYPE))
+    return path
+
+
+def load_trace(path: Path) -> np.ndarray:
+    trace = np.load(path)
+    if trace.dtype != TRACE_DTYPE:
+        raise ValueError(f"{path} ist keine Fahrtenaufzeichnung (dtype {trace.dtype}).")
+    return np.sort(trace, order='t')
+
+
+def load_zones(locations_file: Path = DATA_DIR / "locations.json",
+               company_locations_file: Path = DATA_DIR / "company_locations.json") -> Dict[str, Polygon]:
+    """
+    Zonen aus den Orts-JSONs: Lieferdienst-Orte unter ihrem Namen, Firmenfilialen als
+    "firma/template_name" (bei mehreren Filialen mit gleichem Template durchnummeriert).
+    """
+    zones = {}
+    if locations_file.exists():
+        with open(locations_file, 'r', encoding='utf-8') as f:
+            for location in json.load(f).get("locations", []):
+                zones[location["name"]] = Polygon.from_corners(location["corners"])
+    if company_locations_file.exists():
+        with open(company_locations_file, 'r', encoding='utf-8') as f:
+            for company, locations in json.load(f).items():
+                for location in locations:
+                    name = f"{company}/{location['template_name']}"
+                    suffix = 2
+                    while name in zones:
+                        name = f"{company}/{location['template_name']}#{suffix}"
+                        suffix += 1
+                    zones[name] = Polygon.from_corners(location["corners"])
+    return zones
+
+
+def _sample_durations(trace: np.ndarray, max_gap: float = TRACE_MAX_GAP_S) -> np.ndarray:
+    """Dauer, für die jeder Punkt steht (bis zum nächsten Punkt, Lücken gekappt)."""
+    if len(trace) == 0:
+        return np.zeros(0)
+    dt = np.diff(trace['t'], append=trace['t'][-1])
+    return np.clip(dt, 0.0, max_gap)
+
+
+def _runs(mask: np.ndarray):
+    """Start- und (exklusive) End-Indizes aller zusammenhängenden True-Abschnitte."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def zone_membership(trace: np.ndarray, zones: Dict[str, Polygon]) -> Dict[str, np.ndarray]:
+    """Pro Zone ein bool-Array: liegt der jeweilige Trace-Punkt in der Zone?"""
+    return {name: polygon.contains_points(trace['x'], trace['z']) for name, polygon in zones.items()}
+
+
+def time_in_zones(trace: np.ndarray, zones: Dict[str, Polygon], membership=None) -> Dict[str, float]:
+    """Aufenthaltsdauer in Sekunden pro Zone."""
+    membership = membership if membership is not None else zone_membership(trace, zones)
+    dt = _sample_durations(trace)
+    return {name: float(dt[inside].sum()) for name, inside in membership.items()}
+
+
+def zone_visits(trace: np.ndarray, zones: Dict[str, Polygon], membership=None) -> Dict[str, List[dict]]:
+    """Besuche pro Zone: jeder zusammenhängende Abschnitt innerhalb der Zone ist ein Besuch."""
+    membership = membership if membership is not None else zone_membership(trace, zones)
+    elapsed = np.concatenate(([0.0], np.cumsum(_sample_durations(trace))))
+    visits = {}
+    for name, inside in membership.items():
+        starts, ends = _runs(inside)
+        visits[name] = [
+            {"start": float(trace['t'][s]), "end": float(trace['t'][e - 1]), "seconds": float(elapsed[e] - elapsed[s]),
+             "start_index": int(s)}
+            for s, e in zip(starts, ends)
+        ]
+    return visits
+
+
+def detect_stops(trace: np.ndarray, speed_threshold: float = STOP_SPEED_KMH,
+                 min_duration: float = STOP_MIN_SECONDS) -> List[dict]:
+    """Standphasen unter `speed_threshold` km/h, die mindestens `min_duration` Sekunden dauern."""
+    if len(trace) == 0:
+        return []
+    elapsed = np.concatenate(([0.0], np.cumsum(_sample_durations(trace))))
+    starts, ends = _runs(trace['speed'] < speed_threshold)
+    durations = elapsed[ends] - elapsed[starts]
+    keep = durations >= min_duration
+    stops = []
+    for s, e, seconds in zip(starts[keep], ends[keep], durations[keep]):
+        stops.append({
+            "start": float(trace['t'][s]), "end": float(trace['t'][e - 1]), "seconds": float(seconds),
+            "x": float(trace['x'][s:e].mean()), "z": float(trace['z'][s:e].mean()),
+            "engine_off": bool((~trace['engine_on'][s:e]).any()),
+        })
+    return stops
+
+
+def approach_speeds(trace: np.ndarray, visits: Dict[str, List[dict]], window_s: float = APPROACH_WINDOW_S) -> Dict[str, float]:
+    """
+    Mittlere Geschwindigkeit (km/h, zeitgewichtet) in den `window_s` Sekunden vor dem Betreten,
+    gemittelt über alle Besuche einer Zone. Zonen ohne auswertbare Anfahrt bekommen NaN.
+    """
+    dt = _sample_durations(trace)
+    elapsed = np.concatenate(([0.0], np.cumsum(dt)))
+    weighted = np.concatenate(([0.0], np.cumsum(trace['speed'] * dt)))
+    result = {}
+    for name, zone_visits_ in visits.items():
+        starts = np.array([v["start_index"] for v in zone_visits_], dtype=np.int64)
+        if not starts.size:
+            result[name] = float('nan')
+            continue
+        window_begin = np.searchsorted(trace['t'], trace['t'][starts] - window_s, side='left')
+        seconds = elapsed[starts] - elapsed[window_begin]
+        valid = seconds > 0
+        speeds = (weighted[starts][valid] - weighted[window_begin][valid]) / seconds[valid]
+        result[name] = float(speeds.mean()) if speeds.size else float('nan')
+    return result
+
+
+def summarize(trace: np.ndarray, zones: Dict[str, Polygon]) -> dict:
+    """Kompletter Bericht einer Fahrt; die Zonenzugehörigkeit wird nur einmal berechnet."""
+    membership = zone_membership(trace, zones)
+    visits = zone_visits(trace, zones, membership)
+    seconds = time_in_zones(trace, zones, membership)
+    approach = approach_speeds(trace, visits)
+    dt = _sample_durations(trace)
+    return {
+        "points": int(len(trace)),
+        "duration_s": float(dt.sum()),
+        "distance_km": float(np.hypot(np.diff(trace['x']), np.diff(trace['z'])).sum() / 1000) if len(trace) > 1 else 0.0,
+        "stops": detect_stops(trace),
+        "zones": {
+            name: {"seconds": seconds[name], "visits": len(visits[name]), "approach_speed_kmh": approach[name]}
+            for name in zones if visits[name]
+        },
+    }